@@ -0,0 +1,98 @@
+import logging
+from typing import Dict, List, Optional
+
+from batch_processors.batch_processor import BatchProcessor
+from batch_processors.result_postprocessor import RESULT_COLUMNS
+from batch_processors.result_stats import ResultStats
+from core.scraper import CompanyScraper
+from managers.archive_manager import ArchiveIndex
+from managers.replay_manager import ReplayRenderManager, ReplaySessionManager
+
+
+class ArchiveReplayer(BatchProcessor):
+    """
+    Offline re-extraction from a page archive.
+    Replays the archived responses of every company through the current
+    extraction code, without network access, browser searches or request
+    delays, so extraction changes can be evaluated at CPU speed.
+    """
+
+    def __init__(self, archive_dir: str, output_file: str, max_workers: int = 5):
+        """
+        Initialize ArchiveReplayer.
+
+        Args:
+            archive_dir (str): Directory written by ArchiveManager (ARCHIVE_DIR)
+            output_file (str): Path of the Excel file to write the replayed results to
+            max_workers (int): Maximum number of concurrent workers
+        """
+        super().__init__(output_file=output_file)
+        self.archive_index = ArchiveIndex(archive_dir)
+        self.max_workers = max_workers
+        self.session_manager = ReplaySessionManager(self.archive_index)
+        self.render_manager = ReplayRenderManager(self.archive_index)
+
+    def _create_scraper(self) -> CompanyScraper:
+        """Create a scraper reading from the archive instead of the network."""
+        scraper = super()._create_scraper()
+        # Replayed pages are already archived, and hosts dead today were alive when archived
+        scraper.archive_manager = None
+        self.archive_manager = None
+        scraper.host_breaker = None
+        self.host_breaker = None
+        return scraper
+
+    def replay(self, companies: Optional[List[str]] = None, batch_size: int = 100) -> List[Dict]:
+        """
+        Re-extract contact information for archived companies.
+
+        Args:
+            companies (Optional[List[str]]): Companies to replay, all archived companies if None
+            batch_size (int): Number of companies to process per batch
+
+        Returns:
+            List[Dict]: Replayed results, in archive order
+        """
+        try:
+            archived = self.archive_index.companies()
+            if companies is not None:
+                wanted = set(companies)
+                archived = [row for row in archived if row[0] in wanted]
+            logging.info("Replaying %s archived companies", len(archived))
+
+            results = []
+            for start in range(0, len(archived), batch_size):
+                batch = archived[start:start + batch_size]
+                with_website = [(company, website) for company, website, _ in batch if website]
+                replayed = iter(self._scrape_companies(
+                    [company for company, _ in with_website],
+                    self.max_workers,
+                    known=[{'website': website} for _, website in with_website]
+                ))
+                # Companies without a website never reached extraction, keep their archived status
+                batch_results = [
+                    next(replayed) if website else {
+                        'company_name': company, 'website': None,
+                        'email': None, 'phone': None, 'status': status
+                    }
+                    for company, website, status in batch
+                ]
+                results.extend(batch_results)
+                self._print_batch_summary(batch_results, start // batch_size + 1)
+
+            stats = self.session_manager.get_stats()
+            logging.info(
+                "Replay: %s requests served from the archive, %s not archived",
+                stats['requests'], stats['archive_misses']
+            )
+            if results:
+                import pandas as pd
+                pd.DataFrame(results, columns=list(RESULT_COLUMNS)).to_excel(self.output_file, index=False)
+                self._print_final_summary(ResultStats().add_all(results))
+            return results
+
+        except Exception as e:
+            logging.error("Error replaying archive: %s", e)
+            raise
+        finally:
+            self._close_resources()
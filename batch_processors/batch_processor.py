@@ -1,13 +1,17 @@
-import sys
-import pandas as pd
 import logging
 import time
 from concurrent.futures import ThreadPoolExecutor
 import os
-from collections import defaultdict
 from typing import List, Dict, Optional
 
+from batch_processors.input_deduplicator import InputDeduplicator
+from batch_processors.parquet_results import ParquetResultStore
+from batch_processors.result_postprocessor import RESULT_COLUMNS
+from batch_processors.result_stats import ResultStats
+from config.scraping_config import ScrapingConfig
 from core.scraper import CompanyScraper
+from utils.log_pipeline import LogPipeline
+from utils.single_flight import SingleFlight
 
 class BatchProcessor:
     """
@@ -23,23 +27,46 @@ class BatchProcessor:
             output_file (str): Path to the output Excel file
         """
         self.output_file = output_file
+        # Shared across batches, with the worker threads below each session keeps its connections alive
+        self.session_manager = None
+        # Worker threads outlive a batch, a new pool would start new sessions on every batch
+        self._executor = None
+        self._executor_workers = 0
+        # Shared across batches so each site is crawled once per run
+        self.site_flight = SingleFlight()
+        # Adaptive stage limits, kept across batches so they keep what they learned
+        self.concurrency = None
+        # Warm browser pool for rendering script-heavy pages
+        self.render_manager = None
+        self.selenium_manager = None
+        # Archive of fetched pages, one archive file per run
+        self.archive_manager = None
+        # Candidate-domain checker with its lookup threads
+        self.domain_guesser = None
+        # Dead hosts found by one batch are skipped by the next
+        self.host_breaker = None
+        # Scripts found irrelevant on one site are skipped on the next
+        self.script_filter = None
+        # Equivalent input names are scraped once per run
+        config = ScrapingConfig.load()
+        self.input_dedup = InputDeduplicator(config.LEGAL_SUFFIX_TLDS) if config.INPUT_DEDUP else None
+        # Columnar copy of every checkpoint, with timings and website source
+        self.result_store = ParquetResultStore(config.PARQUET_OUTPUT_DIR) if config.PARQUET_OUTPUT_DIR else None
         self._setup_logging()
     
     def _setup_logging(self) -> None:
-        """Configure logging with UTF-8 encoding support"""
-        formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
-        
-        file_handler = logging.FileHandler('scraper.log', encoding='utf-8')
-        file_handler.setFormatter(formatter)
-        
-        stream_handler = logging.StreamHandler(sys.stdout)
-        stream_handler.setFormatter(formatter)
-        
-        root_logger = logging.getLogger()
-        root_logger.setLevel(logging.INFO)
-        root_logger.handlers = []
-        root_logger.addHandler(file_handler)
-        root_logger.addHandler(stream_handler)
+        """
+        Route logging through a queue to a background writer, so worker threads
+        never wait on the UTF-8 log file or stdout.
+        """
+        config = ScrapingConfig.load()
+        LogPipeline.install(
+            log_file=config.LOG_FILE,
+            level=logging.INFO,
+            json_file=config.LOG_JSON,
+            rate_limit_burst=config.LOG_RATE_LIMIT_BURST,
+            rate_limit_interval=config.LOG_RATE_LIMIT_INTERVAL
+        )
     
     def process_batch(self, companies: List[str], batch_number: int, 
                      absolute_start_index: int, max_workers: int) -> List[Dict]:
@@ -55,29 +82,198 @@ class BatchProcessor:
         Returns:
             List[Dict]: Results of processing each company
         """
-        logging.info(f"Processing batch {batch_number} with {len(companies)} companies")
+        logging.info("Processing batch %s with %s companies", batch_number, len(companies))
         
-        scraper = CompanyScraper()
-        results = []
+        results = self._scrape_companies(companies, max_workers)
+        
+        self._save_batch_results(results, batch_number, absolute_start_index)
+        self._write_result_store(results, batch_number)
+        self._log_session_stats()
+        return results
+
+    def _scrape_companies(self, companies: List[str], max_workers: int,
+                          known: Optional[List[Dict]] = None) -> List[Dict]:
+        """
+        Scrape companies concurrently, keeping the input order in the results.
         
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            future_to_company = {
-                executor.submit(scraper.process_company, company): company 
-                for company in companies
-            }
+        Args:
+            companies (List[str]): List of company names to process
+            max_workers (int): Maximum number of concurrent workers
+            known (Optional[List[Dict]]): Previously found fields per company, aligned with companies
             
-            for future in future_to_company:
-                company = future_to_company[future]
-                try:
-                    result = future.result()
-                    results.append(result)
-                    logging.info(f"Completed {company}: {result['status']}")
-                except Exception as e:
-                    logging.error(f"Failed to process {company}: {str(e)}")
-                    results.append(self._create_failed_result(company))
+        Returns:
+            List[Dict]: Results of processing each company
+        """
+        # Rows with known fields need their own scrape, only plain name lists are deduplicated
+        if self.input_dedup is None or known is not None:
+            return self._scrape_each(companies, max_workers, known)
+        keys, representatives = self.input_dedup.plan(companies)
+        for company, result in zip(representatives, self._scrape_each(representatives, max_workers)):
+            self.input_dedup.record(company, result)
+        if len(representatives) < len(companies):
+            logging.info("Batch of %s names scraped as %s distinct companies",
+                         len(companies), len(representatives))
+        return self.input_dedup.fan_out(companies, keys)
+
+    def _scrape_each(self, companies: List[str], max_workers: int,
+                     known: Optional[List[Dict]] = None) -> List[Dict]:
+        """Scrape every given company, keeping the input order in the results."""
+        if not companies:
+            return []
+        scraper = self._create_scraper()
+        results = []
         
-        self._save_batch_results(results, batch_number, absolute_start_index)
+        if self.concurrency:
+            # The caller's max_workers stays the ceiling, the stage limiters only lower it further
+            max_workers = max(1, min(max_workers, self.concurrency.max_workers))
+        
+        executor = self._worker_pool(max_workers)
+        if self.domain_guesser:
+            self.domain_guesser.size_for(max_workers)
+        future_to_company = {
+            executor.submit(scraper.process_company, company, known[i] if known else None): company 
+            for i, company in enumerate(companies)
+        }
+        
+        for future in future_to_company:
+            company = future_to_company[future]
+            try:
+                result = future.result()
+                results.append(result)
+                logging.info("Completed %s: %s", company, result['status'])
+            except Exception as e:
+                logging.error("Failed to process %s: %s", company, e)
+                results.append(self._create_failed_result(company))
+        
+        if self.host_breaker:
+            self.host_breaker.flush()
         return results
+
+    def _worker_pool(self, max_workers: int) -> ThreadPoolExecutor:
+        """Worker threads kept across batches, replaced only when the worker count changes."""
+        if self._executor is None or self._executor_workers != max_workers:
+            self._shutdown_workers()
+            self._executor = ThreadPoolExecutor(max_workers=max_workers)
+            self._executor_workers = max_workers
+        return self._executor
+
+    def _shutdown_workers(self) -> None:
+        """Stop the worker threads and close the sessions they leave behind."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+            self._executor_workers = 0
+        if self.session_manager:
+            self.session_manager.prune()
+
+    def _create_scraper(self) -> CompanyScraper:
+        """Create a scraper that reuses the processor's session pool and site results."""
+        scraper = CompanyScraper(
+            session_manager=self.session_manager,
+            site_flight=self.site_flight,
+            concurrency=self.concurrency,
+            render_manager=self.render_manager,
+            selenium_manager=self.selenium_manager,
+            archive_manager=self.archive_manager,
+            domain_guesser=self.domain_guesser,
+            host_breaker=self.host_breaker,
+            script_filter=self.script_filter
+        )
+        self.session_manager = scraper.session_manager
+        self.concurrency = scraper.concurrency
+        self.render_manager = scraper.render_manager
+        self.selenium_manager = scraper.selenium_manager
+        self.archive_manager = scraper.archive_manager
+        self.domain_guesser = scraper.domain_guesser
+        self.host_breaker = scraper.host_breaker
+        self.script_filter = scraper.script_filter
+        return scraper
+
+    def _close_resources(self) -> None:
+        """Release worker threads, pooled browsers, sessions and the page archive at the end of a run."""
+        self._shutdown_workers()
+        if self.render_manager:
+            self.render_manager.close()
+        if self.session_manager:
+            self.session_manager.close()
+        if self.archive_manager:
+            self.archive_manager.close()
+        if self.domain_guesser:
+            self.domain_guesser.close()
+        self.domain_guesser = None
+        if self.host_breaker:
+            self.host_breaker.flush()
+        self.host_breaker = None
+        self.render_manager = None
+        self.session_manager = None
+        self.archive_manager = None
+
+    def _log_session_stats(self) -> None:
+        """Log connection pool counters of the shared session pool."""
+        if not self.session_manager:
+            return
+        stats = self.session_manager.get_stats()
+        logging.info(
+            "Session pool: %s sessions, %s requests, %s connections opened, "
+            "%s reused, %s pool exhaustion events",
+            stats['sessions'], stats['requests'], stats['connections_opened'],
+            stats['connections_reused'], stats['pool_exhausted']
+        )
+        logging.info(
+            "Site deduplication: %s sites crawled, %s extractions shared",
+            self.site_flight.misses, self.site_flight.hits
+        )
+        if self.concurrency:
+            self.concurrency.log_limits()
+        if self.render_manager:
+            logging.info(
+                "Rendering: %s pages rendered, %s failed",
+                self.render_manager.renders, self.render_manager.failures
+            )
+        if self.selenium_manager and self.selenium_manager.lean:
+            lean_stats = self.selenium_manager.lean_stats
+            pages = max(1, lean_stats['pages'])
+            logging.info(
+                "Lean browsing: %s pages, %s bytes loaded and ~%s bytes saved per page, "
+                "%s requests blocked",
+                lean_stats['pages'], lean_stats['bytes_loaded'] // pages,
+                lean_stats['bytes_saved'] // pages, lean_stats['requests_blocked']
+            )
+        if self.domain_guesser:
+            logging.info(
+                "Domain guessing: %s of %s companies confirmed without a search, %s candidates checked, "
+                "%s DNS lookups timed out",
+                self.domain_guesser.confirmed, self.domain_guesser.guesses,
+                self.domain_guesser.candidates_checked, self.domain_guesser.lookups_timed_out
+            )
+        if self.host_breaker:
+            logging.info(
+                "Circuit breaker: %s hosts tripped, %s requests short-circuited",
+                self.host_breaker.tripped, self.host_breaker.short_circuited
+            )
+        if self.script_filter:
+            script_stats = self.script_filter.stats
+            logging.info(
+                "Script filter: %s scripts scanned, %s skipped (%s cached, %s libraries, "
+                "%s without contact markers, %s oversized)",
+                script_stats['scanned'], self.script_filter.skipped, script_stats['cached'],
+                script_stats['library'], script_stats['no_markers'], script_stats['oversized']
+            )
+        if self.input_dedup and self.input_dedup.saved:
+            logging.info(
+                "Input deduplication: %s rows, %s scraped, %s scrapes saved",
+                self.input_dedup.rows, self.input_dedup.scraped, self.input_dedup.saved
+            )
+        if self.archive_manager:
+            logging.info(
+                "Archive: %s pages, %s compressed bytes written",
+                self.archive_manager.records, self.archive_manager.bytes_written
+            )
+        if self.result_store:
+            logging.info(
+                "Parquet output: %s rows in %s files",
+                self.result_store.rows_written, self.result_store.files_written
+            )
     
     def _create_failed_result(self, company: str) -> Dict:
         """Create a standardized failed result entry."""
@@ -92,7 +288,9 @@ class BatchProcessor:
     def _save_batch_results(self, results: List[Dict], batch_number: int, 
                            absolute_start_index: int) -> None:
         """Save batch results to Excel file."""
-        df_results = pd.DataFrame(results)
+        import pandas as pd
+        # Fixed columns, so appended rows line up with the header of earlier runs
+        df_results = pd.DataFrame(results, columns=list(RESULT_COLUMNS))
         
         if not os.path.exists(self.output_file):
             with pd.ExcelWriter(self.output_file, engine='openpyxl') as writer:
@@ -104,6 +302,16 @@ class BatchProcessor:
                 start_row = current_position + 1
                 df_results.to_excel(writer, index=False, startrow=start_row, header=False)
     
+    def _write_result_store(self, results: List[Dict], batch_number: int) -> None:
+        """Add a batch to the Parquet copy, a failed write never loses the batch's Excel rows."""
+        if not self.result_store:
+            return
+        try:
+            self.result_store.write_batch(results, batch_number)
+        except Exception as e:
+            # pyarrow missing, disk full or an unwritable PARQUET_OUTPUT_DIR
+            logging.error("Could not write batch %s to %s: %s", batch_number, self.result_store.directory, e)
+    
     def process_companies(self, input_file: str, start_index: int = 0, 
                          batch_size: int = 100, total_limit: Optional[int] = None,
                          max_workers: int = 5) -> None:
@@ -117,6 +325,7 @@ class BatchProcessor:
             total_limit (Optional[int]): Maximum number of companies to process
             max_workers (int): Maximum number of concurrent workers
         """
+        import pandas as pd
         try:
             df = pd.read_excel(input_file)
             all_companies = df.iloc[:, 0].tolist()
@@ -128,15 +337,18 @@ class BatchProcessor:
             remaining_companies = total_companies - start_index
             num_batches = (remaining_companies + batch_size - 1) // batch_size
             
-            logging.info(f"Starting processing of {remaining_companies} companies in {num_batches} batches")
+            logging.info("Starting processing of %s companies in %s batches",
+                         remaining_companies, num_batches)
             
-            all_results = []
+            # Running counters, results are not kept once their batch is saved
+            run_stats = ResultStats()
             
             for batch_num in range(num_batches):
                 batch_start = start_index + (batch_num * batch_size)
                 batch_end = min(batch_start + batch_size, total_companies)
                 
-                logging.info(f"Processing batch {batch_num + 1}/{num_batches} (companies {batch_start}-{batch_end})")
+                logging.info("Processing batch %s/%s (companies %s-%s)",
+                             batch_num + 1, num_batches, batch_start, batch_end)
                 
                 batch_companies = [
                     str(company).strip() 
@@ -147,48 +359,29 @@ class BatchProcessor:
                 batch_results = self.process_batch(
                     batch_companies, batch_num, start_index, max_workers
                 )
-                all_results.extend(batch_results)
+                run_stats.add_all(batch_results)
                 
                 self._print_batch_summary(batch_results, batch_num + 1)
                 
                 if batch_num < num_batches - 1:
                     time.sleep(5)
             
-            self._print_final_summary(all_results)
+            self._print_final_summary(run_stats)
+            if self.input_dedup and self.input_dedup.saved:
+                print(f"Input deduplication saved {self.input_dedup.saved} of {self.input_dedup.rows} scrapes")
             
         except Exception as e:
-            logging.error(f"Error processing companies: {str(e)}")
+            logging.error("Error processing companies: %s", e)
             raise
+        finally:
+            self._close_resources()
     
     def _print_batch_summary(self, results: List[Dict], batch_num: int) -> None:
         """Print summary for a single batch."""
         print(f"\nBatch {batch_num} Summary:")
-        self._print_summary(results)
+        ResultStats().add_all(results).print_summary()
     
-    def _print_final_summary(self, results: List[Dict]) -> None:
-        """Print final summary of all results."""
+    def _print_final_summary(self, stats: ResultStats) -> None:
+        """Print final summary from the run's running counters."""
         print("\nFinal Summary:")
-        self._print_summary(results)
-    
-    def _print_summary(self, results: List[Dict]) -> None:
-        """Print detailed summary statistics."""
-        total = len(results)
-        with_website = sum(1 for r in results if r['website'])
-        with_email = sum(1 for r in results if r['email'])
-        with_phone = sum(1 for r in results if r['phone'])
-        success_count = sum(1 for r in results if r['status'] == 'success')
-        
-        print("\nDetailed Summary Statistics:")
-        print(f"Total companies processed: {total}")
-        print(f"Successfully processed: {success_count} ({(success_count/total)*100:.1f}%)")
-        print(f"Companies with website: {with_website} ({(with_website/total)*100:.1f}%)")
-        print(f"Companies with email: {with_email} ({(with_email/total)*100:.1f}%)")
-        print(f"Companies with phone: {with_phone} ({(with_phone/total)*100:.1f}%)")
-        
-        status_counts = defaultdict(int)
-        for result in results:
-            status_counts[result['status']] += 1
-        
-        print("\nStatus Breakdown:")
-        for status, count in status_counts.items():
-            print(f"{status}: {count} ({(count/total)*100:.1f}%)")
\ No newline at end of file
+        stats.print_summary()
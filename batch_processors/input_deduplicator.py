@@ -0,0 +1,82 @@
+import threading
+from typing import Dict, List, Tuple
+
+from utils.company_names import CompanyNameNormalizer
+
+# Results shared with later batches, errors and partial results are scraped again
+FINAL_STATUSES = ('success', 'no_website_found')
+
+
+class InputDeduplicator:
+    """
+    Scrape each company once per run, however often it appears in the input.
+    Input names are grouped by their normalized key (case, punctuation,
+    accents and legal form ignored) in a hash index; one representative per
+    group is scraped and its result is fanned back out to every row of the
+    group, including rows in later batches.
+    """
+
+    def __init__(self, legal_suffix_tlds: Dict[str, List[str]]):
+        """
+        Initialize InputDeduplicator.
+
+        Args:
+            legal_suffix_tlds (Dict[str, List[str]]): Legal forms to ignore (LEGAL_SUFFIX_TLDS)
+        """
+        self.names = CompanyNameNormalizer(legal_suffix_tlds)
+        self._results = {}
+        # Non-final results of the current batch, fanned out to its own rows only
+        self._batch_results = {}
+        self._lock = threading.Lock()
+        self.rows = 0
+        self.scraped = 0
+
+    @property
+    def saved(self) -> int:
+        """Scrapes avoided so far."""
+        return self.rows - self.scraped
+
+    def plan(self, companies: List[str]) -> Tuple[List[str], List[str]]:
+        """
+        Group a batch of input names.
+
+        Args:
+            companies (List[str]): Company names of the batch, in input order
+
+        Returns:
+            Tuple[List[str], List[str]]: The key of every input row, and the representative
+            names that still have to be scraped (first row of each new key)
+        """
+        keys = [self.names.key(company) for company in companies]
+        representatives = {}
+        with self._lock:
+            for company, key in zip(companies, keys):
+                if key not in self._results and key not in representatives:
+                    representatives[key] = company
+        return keys, list(representatives.values())
+
+    def record(self, company: str, result: Dict) -> None:
+        """Store the result of a scraped representative for its group, for later batches if final."""
+        key = self.names.key(company)
+        with self._lock:
+            if result.get('status') in FINAL_STATUSES:
+                self._results[key] = result
+            else:
+                self._batch_results[key] = result
+            self.scraped += 1
+
+    def fan_out(self, companies: List[str], keys: List[str]) -> List[Dict]:
+        """
+        Results for every input row, each carrying the row's own company name.
+
+        Returns:
+            List[Dict]: Results in input order
+        """
+        with self._lock:
+            self.rows += len(companies)
+            results = [
+                dict(self._results.get(key) or self._batch_results[key], company_name=company)
+                for company, key in zip(companies, keys)
+            ]
+            self._batch_results.clear()
+            return results
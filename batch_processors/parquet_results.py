@@ -0,0 +1,180 @@
+import logging
+import os
+from datetime import datetime
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Union
+
+if TYPE_CHECKING:
+    import pandas as pd
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+
+# Partition key, one directory per status (status=success/, status=error/, ...)
+PARTITION_COLUMN = 'status'
+# Columns naming the checkpoint a row was written by, later runs sort after earlier ones
+CHECKPOINT_COLUMNS = ('run', 'batch')
+
+
+def _file_schema() -> 'pa.Schema':
+    """Columns stored in each part file, the status comes from its directory."""
+    import pyarrow as pa
+    label = pa.dictionary(pa.int8(), pa.string())
+    return pa.schema([
+        ('company_name', pa.string()),
+        ('website', pa.string()),
+        ('email', pa.string()),
+        ('phone', pa.string()),
+        ('website_source', label),  # known, guess, search or directory
+        ('website_seconds', pa.float32()),
+        ('elapsed_seconds', pa.float32()),
+        ('requests', pa.int32()),
+        ('batch', pa.int32()),
+        ('run', label),
+    ])
+
+
+class ParquetResultStore:
+    """
+    Columnar copy of the results, written as Parquet files partitioned by status.
+    Every checkpoint (batch) adds one part file per status it produced, written
+    under a temporary name and renamed into place, so an interrupted run leaves
+    only complete files and earlier checkpoints are never rewritten. Readers
+    memory-map the files and push column selections and filters down to the
+    files, so re-processing and analytics never load the whole result set.
+    A company processed again keeps its earlier rows, possibly under another
+    status; readers get only the newest row per company unless they ask for
+    the full history with latest=False.
+    """
+
+    def __init__(self, directory: str):
+        """
+        Initialize ParquetResultStore.
+
+        Args:
+            directory (str): Root directory of the partitioned dataset (PARQUET_OUTPUT_DIR)
+        """
+        self.directory = directory
+        self.run = f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{os.getpid()}"
+        self.files_written = 0
+        self.rows_written = 0
+
+    def write_batch(self, results: List[Dict], batch_number: int) -> None:
+        """
+        Write the results of one checkpoint.
+
+        Args:
+            results (List[Dict]): Results of the batch, as returned by process_company
+            batch_number (int): Batch number, part of the file names
+        """
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        schema = _file_schema()
+        by_status = {}
+        for result in results:
+            by_status.setdefault(result.get('status') or 'unknown', []).append(result)
+
+        for status, rows in by_status.items():
+            table = pa.Table.from_pylist([
+                dict({name: row.get(name) for name in schema.names}, batch=batch_number, run=self.run)
+                for row in rows
+            ], schema=schema)
+            partition = os.path.join(self.directory, f"{PARTITION_COLUMN}={status}")
+            os.makedirs(partition, exist_ok=True)
+            file_name = f"part-{self.run}-{batch_number:05d}.parquet"
+            # Dataset discovery ignores dot files, readers never see a file being written
+            temp_path = os.path.join(partition, f".{file_name}.tmp")
+            pq.write_table(table, temp_path, compression='zstd')
+            os.replace(temp_path, os.path.join(partition, file_name))
+            self.files_written += 1
+            self.rows_written += len(rows)
+        logging.info("Batch %s written to %s (%s rows, %s files)",
+                     batch_number, self.directory, len(results), len(by_status))
+
+    def dataset(self) -> 'ds.Dataset':
+        """All part files as one memory-mapped dataset, status read from the directory names."""
+        import pyarrow.dataset as ds
+        from pyarrow import fs
+        return ds.dataset(
+            self.directory,
+            format='parquet',
+            partitioning=ds.HivePartitioning.discover(infer_dictionary=True),
+            filesystem=fs.LocalFileSystem(use_mmap=True)
+        )
+
+    @staticmethod
+    def _row_keys(table: 'pa.Table', checkpoints: 'pa.Array') -> 'pa.Array':
+        """Company name and checkpoint of each row joined into one string."""
+        import pyarrow.compute as pc
+        names = pc.fill_null(table['company_name'].cast('string'), '')
+        return pc.binary_join_element_wise(names, checkpoints, '\x1f')
+
+    @staticmethod
+    def _checkpoints(table: 'pa.Table') -> 'pa.Array':
+        """Sortable checkpoint of each row, run then zero-padded batch number."""
+        import pyarrow.compute as pc
+        batches = pc.utf8_lpad(table['batch'].cast('string'), 5, '0')
+        return pc.binary_join_element_wise(pc.fill_null(table['run'].cast('string'), ''),
+                                           pc.fill_null(batches, ''), '-')
+
+    def _newest_rows(self, dataset: 'ds.Dataset') -> 'pa.Array':
+        """Row keys of the newest checkpoint of every company, read from three columns only."""
+        import pyarrow as pa
+        keys = dataset.to_table(columns=['company_name', *CHECKPOINT_COLUMNS])
+        keys = pa.table({'company_name': keys['company_name'], 'checkpoint': self._checkpoints(keys)})
+        newest = keys.group_by('company_name').aggregate([('checkpoint', 'max')])
+        return self._row_keys(newest, newest['checkpoint_max'])
+
+    def read(self, columns: Optional[List[str]] = None,
+             filters: Union['ds.Expression', List, None] = None, latest: bool = True) -> 'pa.Table':
+        """
+        Read the selected columns of the matching rows.
+
+        Args:
+            columns (Optional[List[str]]): Columns to read, all if None
+            filters (Union[ds.Expression, List, None]): Dataset expression, or filters in the
+                pyarrow.parquet form such as [('status', 'in', ['error', 'failed'])]
+            latest (bool): Only the row of the newest checkpoint of each company; a row
+                replaced by a later run is dropped even if the filter matches it
+
+        Returns:
+            pa.Table: Matching rows; files of other statuses are not opened when
+            the filter is on the status
+        """
+        import pyarrow.compute as pc
+        import pyarrow.parquet as pq
+        if isinstance(filters, list):
+            filters = pq.filters_to_expression(filters)
+        dataset = self.dataset()
+        if not latest:
+            return dataset.to_table(columns=columns, filter=filters)
+
+        selected = list(columns or dataset.schema.names)
+        extra = [name for name in ('company_name', *CHECKPOINT_COLUMNS) if name not in selected]
+        table = dataset.to_table(columns=selected + extra, filter=filters)
+        newest = pc.is_in(self._row_keys(table, self._checkpoints(table)), value_set=self._newest_rows(dataset))
+        return table.filter(newest).select(selected)
+
+    def to_pandas(self, columns: Optional[List[str]] = None,
+                  filters: Union['ds.Expression', List, None] = None, latest: bool = True) -> 'pd.DataFrame':
+        """Matching rows as a DataFrame, see read()."""
+        return self.read(columns, filters, latest).to_pandas()
+
+    def incomplete(self, retry_statuses: Iterable[str],
+                   columns: Optional[List[str]] = None) -> 'pd.DataFrame':
+        """
+        Rows a re-processing pass would pick up.
+
+        Args:
+            retry_statuses (Iterable[str]): Statuses processed again (ReProcessor.RETRY_STATUSES)
+            columns (Optional[List[str]]): Columns to read, all if None
+
+        Returns:
+            pd.DataFrame: Newest rows of companies with a missing website, email or phone
+            or a retry status
+        """
+        import pyarrow.dataset as ds
+        missing = None
+        for field in ('website', 'email', 'phone'):
+            condition = ds.field(field).is_null() | (ds.field(field) == '')
+            missing = condition if missing is None else missing | condition
+        retry = ds.field(PARTITION_COLUMN).isin(sorted(retry_statuses))
+        return self.to_pandas(columns, missing | retry)
@@ -0,0 +1,139 @@
+import logging
+import os
+import shutil
+import time
+from typing import TYPE_CHECKING, Dict, Optional
+
+from batch_processors.batch_processor import BatchProcessor
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+class ReProcessor(BatchProcessor):
+    """
+    Incremental re-scrape of a previous output file.
+    Only rows with a missing website, email or phone (or a failed status) are
+    processed again, only the stages needed to fill the missing fields run, and
+    the results are written back as in-place row updates.
+    """
+
+    CONTACT_FIELDS = ('website', 'email', 'phone')
+    RETRY_STATUSES = {'error', 'failed', 'encoding_error', 'budget_exceeded'}
+
+    def __init__(self, input_file: str, output_file: str, max_workers: int = 5):
+        """
+        Initialize ReProcessor.
+
+        Args:
+            input_file (str): Path to the previous output Excel file
+            output_file (str): Path to write the updated file to, may be the same as input_file
+            max_workers (int): Maximum number of concurrent workers
+        """
+        super().__init__(output_file=output_file)
+        self.input_file = input_file
+        self.max_workers = max_workers
+
+    def _needs_reprocessing(self, row: 'pd.Series') -> bool:
+        """Check whether a row has missing fields or a failed status."""
+        import pandas as pd
+        if any(pd.isna(row.get(field)) or not row.get(field) for field in self.CONTACT_FIELDS):
+            return True
+        return row.get('status') in self.RETRY_STATUSES
+
+    def _known_fields(self, row: 'pd.Series') -> Dict:
+        """Fields already found for a row, passed on so their stages are skipped."""
+        import pandas as pd
+        return {
+            field: row[field] for field in self.CONTACT_FIELDS
+            if field in row and pd.notna(row[field]) and row[field]
+        }
+
+    def reprocess_companies(self, batch_size: int = 50, start_index: int = 0,
+                            total_limit: Optional[int] = None) -> None:
+        """
+        Re-scrape incomplete rows in batches.
+
+        Args:
+            batch_size (int): Number of companies to process per batch
+            start_index (int): First row of the input file to consider
+            total_limit (Optional[int]): Maximum number of rows to reprocess
+        """
+        import pandas as pd
+        try:
+            df = pd.read_excel(self.input_file)
+            # Like the batch reader, names without a company_name header are in the first column
+            name_column = 'company_name' if 'company_name' in df.columns else df.columns[0]
+            for column in self.CONTACT_FIELDS + ('status',):
+                if column not in df.columns:
+                    df[column] = None
+
+            if os.path.abspath(self.input_file) != os.path.abspath(self.output_file):
+                shutil.copyfile(self.input_file, self.output_file)
+
+            candidates = [
+                index for index, row in df.iloc[start_index:].iterrows()
+                if pd.notna(row[name_column]) and self._needs_reprocessing(row)
+            ]
+            if total_limit:
+                candidates = candidates[:total_limit]
+
+            num_batches = (len(candidates) + batch_size - 1) // batch_size
+            skipped_search = sum(1 for index in candidates if self._known_fields(df.loc[index]).get('website'))
+            logging.info(
+                "Reprocessing %s of %s rows in %s batches (%s with a known website skip the search)",
+                len(candidates), len(df), num_batches, skipped_search
+            )
+
+            for batch_num in range(num_batches):
+                batch_indexes = candidates[batch_num * batch_size:(batch_num + 1) * batch_size]
+                logging.info("Reprocessing batch %s/%s (%s rows)",
+                             batch_num + 1, num_batches, len(batch_indexes))
+
+                companies = [str(df.at[index, name_column]).strip() for index in batch_indexes]
+                known = [self._known_fields(df.loc[index]) for index in batch_indexes]
+                results = self._scrape_companies(companies, self.max_workers, known=known)
+
+                self._update_rows(dict(zip(batch_indexes, results)))
+                self._write_result_store(results, batch_num)
+                self._print_batch_summary(results, batch_num + 1)
+                self._log_session_stats()
+
+                if batch_num < num_batches - 1:
+                    time.sleep(5)
+
+        except Exception as e:
+            logging.error("Error reprocessing companies: %s", e)
+            raise
+        finally:
+            self._close_resources()
+
+    def _update_rows(self, updates: Dict[int, Dict]) -> None:
+        """
+        Write changed fields of the given rows into the output workbook.
+
+        Args:
+            updates (Dict[int, Dict]): Results keyed by DataFrame row index
+        """
+        from openpyxl import load_workbook
+        workbook = load_workbook(self.output_file)
+        sheet = workbook.active
+        header = {cell.value: cell.column for cell in sheet[1]}
+        for column in self.CONTACT_FIELDS + ('status',):
+            if column not in header:
+                header[column] = sheet.max_column + 1
+                sheet.cell(row=1, column=header[column], value=column)
+
+        changed = 0
+        for index, result in updates.items():
+            # Row 1 holds the header, DataFrame index 0 is sheet row 2
+            sheet_row = index + 2
+            for field in self.CONTACT_FIELDS:
+                cell = sheet.cell(row=sheet_row, column=header[field])
+                if not cell.value and result.get(field):
+                    cell.value = result[field]
+                    changed += 1
+            sheet.cell(row=sheet_row, column=header['status'], value=result['status'])
+
+        workbook.save(self.output_file)
+        logging.info("Updated %s fields in %s rows of %s", changed, len(updates), self.output_file)
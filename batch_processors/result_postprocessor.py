@@ -0,0 +1,155 @@
+import logging
+import os
+from typing import TYPE_CHECKING, Dict, Optional
+
+from batch_processors.parquet_results import ParquetResultStore
+from batch_processors.result_stats import ResultStats
+from config.scraping_config import ScrapingConfig
+from utils.validators import ContactValidators
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+RESULT_COLUMNS = ('company_name', 'website', 'email', 'phone', 'status')
+
+
+class ResultPostProcessor:
+    """
+    Cleanup and reporting over whole result tables.
+    Emails and phones are validated and normalized with column-wise string
+    operations instead of per-row validator calls, duplicate rows are
+    dropped, and emails used by many companies (web agencies, hosters,
+    directory placeholders) are flagged. The rules are the ones
+    ContactValidators applies to single values during scraping.
+    """
+
+    def __init__(self, shared_email_threshold: Optional[int] = None):
+        """
+        Initialize ResultPostProcessor.
+
+        Args:
+            shared_email_threshold (Optional[int]): Companies sharing an email before it is
+                flagged, SHARED_EMAIL_THRESHOLD if None
+        """
+        config = ScrapingConfig.load()
+        self.shared_email_threshold = shared_email_threshold or config.SHARED_EMAIL_THRESHOLD
+        self.stats = {}
+
+    @staticmethod
+    def _blank_to_na(series: 'pd.Series') -> 'pd.Series':
+        """Stripped nullable strings, empty values become NA."""
+        values = series.astype('string').str.strip()
+        return values.mask(values == '')
+
+    def normalize_emails(self, emails: 'pd.Series') -> 'pd.Series':
+        """Lowercased emails, invalid ones replaced by NA (ContactValidators._validate_email)."""
+        emails = self._blank_to_na(emails).str.lower()
+        domains = emails.str.split('@', n=1).str[1]
+        valid = (
+            emails.str.fullmatch(ContactValidators.EMAIL_PATTERN)
+            & ~domains.isin(list(ContactValidators.INVALID_EMAIL_DOMAINS))
+            & emails.str.len().between(3, 254)
+        )
+        return emails.where(valid.fillna(False).astype(bool))
+
+    def normalize_phones(self, phones: 'pd.Series') -> 'pd.Series':
+        """
+        Phones reduced to digits and '+', 10-digit numbers prefixed with +1 and
+        invalid ones replaced by NA (ContactValidators._validate_phone/_format_phone).
+        """
+        import pandas as pd
+        if pd.api.types.is_float_dtype(phones):
+            # Numbers typed into a spreadsheet come back as floats, 4930123.0 must not gain a digit
+            phones = phones.round().astype('Int64')
+        elif phones.dtype == object:
+            # The same floats mixed with strings in an object column
+            phones = phones.map(lambda value: int(value) if isinstance(value, float) and value.is_integer() else value)
+        phones = self._blank_to_na(phones).str.replace(ContactValidators.PHONE_STRIP_PATTERN, '', regex=True)
+        lengths = phones.str.len()
+        valid = lengths.between(5, 20) & phones.str.contains(r'\d', regex=True)
+        north_american = ~phones.str.startswith('+') & (lengths == 10)
+        phones = phones.mask(north_american.fillna(False).astype(bool), '+1' + phones)
+        return phones.where(valid.fillna(False).astype(bool))
+
+    def process(self, df: 'pd.DataFrame') -> 'pd.DataFrame':
+        """
+        Normalize, deduplicate and flag a results table.
+
+        Args:
+            df (pd.DataFrame): Results with company_name, website, email, phone and status columns
+
+        Returns:
+            pd.DataFrame: Cleaned table with email_shared_by and shared_email columns added
+        """
+        df = df.copy()
+        for column in RESULT_COLUMNS:
+            if column not in df:
+                df[column] = None
+
+        had_email = df['email'].notna() & df['email'].astype(str).str.strip().ne('')
+        had_phone = df['phone'].notna() & df['phone'].astype(str).str.strip().ne('')
+        df['email'] = self.normalize_emails(df['email'])
+        df['phone'] = self.normalize_phones(df['phone'])
+        df['website'] = self._blank_to_na(df['website'])
+        emails_cleared = int((had_email & df['email'].isna()).sum())
+        phones_cleared = int((had_phone & df['phone'].isna()).sum())
+
+        # Normalized values make rows that only differed in formatting identical
+        rows = len(df)
+        df = df.drop_duplicates(subset=['company_name', 'website', 'email', 'phone'])
+
+        shared_by = df.groupby('email')['company_name'].transform('nunique')
+        df['email_shared_by'] = shared_by.fillna(0).astype(int)
+        df['shared_email'] = df['email_shared_by'] >= self.shared_email_threshold
+
+        self.stats = {
+            'rows': rows,
+            'duplicates_dropped': rows - len(df),
+            'emails_cleared': emails_cleared,
+            'phones_cleared': phones_cleared,
+            'shared_emails': int(df.loc[df['shared_email'], 'email'].nunique()),
+            'rows_with_shared_email': int(df['shared_email'].sum()),
+        }
+        # NA to None, so spreadsheet writers get empty cells
+        for column in ('website', 'email', 'phone'):
+            df[column] = df[column].astype(object).where(df[column].notna(), None)
+        return df
+
+    def summarize(self, df: 'pd.DataFrame') -> ResultStats:
+        """Summary counters of a results table, computed column-wise in one pass."""
+        return ResultStats().add_frame(df)
+
+    def process_file(self, input_file: str, output_file: str) -> Dict:
+        """
+        Post-process a results file (.xlsx or .csv) or Parquet dataset and print its summary.
+
+        Args:
+            input_file (str): Results written by a batch run, or its PARQUET_OUTPUT_DIR
+            output_file (str): Path of the cleaned table, same format as the extension says
+
+        Returns:
+            Dict: Counts of dropped duplicates, cleared values and flagged shared emails
+        """
+        import pandas as pd
+        if os.path.isdir(input_file):
+            df = ParquetResultStore(input_file).to_pandas(columns=list(RESULT_COLUMNS))
+            df['status'] = df['status'].astype(str)  # Partition values come back as categories
+        else:
+            reader = pd.read_csv if input_file.endswith('.csv') else pd.read_excel
+            df = reader(input_file)
+        df = self.process(df)
+        if output_file.endswith('.csv'):
+            df.to_csv(output_file, index=False)
+        else:
+            df.to_excel(output_file, index=False, engine='openpyxl')
+
+        logging.info(
+            "Post-processed %s rows of %s: %s duplicates dropped, %s emails and %s phones cleared, "
+            "%s emails shared by %s+ companies (%s rows)",
+            self.stats['rows'], os.path.basename(input_file), self.stats['duplicates_dropped'],
+            self.stats['emails_cleared'], self.stats['phones_cleared'], self.stats['shared_emails'],
+            self.shared_email_threshold, self.stats['rows_with_shared_email']
+        )
+        print("\nPost-processed Summary:")
+        self.summarize(df).print_summary()
+        return self.stats
@@ -0,0 +1,63 @@
+from collections import defaultdict
+from typing import TYPE_CHECKING, Dict, Iterable
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+class ResultStats:
+    """
+    Running counters for result summaries.
+    Results are counted as they come in, so a run's summary does not require
+    keeping every result dict in memory until the end.
+    """
+
+    def __init__(self):
+        self.total = 0
+        self.with_website = 0
+        self.with_email = 0
+        self.with_phone = 0
+        self.status_counts = defaultdict(int)
+
+    def add(self, result: Dict) -> None:
+        """Count one result."""
+        self.total += 1
+        self.with_website += bool(result['website'])
+        self.with_email += bool(result['email'])
+        self.with_phone += bool(result['phone'])
+        self.status_counts[result['status']] += 1
+
+    def add_all(self, results: Iterable[Dict]) -> 'ResultStats':
+        """Count several results, returns self for chaining."""
+        for result in results:
+            self.add(result)
+        return self
+
+    def add_frame(self, df: 'pd.DataFrame') -> 'ResultStats':
+        """Count all rows of a results table with column-wise operations, returns self."""
+        self.total += len(df)
+        for column, counter in (('website', 'with_website'), ('email', 'with_email'), ('phone', 'with_phone')):
+            if column in df:
+                # Same truthiness as add(): missing values and empty strings do not count
+                filled = df[column].notna() & df[column].astype(str).ne('')
+                setattr(self, counter, getattr(self, counter) + int(filled.sum()))
+        if 'status' in df:
+            for status, count in df['status'].value_counts().items():
+                self.status_counts[status] += int(count)
+        return self
+
+    def print_summary(self) -> None:
+        """Print detailed summary statistics."""
+        total = max(1, self.total)
+        success_count = self.status_counts.get('success', 0)
+
+        print("\nDetailed Summary Statistics:")
+        print(f"Total companies processed: {self.total}")
+        print(f"Successfully processed: {success_count} ({(success_count/total)*100:.1f}%)")
+        print(f"Companies with website: {self.with_website} ({(self.with_website/total)*100:.1f}%)")
+        print(f"Companies with email: {self.with_email} ({(self.with_email/total)*100:.1f}%)")
+        print(f"Companies with phone: {self.with_phone} ({(self.with_phone/total)*100:.1f}%)")
+
+        print("\nStatus Breakdown:")
+        for status, count in self.status_counts.items():
+            print(f"{status}: {count} ({(count/total)*100:.1f}%)")
@@ -0,0 +1,324 @@
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+from urllib.parse import parse_qs, urlparse
+
+from batch_processors.batch_processor import BatchProcessor
+from batch_processors.input_deduplicator import FINAL_STATUSES
+from config.scraping_config import ScrapingConfig
+from utils.log_pipeline import LogPipeline
+from utils.single_flight import SingleFlight
+
+# Results that stay valid until the cache entry expires, errors and partial results are retried
+CACHEABLE_STATUSES = FINAL_STATUSES
+
+
+class ScrapeService(BatchProcessor):
+    """
+    Long-running company lookup service.
+    One scraper with its session pool, browser pool, domain guesser and
+    circuit breaker stays warm for the lifetime of the process. Concurrent
+    lookups of the same company share one scrape, and answers are cached
+    in memory and in an append-only file, so repeated lookups return at once.
+    """
+
+    def __init__(self, max_concurrent: Optional[int] = None):
+        """
+        Initialize ScrapeService and load cached answers.
+
+        Args:
+            max_concurrent (Optional[int]): Companies scraped at once, SERVICE_MAX_CONCURRENT if None
+        """
+        super().__init__(output_file=None)
+        self.config = ScrapingConfig.load()
+        self.max_concurrent = max_concurrent or self.config.SERVICE_MAX_CONCURRENT
+        # Coalesces lookups of a company that is being scraped right now
+        self.lookups = SingleFlight(remember=False)
+        # Crawls of a site are merged only while they run, answers are kept by the cache
+        # with its expiry, refresh and retry of failed statuses
+        self.site_flight = SingleFlight(remember=False)
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self.cache_path = os.path.join(self.config.CACHE_DIR, self.config.SERVICE_CACHE_FILE)
+        self._load_cache()
+        self._cache_file = None
+        self.scraper = None
+        self._start_lock = threading.Lock()
+        self.stats = {'lookups': 0, 'cache_hits': 0, 'coalesced': 0, 'scraped': 0}
+        self._stats_lock = threading.Lock()
+
+    def _setup_logging(self) -> None:
+        """Log to stderr, stdout carries the JSON lines answers in stdin mode."""
+        config = ScrapingConfig.load()
+        LogPipeline.install(
+            log_file=config.LOG_FILE,
+            level=logging.INFO,
+            json_file=config.LOG_JSON,
+            rate_limit_burst=config.LOG_RATE_LIMIT_BURST,
+            rate_limit_interval=config.LOG_RATE_LIMIT_INTERVAL,
+            stream=sys.stderr
+        )
+
+    @staticmethod
+    def cache_key(company_name: str) -> str:
+        """Case and whitespace insensitive key of a company name."""
+        return ' '.join(company_name.split()).casefold()
+
+    def _load_cache(self) -> None:
+        """Load unexpired answers, later lines replace earlier ones for the same company."""
+        max_age = self.config.CACHE_DURATION.total_seconds()
+        now = time.time()
+        try:
+            with open(self.cache_path, encoding='utf-8') as cache_file:
+                for line in cache_file:
+                    try:
+                        entry = json.loads(line)
+                        if now - entry.get('stored_at', 0) >= max_age:
+                            continue
+                        key = self.cache_key(entry['result']['company_name'])
+                    except (ValueError, KeyError, TypeError, AttributeError):
+                        continue  # A line cut short by a crash or not written by this service
+                    self._cache_put(key, entry)
+        except OSError:
+            return
+        logging.info("Loaded %s cached answers from %s", len(self._cache), self.cache_path)
+
+    def _cache_put(self, key: str, entry: Dict) -> None:
+        with self._cache_lock:
+            self._cache[key] = entry
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.config.SERVICE_CACHE_SIZE:
+                self._cache.popitem(last=False)
+
+    def _cache_get(self, key: str) -> Optional[Dict]:
+        max_age = self.config.CACHE_DURATION.total_seconds()
+        with self._cache_lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                return None
+            if time.time() - entry['stored_at'] >= max_age:
+                del self._cache[key]
+                return None
+            self._cache.move_to_end(key)
+            return entry['result']
+
+    def _store(self, key: str, result: Dict) -> None:
+        """Cache a final answer in memory and append it to the cache file."""
+        entry = {'stored_at': time.time(), 'result': result}
+        self._cache_put(key, entry)
+        with self._cache_lock:
+            try:
+                if self._cache_file is None:
+                    os.makedirs(os.path.dirname(self.cache_path) or '.', exist_ok=True)
+                    self._cache_file = open(self.cache_path, 'a', encoding='utf-8')
+                self._cache_file.write(json.dumps(entry, ensure_ascii=False) + '\n')
+                self._cache_file.flush()
+            except OSError as e:
+                logging.warning("Could not write service cache %s: %s", self.cache_path, e)
+
+    def _count(self, name: str) -> None:
+        with self._stats_lock:
+            self.stats[name] += 1
+
+    def start(self) -> None:
+        """Create the warm scraper, its shared pools and the scraping threads."""
+        with self._start_lock:
+            if self.scraper is None:
+                self.scraper = self._create_scraper()
+                # Scrapes run on max_concurrent persistent threads whose sessions stay warm,
+                # not on the request threads, which would each leave a session behind
+                self._worker_pool(self.max_concurrent)
+                if self.domain_guesser:
+                    self.domain_guesser.size_for(self.max_concurrent)
+                logging.info("Scrape service ready, %s concurrent scrapes", self.max_concurrent)
+
+    def lookup(self, company_name: str, known: Optional[Dict] = None, refresh: bool = False) -> Dict:
+        """
+        Look up a company, from the cache if possible.
+
+        Args:
+            company_name (str): Company name to look up
+            known (Optional[Dict]): Previously found fields (website, email, phone)
+            refresh (bool): Scrape again even if a cached answer exists
+
+        Returns:
+            Dict: Result of process_company plus 'source' ('cache', 'coalesced' or 'scraped')
+        """
+        self.start()
+        self._count('lookups')
+        key = self.cache_key(company_name)
+        if not refresh:
+            cached = self._cache_get(key)
+            if cached is not None:
+                self._count('cache_hits')
+                return dict(cached, company_name=company_name, source='cache')
+
+        # A result built on the caller's known fields is neither shared nor cached
+        if known:
+            result, shared = self._scrape(key, company_name, known), False
+        else:
+            result, shared = self.lookups.do(key, self._scrape, key, company_name, None)
+        if shared:
+            self._count('coalesced')
+        return dict(result, company_name=company_name, source='coalesced' if shared else 'scraped')
+
+    def _scrape(self, key: str, company_name: str, known: Optional[Dict]) -> Dict:
+        result = self._executor.submit(self.scraper.process_company, company_name, known).result()
+        self._count('scraped')
+        # No batch ends in a service, dead hosts are written after the scrape that tripped them
+        if self.host_breaker:
+            self.host_breaker.flush()
+        if not known and result['status'] in CACHEABLE_STATUSES:
+            self._store(key, result)
+        return result
+
+    def get_stats(self) -> Dict:
+        """Lookup counters and the state of the warm pools."""
+        with self._stats_lock:
+            stats = dict(self.stats)
+        stats['cached_answers'] = len(self._cache)
+        stats['in_flight'] = len(self.lookups)
+        if self.session_manager:
+            stats['session_pool'] = self.session_manager.get_stats()
+        return stats
+
+    def serve(self, host: Optional[str] = None, port: Optional[int] = None) -> None:
+        """Serve lookups over HTTP until interrupted."""
+        self.start()
+        host = host or self.config.SERVICE_HOST
+        port = port or self.config.SERVICE_PORT
+        server = ThreadingHTTPServer((host, port), _ServiceRequestHandler)
+        server.daemon_threads = True
+        server.service = self
+        logging.info("Scrape service listening on %s:%s", host, port)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            self.close()
+
+    def serve_stdin(self, input_stream=None, output_stream=None) -> None:
+        """
+        Answer JSON lines from stdin on stdout until end of input.
+        Each line is a company name or an object with company_name and optional
+        id, known and refresh. Answers are written as they complete and carry
+        the request's id; cached answers are written before slower scrapes finish.
+        """
+        self.start()
+        input_stream = input_stream or sys.stdin
+        output_stream = output_stream or sys.stdout
+        write_lock = threading.Lock()
+
+        def write(answer):
+            with write_lock:
+                output_stream.write(json.dumps(answer, ensure_ascii=False) + '\n')
+                output_stream.flush()
+
+        def answer(request_id, request):
+            try:
+                result = self.lookup(request['company_name'], request.get('known'), request.get('refresh', False))
+            except Exception as e:
+                logging.error("Lookup of %s failed: %s", request['company_name'], e)
+                result = dict(self._create_failed_result(request['company_name']), source='scraped')
+            if request_id is not None:
+                result['id'] = request_id
+            write(result)
+
+        # Threads wait on the scraping threads, more of them lets cache hits through
+        with ThreadPoolExecutor(max_workers=self.max_concurrent * 2) as executor:
+            try:
+                for line in input_stream:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        request = json.loads(line) if line.startswith('{') else {'company_name': line}
+                        request_id = request.get('id')
+                        if not request.get('company_name'):
+                            raise ValueError('company_name is required')
+                    except ValueError as e:
+                        write({'error': str(e), 'line': line})
+                        continue
+                    executor.submit(answer, request_id, request)
+            except KeyboardInterrupt:
+                pass
+        self.close()
+
+    def close(self) -> None:
+        """Release the warm pools and close the cache file."""
+        self._log_session_stats()
+        logging.info(
+            "Scrape service: %s lookups, %s from cache, %s coalesced, %s scraped",
+            self.stats['lookups'], self.stats['cache_hits'], self.stats['coalesced'], self.stats['scraped']
+        )
+        self._close_resources()
+        self.scraper = None
+        with self._cache_lock:
+            if self._cache_file is not None:
+                self._cache_file.close()
+                self._cache_file = None
+
+
+class _ServiceRequestHandler(BaseHTTPRequestHandler):
+    """
+    JSON API: GET /company?name=...&refresh=1, POST /company with
+    {company_name, known, refresh}, GET /stats and GET /health
+    """
+
+    def do_GET(self):
+        service = self.server.service
+        url = urlparse(self.path)
+        if url.path == '/health':
+            self._send_json(200, {'status': 'ok'})
+        elif url.path == '/stats':
+            self._send_json(200, service.get_stats())
+        elif url.path == '/company':
+            query = parse_qs(url.query)
+            name = query.get('name', [''])[0].strip()
+            if not name:
+                self._send_json(400, {'error': 'name is required'})
+                return
+            refresh = query.get('refresh', ['0'])[0] in ('1', 'true')
+            self._lookup(name, None, refresh)
+        else:
+            self._send_json(404, {'error': 'not found'})
+
+    def do_POST(self):
+        if urlparse(self.path).path != '/company':
+            self._send_json(404, {'error': 'not found'})
+            return
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            payload = json.loads(self.rfile.read(length) or b'{}')
+            name = payload['company_name'].strip()
+        except (KeyError, ValueError, AttributeError) as e:
+            self._send_json(400, {'error': str(e)})
+            return
+        self._lookup(name, payload.get('known'), bool(payload.get('refresh')))
+
+    def _lookup(self, name: str, known: Optional[Dict], refresh: bool) -> None:
+        try:
+            self._send_json(200, self.server.service.lookup(name, known, refresh))
+        except Exception as e:
+            logging.error("Service error for %s: %s", name, e)
+            self._send_json(500, {'error': str(e)})
+
+    def _send_json(self, status: int, body: Dict) -> None:
+        data = json.dumps(body, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        logging.debug("Service %s - %s", self.address_string(), format % args)
@@ -0,0 +1,287 @@
+import json
+import logging
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+
+
+class ShardCoordinator:
+    """
+    Hands out leased shards of input rows to distributed workers.
+    State lives in a local SQLite database, so a coordinator restart resumes
+    where it stopped. Leases that are not renewed by heartbeats expire and the
+    shard is handed to the next worker asking for work.
+    """
+
+    def __init__(self, db_path: str, lease_seconds: int = 300, max_attempts: int = 3):
+        """
+        Initialize the coordinator and its database.
+
+        Args:
+            db_path (str): Path to the SQLite database file
+            lease_seconds (int): Seconds a lease stays valid without a heartbeat
+            max_attempts (int): Leases per shard before it is marked as failed
+        """
+        self.db_path = db_path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self._lock = threading.Lock()
+        self._create_tables()
+
+    @contextmanager
+    def _connection(self):
+        """Autocommit connection, closed when the block exits."""
+        connection = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        connection.row_factory = sqlite3.Row
+        try:
+            yield connection
+        finally:
+            connection.close()
+
+    @contextmanager
+    def _transaction(self):
+        """Write transaction that locks the database for the duration of the block."""
+        with self._lock, self._connection() as connection:
+            connection.execute('BEGIN IMMEDIATE')
+            try:
+                yield connection
+            except Exception:
+                connection.execute('ROLLBACK')
+                raise
+            connection.execute('COMMIT')
+
+    def _create_tables(self) -> None:
+        with self._connection() as connection:
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('''
+                CREATE TABLE IF NOT EXISTS shards (
+                    shard_id INTEGER PRIMARY KEY,
+                    start_index INTEGER NOT NULL,
+                    end_index INTEGER NOT NULL,
+                    state TEXT NOT NULL DEFAULT 'pending',
+                    worker_id TEXT,
+                    lease_expires REAL,
+                    attempts INTEGER NOT NULL DEFAULT 0
+                )''')
+            connection.execute('''
+                CREATE TABLE IF NOT EXISTS rows (
+                    row_index INTEGER PRIMARY KEY,
+                    shard_id INTEGER NOT NULL,
+                    company_name TEXT NOT NULL,
+                    website TEXT,
+                    email TEXT,
+                    phone TEXT,
+                    status TEXT
+                )''')
+
+    def load_input(self, input_file: str, shard_size: int, start_index: int = 0,
+                   total_limit: Optional[int] = None) -> int:
+        """
+        Split the input file into shards. Does nothing if shards already exist.
+
+        Args:
+            input_file (str): Path to input Excel file
+            shard_size (int): Number of rows per shard
+            start_index (int): First row to include
+            total_limit (Optional[int]): Maximum number of rows to include
+
+        Returns:
+            int: Number of shards in the database
+        """
+        with self._connection() as connection:
+            existing = connection.execute('SELECT COUNT(*) FROM shards').fetchone()[0]
+        if existing:
+            logging.info("Resuming %s existing shards from %s", existing, self.db_path)
+            return existing
+
+        import pandas as pd
+        df = pd.read_excel(input_file)
+        all_companies = df.iloc[:, 0].tolist()
+        end = len(all_companies) if not total_limit else min(len(all_companies), total_limit)
+
+        with self._transaction() as connection:
+            shard_id = 0
+            for shard_start in range(start_index, end, shard_size):
+                shard_end = min(shard_start + shard_size, end)
+                connection.execute(
+                    'INSERT INTO shards (shard_id, start_index, end_index) VALUES (?, ?, ?)',
+                    (shard_id, shard_start, shard_end)
+                )
+                connection.executemany(
+                    'INSERT INTO rows (row_index, shard_id, company_name) VALUES (?, ?, ?)',
+                    [
+                        (row_index, shard_id, str(all_companies[row_index]).strip())
+                        for row_index in range(shard_start, shard_end)
+                        if pd.notna(all_companies[row_index])
+                    ]
+                )
+                shard_id += 1
+        logging.info("Created %s shards of up to %s rows from %s", shard_id, shard_size, input_file)
+        return shard_id
+
+    def lease(self, worker_id: str) -> Optional[Dict]:
+        """
+        Lease the next pending or expired shard to a worker.
+
+        Returns:
+            Optional[Dict]: Shard id and its (row_index, company_name) rows, or None if no work is available
+        """
+        now = time.time()
+        with self._transaction() as connection:
+            # Expired shards that ran out of attempts are given up on
+            connection.execute(
+                "UPDATE shards SET state = 'failed', worker_id = NULL "
+                "WHERE state = 'leased' AND lease_expires < ? AND attempts >= ?",
+                (now, self.max_attempts)
+            )
+            shard = connection.execute(
+                "SELECT shard_id, worker_id, attempts FROM shards "
+                "WHERE state = 'pending' OR (state = 'leased' AND lease_expires < ?) "
+                "ORDER BY shard_id LIMIT 1",
+                (now,)
+            ).fetchone()
+            if shard is None:
+                return None
+            if shard['worker_id']:
+                logging.warning("Lease of shard %s held by %s expired, reassigning",
+                                shard['shard_id'], shard['worker_id'])
+            connection.execute(
+                "UPDATE shards SET state = 'leased', worker_id = ?, lease_expires = ?, "
+                "attempts = attempts + 1 WHERE shard_id = ?",
+                (worker_id, now + self.lease_seconds, shard['shard_id'])
+            )
+            rows = connection.execute(
+                'SELECT row_index, company_name FROM rows WHERE shard_id = ? ORDER BY row_index',
+                (shard['shard_id'],)
+            ).fetchall()
+
+        logging.info("Leased shard %s (%s rows) to %s", shard['shard_id'], len(rows), worker_id)
+        return {
+            'shard_id': shard['shard_id'],
+            'lease_seconds': self.lease_seconds,
+            'rows': [[row['row_index'], row['company_name']] for row in rows]
+        }
+
+    def heartbeat(self, shard_id: int, worker_id: str) -> bool:
+        """
+        Extend a worker's lease.
+
+        Returns:
+            bool: False if the worker no longer holds the lease
+        """
+        with self._transaction() as connection:
+            cursor = connection.execute(
+                "UPDATE shards SET lease_expires = ? "
+                "WHERE shard_id = ? AND worker_id = ? AND state = 'leased'",
+                (time.time() + self.lease_seconds, shard_id, worker_id)
+            )
+            return cursor.rowcount == 1
+
+    def complete(self, shard_id: int, worker_id: str, results: List[Dict]) -> bool:
+        """
+        Store the results of a shard and mark it as done.
+        Late results of an expired lease are accepted as long as the shard is not done yet.
+
+        Returns:
+            bool: False if the shard was already completed by another worker
+        """
+        with self._transaction() as connection:
+            state = connection.execute(
+                'SELECT state FROM shards WHERE shard_id = ?', (shard_id,)
+            ).fetchone()
+            if state is None or state['state'] == 'done':
+                return False
+            connection.executemany(
+                'UPDATE rows SET website = ?, email = ?, phone = ?, status = ? '
+                'WHERE row_index = ? AND shard_id = ?',
+                [
+                    (r.get('website'), r.get('email'), r.get('phone'), r.get('status'),
+                     r['row_index'], shard_id)
+                    for r in results
+                ]
+            )
+            connection.execute(
+                "UPDATE shards SET state = 'done', worker_id = ?, lease_expires = NULL "
+                "WHERE shard_id = ?",
+                (worker_id, shard_id)
+            )
+        logging.info("Shard %s completed by %s", shard_id, worker_id)
+        return True
+
+    def progress(self) -> Dict[str, int]:
+        """Number of shards per state."""
+        with self._connection() as connection:
+            counts = {'pending': 0, 'leased': 0, 'done': 0, 'failed': 0}
+            for row in connection.execute('SELECT state, COUNT(*) AS count FROM shards GROUP BY state'):
+                counts[row['state']] = row['count']
+            return counts
+
+    def export(self, output_file: str) -> None:
+        """Write all rows and their results to an Excel file in input order."""
+        import pandas as pd
+        with self._connection() as connection:
+            df = pd.read_sql_query(
+                'SELECT company_name, website, email, phone, status FROM rows ORDER BY row_index',
+                connection
+            )
+        df.to_excel(output_file, index=False, engine='openpyxl')
+        logging.info("Exported %s rows to %s", len(df), output_file)
+
+    def serve(self, host: str = '0.0.0.0', port: int = 8765) -> None:
+        """Serve the coordinator API over HTTP until interrupted."""
+        server = ThreadingHTTPServer((host, port), _CoordinatorRequestHandler)
+        server.coordinator = self
+        logging.info("Shard coordinator listening on %s:%s", host, port)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+
+
+class _CoordinatorRequestHandler(BaseHTTPRequestHandler):
+    """JSON API: POST /lease, /heartbeat, /complete and GET /progress"""
+
+    def do_GET(self):
+        if self.path == '/progress':
+            self._send_json(200, self.server.coordinator.progress())
+        else:
+            self._send_json(404, {'error': 'not found'})
+
+    def do_POST(self):
+        coordinator = self.server.coordinator
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            payload = json.loads(self.rfile.read(length) or b'{}')
+            if self.path == '/lease':
+                self._send_json(200, {'shard': coordinator.lease(payload['worker_id'])})
+            elif self.path == '/heartbeat':
+                held = coordinator.heartbeat(payload['shard_id'], payload['worker_id'])
+                self._send_json(200, {'held': held})
+            elif self.path == '/complete':
+                accepted = coordinator.complete(
+                    payload['shard_id'], payload['worker_id'], payload['results']
+                )
+                self._send_json(200, {'accepted': accepted})
+            else:
+                self._send_json(404, {'error': 'not found'})
+        except (KeyError, ValueError) as e:
+            self._send_json(400, {'error': str(e)})
+        except Exception as e:
+            logging.error("Coordinator error on %s: %s", self.path, e)
+            self._send_json(500, {'error': str(e)})
+
+    def _send_json(self, status: int, body: Dict) -> None:
+        data = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        logging.debug("Coordinator %s - %s", self.address_string(), format % args)
@@ -0,0 +1,132 @@
+import logging
+import socket
+import threading
+import time
+import uuid
+from typing import Dict, List, Optional
+
+import requests
+
+from batch_processors.batch_processor import BatchProcessor
+
+
+class ShardWorker(BatchProcessor):
+    """
+    Distributed worker: pulls leased shards from a ShardCoordinator, scrapes
+    them and pushes the results back, renewing its lease while it works.
+    """
+
+    def __init__(self, coordinator_url: str, worker_id: Optional[str] = None,
+                 poll_interval: int = 10):
+        """
+        Initialize the worker.
+
+        Args:
+            coordinator_url (str): Base URL of the coordinator, e.g. http://host:8765
+            worker_id (Optional[str]): Unique worker name, defaults to hostname plus a random suffix
+            poll_interval (int): Seconds to wait before asking again when no shard is available
+        """
+        super().__init__(output_file=None)
+        self.coordinator_url = coordinator_url.rstrip('/')
+        self.worker_id = worker_id or f"{socket.gethostname()}-{uuid.uuid4().hex[:8]}"
+        self.poll_interval = poll_interval
+
+    def _call(self, method: str, path: str, payload: Optional[Dict] = None) -> Dict:
+        """Call the coordinator API and return the decoded JSON response."""
+        response = requests.request(
+            method, f"{self.coordinator_url}{path}", json=payload, timeout=30
+        )
+        response.raise_for_status()
+        return response.json()
+
+    def run(self, max_workers: int = 5) -> None:
+        """
+        Process shards until the coordinator has no pending or leased shards left.
+
+        Args:
+            max_workers (int): Maximum number of concurrent workers
+        """
+        logging.info("Worker %s connecting to %s", self.worker_id, self.coordinator_url)
+        try:
+            self._run_leases(max_workers)
+        finally:
+            self._close_resources()
+
+    def _run_leases(self, max_workers: int) -> None:
+        """Lease and process shards until the coordinator runs out of work."""
+        while True:
+            try:
+                shard = self._call('POST', '/lease', {'worker_id': self.worker_id})['shard']
+            except requests.exceptions.RequestException as e:
+                logging.error("Coordinator unreachable: %s", e)
+                time.sleep(self.poll_interval)
+                continue
+
+            if shard is None:
+                try:
+                    progress = self._call('GET', '/progress')
+                except requests.exceptions.RequestException as e:
+                    logging.error("Coordinator unreachable: %s", e)
+                    time.sleep(self.poll_interval)
+                    continue
+                if not progress['pending'] and not progress['leased']:
+                    logging.info("No work left, worker %s stopping: %s", self.worker_id, progress)
+                    return
+                # Other workers still hold leases that may expire and come back to the queue
+                time.sleep(self.poll_interval)
+                continue
+
+            self._process_shard(shard, max_workers)
+
+    def _process_shard(self, shard: Dict, max_workers: int) -> None:
+        """Scrape one leased shard while a background thread keeps the lease alive."""
+        shard_id = shard['shard_id']
+        row_indexes = [row[0] for row in shard['rows']]
+        companies = [row[1] for row in shard['rows']]
+        logging.info("Processing shard %s with %s companies", shard_id, len(companies))
+
+        stop_heartbeat = threading.Event()
+        heartbeat = threading.Thread(
+            target=self._heartbeat_loop,
+            args=(shard_id, shard['lease_seconds'] / 3, stop_heartbeat),
+            daemon=True
+        )
+        heartbeat.start()
+        try:
+            results = self._scrape_companies(companies, max_workers)
+        finally:
+            stop_heartbeat.set()
+            heartbeat.join()
+
+        for row_index, result in zip(row_indexes, results):
+            result['row_index'] = row_index
+        self._push_results(shard_id, results)
+        self._print_batch_summary(results, shard_id)
+        self._log_session_stats()
+
+    def _heartbeat_loop(self, shard_id: int, interval: float, stop: threading.Event) -> None:
+        while not stop.wait(interval):
+            try:
+                held = self._call('POST', '/heartbeat', {
+                    'shard_id': shard_id, 'worker_id': self.worker_id
+                })['held']
+                if not held:
+                    # The shard may have been reassigned, results are still pushed when done
+                    logging.warning("Lease of shard %s lost by %s", shard_id, self.worker_id)
+            except requests.exceptions.RequestException as e:
+                logging.error("Heartbeat for shard %s failed: %s", shard_id, e)
+
+    def _push_results(self, shard_id: int, results: List[Dict]) -> None:
+        """Send shard results to the coordinator, retrying while it is unreachable."""
+        payload = {'shard_id': shard_id, 'worker_id': self.worker_id, 'results': results}
+        for attempt in range(5):
+            try:
+                accepted = self._call('POST', '/complete', payload)['accepted']
+                if not accepted:
+                    logging.info("Shard %s was already completed by another worker", shard_id)
+                return
+            except requests.exceptions.RequestException as e:
+                logging.error("Failed to push results of shard %s: %s", shard_id, e)
+                time.sleep(self.poll_interval * (attempt + 1))
+        logging.error("Giving up on results of shard %s, the lease will expire and be retried",
+                      shard_id)
@@ -0,0 +1,187 @@
+"""
+Throughput and tail latency of BatchProcessor under simulated faults.
+
+Starts the stand-in server (benchmarks/stand_in_server.py) and points the
+scraper at it: HTTP_PROXY routes sessions and browsers to the server, the
+only search engine is the stand-in one, and domain guessing and directory
+searches are off because both would leave the machine. The same company
+list is then processed once per max_workers and batch size combination,
+each run with a fresh processor and cache directory while the server
+forgets its request counts, so every combination faces the same faults.
+
+Reported per run: companies per second, per-company latency percentiles
+(elapsed_seconds of the results), the slowest batch, how many companies
+got an email, and the faults the server injected. Adaptive concurrency is
+off unless --adaptive is given, otherwise the stage limiters may keep
+fewer than max_workers companies running at once. Searches need Chrome;
+--skip-search passes the simulated websites as known and measures crawling
+only.
+
+Usage:
+    python -m benchmarks.load_test [--companies 200] [--workers 4,8,16,32]
+        [--batch-sizes 25,100] [--profile realistic] [--seed 1] [--skip-search]
+        [--adaptive] [--csv curves.csv]
+"""
+import argparse
+import csv
+import logging
+import math
+import os
+import sys
+import tempfile
+import time
+
+from batch_processors.batch_processor import BatchProcessor
+from benchmarks.stand_in_server import PROFILES, SEARCH_ENGINE, StandInServer
+from config.scraping_config import ScrapingConfig
+from utils.log_pipeline import LogPipeline
+
+# Server outcomes shown in the report, in this order
+FAULTS = ('dead', 'hang', 'error', 'throttled', 'storm', 'rate_limited', 'redirect_loop', 'huge_body')
+
+
+class LoadTestProcessor(BatchProcessor):
+    """BatchProcessor that logs warnings to its run directory and stderr, the report owns stdout"""
+
+    def _setup_logging(self) -> None:
+        config = ScrapingConfig.load()
+        LogPipeline.install(
+            log_file=config.LOG_FILE,
+            level=logging.WARNING,
+            json_file=config.LOG_JSON,
+            rate_limit_burst=config.LOG_RATE_LIMIT_BURST,
+            rate_limit_interval=config.LOG_RATE_LIMIT_INTERVAL,
+            stream=sys.stderr
+        )
+
+    def run(self, companies, batch_size, max_workers, known=None):
+        """
+        Process companies in batches like process_companies, without its pauses.
+
+        Returns:
+            tuple: (results, seconds per batch)
+        """
+        results = []
+        batch_seconds = []
+        try:
+            for batch_number, start in enumerate(range(0, len(companies), batch_size)):
+                batch = companies[start:start + batch_size]
+                started = time.monotonic()
+                if known:
+                    batch_results = self._scrape_companies(batch, max_workers, known[start:start + batch_size])
+                    self._save_batch_results(batch_results, batch_number, 0)
+                else:
+                    batch_results = self.process_batch(batch, batch_number, 0, max_workers)
+                batch_seconds.append(time.monotonic() - started)
+                results.extend(batch_results)
+        finally:
+            self._close_resources()
+        return results, batch_seconds
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile, None without values"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def run_once(server, companies, max_workers, batch_size, skip_search, run_dir):
+    """One sweep point, measured against freshly reset server counters"""
+    config = ScrapingConfig.load()
+    config.update({
+        'CACHE_DIR': os.path.join(run_dir, 'cache'),
+        'LOG_FILE': os.path.join(run_dir, 'scraper.log'),
+    })
+    server.reset()
+    processor = LoadTestProcessor(output_file=os.path.join(run_dir, 'results.xlsx'))
+    known = [{'website': server.website(company)} for company in companies] if skip_search else None
+
+    started = time.monotonic()
+    results, batch_seconds = processor.run(companies, batch_size, max_workers, known)
+    wall = time.monotonic() - started
+
+    latencies = [result['elapsed_seconds'] for result in results if result.get('elapsed_seconds') is not None]
+    row = {
+        'workers': max_workers,
+        'batch_size': batch_size,
+        'companies': len(results),
+        'seconds': round(wall, 2),
+        'per_second': round(len(results) / wall, 3) if wall else None,
+        'slowest_batch': round(max(batch_seconds), 2) if batch_seconds else None,
+        'with_email': sum(1 for result in results if result.get('email')),
+    }
+    for name, fraction in (('p50', 0.5), ('p90', 0.9), ('p99', 0.99), ('max', 1.0)):
+        value = percentile(latencies, fraction)
+        row[name] = round(value, 2) if value is not None else None
+    stats = dict(server.stats)
+    row['requests'] = sum(stats.values())
+    for fault in FAULTS:
+        row[fault] = stats.get(fault, 0)
+    return row
+
+
+def print_report(rows):
+    print(f"\n{'workers':>7} {'batch':>5} {'co/s':>7} {'p50':>6} {'p90':>6} {'p99':>6} {'max':>6} "
+          f"{'slowest':>8} {'email':>6} {'requests':>8}  faults")
+    for row in rows:
+        faults = ', '.join(f"{fault} {row[fault]}" for fault in FAULTS if row[fault])
+        print(f"{row['workers']:>7} {row['batch_size']:>5} {row['per_second']:>7} {row['p50']!s:>6} "
+              f"{row['p90']!s:>6} {row['p99']!s:>6} {row['max']!s:>6} {row['slowest_batch']!s:>8} "
+              f"{row['with_email']:>6} {row['requests']:>8}  {faults or 'none'}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--companies', type=int, default=200)
+    parser.add_argument('--workers', default='4,8,16,32', help='Comma-separated max_workers values')
+    parser.add_argument('--batch-sizes', default='25,100', help='Comma-separated batch sizes')
+    parser.add_argument('--profile', choices=sorted(PROFILES), default='realistic')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--skip-search', action='store_true', help='Pass websites as known, no browser needed')
+    parser.add_argument('--adaptive', action='store_true', help='Keep adaptive concurrency on')
+    parser.add_argument('--csv', help='Write one row per run to this file')
+    args = parser.parse_args()
+
+    server = StandInServer(PROFILES[args.profile], seed=args.seed).start()
+    companies = server.companies(args.companies)
+    config = ScrapingConfig.load()
+    config.update({
+        'HTTP_PROXY': server.url,
+        'SEARCH_ENGINES': [SEARCH_ENGINE],
+        'BUSINESS_DIRECTORIES': [],
+        'DOMAIN_GUESSING': False,
+        'ADAPTIVE_CONCURRENCY': args.adaptive,
+        'ARCHIVE_ENABLED': False,
+        'PARQUET_OUTPUT_DIR': None,
+    })
+    print(f"{args.companies} companies, profile {args.profile}, seed {args.seed}, stand-in server {server.url}")
+
+    rows = []
+    try:
+        with tempfile.TemporaryDirectory(prefix='load-test-') as work_dir:
+            for max_workers in [int(value) for value in args.workers.split(',')]:
+                for batch_size in [int(value) for value in args.batch_sizes.split(',')]:
+                    # Own cache per run, dead hosts cached by one run must not be skipped by the next
+                    run_dir = os.path.join(work_dir, f'{len(rows):03d}-w{max_workers}-b{batch_size}')
+                    os.makedirs(run_dir)
+                    row = run_once(server, companies, max_workers, batch_size, args.skip_search, run_dir)
+                    rows.append(row)
+                    print(f"  workers {max_workers:>3}, batch {batch_size:>4}: "
+                          f"{row['per_second']} companies/s, p99 {row['p99']} s", flush=True)
+    finally:
+        server.stop()
+
+    print_report(rows)
+    if args.csv and rows:
+        with open(args.csv, 'w', newline='', encoding='utf-8') as csv_file:
+            writer = csv.DictWriter(csv_file, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
+        print(f"\nCurves written to {args.csv}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,122 @@
+"""
+Peak memory per worker for full versus partial page parsing.
+
+Each mode runs in its own process (peak RSS only ever grows within a
+process): worker threads parse synthetic heavy pages the way probe and
+frame pages are handled, read the views scoring and extraction use, and
+tear the page down again. Reported is the peak RSS above the baseline of
+the process, divided by the number of workers.
+
+Usage:
+    python -m benchmarks.memory_usage [--workers 12] [--pages 120] [--page-kb 1500]
+"""
+import argparse
+import resource
+import subprocess
+import sys
+import threading
+import time
+
+from core.contact_extractor import ContactExtractor
+from core.page_analysis import PageAnalysis
+
+
+def heavy_page(index, size_kb):
+    """A page of roughly size_kb with deep markup, inline scripts and a contact footer"""
+    block = (
+        '<div class="card"><div class="card-body"><h3>Product {i}</h3>'
+        '<p>Lorem ipsum dolor sit amet, <a href="/p/{i}">details</a> consectetur '
+        'adipiscing elit.</p><ul><li>Spec A</li><li>Spec B</li></ul></div></div>'
+    )
+    blocks = []
+    size = 0
+    i = 0
+    while size < size_kb * 1024:
+        chunk = block.format(i=i)
+        blocks.append(chunk)
+        size += len(chunk)
+        i += 1
+    return (
+        f'<html><head><title>Company {index}</title>'
+        '<script>window.config = {"tracking": true};</script></head><body>'
+        '<nav><a href="/">Home</a><a href="/contact">Contact</a></nav>'
+        + ''.join(blocks)
+        + f'<footer class="site-footer"><div class="contact-info">'
+          f'<a href="mailto:info{index}@acme-{index}.de">Mail</a> '
+          f'<a href="tel:+4930123456{index % 10}">Call</a></div></footer>'
+          '</body></html>'
+    )
+
+
+def peak_rss_kb():
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes on Linux
+    return usage // 1024 if sys.platform == 'darwin' else usage
+
+
+def run_mode(partial, workers, pages, page_kb):
+    """Parse pages in worker threads, print the peak RSS increase in KB"""
+    extractor = ContactExtractor()
+    markups = [heavy_page(i, page_kb) for i in range(workers)]
+    baseline = peak_rss_kb()
+    remaining = iter(range(pages))
+    lock = threading.Lock()
+    errors = []
+
+    def worker(markup):
+        while True:
+            with lock:
+                if errors or next(remaining, None) is None:
+                    return
+            try:
+                if partial:
+                    page = PageAnalysis.parse_partial(markup, extractor)
+                else:
+                    page = PageAnalysis.parse(markup, extractor)
+                page.anchors, page.email_hits, page.phone_hits, page.scripts
+                page.soup.find_all(['div', 'section'], class_='contact-info')
+                page.close()
+            except Exception as e:
+                # A failing mode must not pass for a cheap one
+                errors.append(e)
+                return
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker, args=(markup,)) for markup in markups]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if errors:
+        raise errors[0]
+    print(peak_rss_kb() - baseline, time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--workers', type=int, default=12)
+    parser.add_argument('--pages', type=int, default=120)
+    parser.add_argument('--page-kb', type=int, default=1500)
+    parser.add_argument('--mode', choices=['full', 'partial'], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        run_mode(args.mode == 'partial', args.workers, args.pages, args.page_kb)
+        return 0
+
+    print(f"{args.workers} workers, {args.pages} pages of ~{args.page_kb} KB")
+    print(f"{'mode':<10} {'peak RSS/worker':>16} {'seconds':>9}")
+    for mode in ('full', 'partial'):
+        output = subprocess.run(
+            [sys.executable, '-m', 'benchmarks.memory_usage', '--mode', mode,
+             '--workers', str(args.workers), '--pages', str(args.pages),
+             '--page-kb', str(args.page_kb)],
+            capture_output=True, text=True, check=True
+        ).stdout.split()
+        peak_kb, seconds = int(output[0]), float(output[1])
+        print(f"{mode:<10} {peak_kb / args.workers / 1024:>13.1f} MB {seconds:>9.2f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,104 @@
+"""
+Adversarial-input benchmark for the contact extraction patterns.
+
+Runs every email, phone, schema, JavaScript and deobfuscation pattern of
+ContactExtractor through the bounded regex layer on inputs built to
+trigger backtracking, at growing sizes. Fails if the scan time per input character grows with
+the input size (super-linear behaviour) or exceeds the allowed worst case.
+The absolute limit is generous because the standard library engine is
+used when neither re2 nor regex is installed.
+
+Usage:
+    python -m benchmarks.regex_worst_case [--max-size 1000000] [--limit-per-mb 10.0] [--max-growth 3.0]
+"""
+import argparse
+import sys
+import time
+
+from core.contact_extractor import ContactExtractor
+
+
+def adversarial_inputs(size):
+    """Inputs that make naive contact patterns backtrack, each about size characters long"""
+    def repeat(unit):
+        return (unit * (size // len(unit) + 1))[:size]
+
+    return {
+        'alnum run': repeat('a'),
+        'base64 run': repeat('QUJD') + '!',
+        'decimal entities': repeat('&#64;'),
+        'hex entities': repeat('&#x41;'),
+        'percent run': repeat('%41'),
+        'unclosed object': 'var config = {' + repeat('"k": 1, '),
+        'digits and spaces': '+49 ' + repeat('1 '),
+        'dots and dashes': repeat('a.-'),
+        'at without domain': repeat('a@'),
+        'obfuscated at': repeat('a at '),
+        'contactPoint': '"contactPoint": {' + repeat('"x": "y", '),
+    }
+
+
+def time_scan(regex, text):
+    started = time.perf_counter()
+    for _ in regex.finditer(text):
+        pass
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--max-size', type=int, default=1000000, help='Largest input size in characters')
+    parser.add_argument('--limit-per-mb', type=float, default=10.0, help='Allowed seconds per million characters')
+    parser.add_argument('--max-growth', type=float, default=3.0,
+                        help='Allowed growth of the time per character from the smallest to the largest size')
+    args = parser.parse_args()
+
+    extractor = ContactExtractor()
+    patterns = (
+        [('email', i, r) for i, r in enumerate(extractor.email_regexes)]
+        + [('phone', i, r) for i, r in enumerate(extractor.phone_regexes)]
+        + [('schema-' + kind, i, r) for kind, rs in extractor.schema_regexes.items() for i, r in enumerate(rs)]
+        + [('json-assignment', 0, extractor.json_assignment_regex)]
+        + [('deobfuscate-' + name.replace('_regex', ''), 0, regex)
+           for name, regex in vars(extractor.deobfuscator).items() if name.endswith('_regex')]
+    )
+
+    sizes = []
+    size = 10000
+    while size <= args.max_size:
+        sizes.append(size)
+        size *= 10
+
+    failures = []
+    print(f"{'pattern':<28} {'engine':<6} " + ' '.join(f'{s:>12,}' for s in sizes) + '  worst input')
+    for kind, index, regex in patterns:
+        worst_times = []
+        worst_input = ''
+        for size in sizes:
+            worst = 0.0
+            for name, text in adversarial_inputs(size).items():
+                elapsed = time_scan(regex, text)
+                if elapsed > worst:
+                    worst, worst_input = elapsed, name
+            worst_times.append(worst)
+            if worst > args.limit_per_mb * max(size, 1000000) / 1000000:
+                failures.append(f"{kind}[{index}] took {worst:.3f}s on {size:,} characters ({worst_input})")
+        # Compare time per character, ignoring scans too fast to time reliably
+        if len(sizes) > 1 and worst_times[-1] > 0.05:
+            growth = (worst_times[-1] / sizes[-1]) / (max(worst_times[0], 1e-6) / sizes[0])
+            if growth > args.max_growth:
+                failures.append(f"{kind}[{index}] time per character grew {growth:.1f}x from {sizes[0]:,} to {sizes[-1]:,}")
+        label = f'{kind}[{index}]'
+        print(f"{label:<28} {regex.engine:<6} " + ' '.join(f'{t:>11.4f}s' for t in worst_times) + f'  {worst_input}')
+
+    if failures:
+        print('\nUnbounded scan times:')
+        for failure in failures:
+            print(f'  {failure}')
+        return 1
+    print(f'\nAll patterns scan in linear time within {args.limit_per_mb}s per million characters')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,405 @@
+"""
+Fault-injecting stand-in for search engines and company sites.
+
+The server is an HTTP proxy target: with HTTP_PROXY pointing at it, every
+session request and browser page load of the scraper ends up here, and the
+server answers for whatever host was asked. A search host returns result
+pages linking to simulated company sites, which serve a homepage, contact
+pages and sitemaps built from the host name.
+
+Faults come from a FaultProfile: latency drawn from a distribution, slow
+and dead hosts, server errors, 429 storms and per-host rate limits,
+redirect loops, huge bodies and hanging responses (stuck browser pages).
+Every decision is seeded by the profile seed, the URL and how often that
+URL was requested before, so repeated runs see the same faults no matter
+how worker threads interleave. The one exception is host_rate_limit: it
+counts a host's requests in the last second of wall-clock time, so which
+requests it rejects depends on timing and varies between runs (the
+'hostile' profile enables it). https is not simulated, CONNECT requests
+are refused.
+
+Usage:
+    python -m benchmarks.stand_in_server [--port 8899] [--profile realistic] [--seed 1]
+"""
+import argparse
+import hashlib
+import math
+import random
+import re
+import sys
+import threading
+import time
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+SEARCH_HOST = 'search.loadtest.com'
+# Search engine entry for SEARCH_ENGINES, the selector matches the result markup below
+SEARCH_ENGINE = (f'http://{SEARCH_HOST}/search?q={{}}', 'div.g')
+
+_NAME_WORDS = (
+    'Alpen', 'Nordwind', 'Rhein', 'Falken', 'Linden', 'Sonnen', 'Eichen', 'Silber',
+    'Berg', 'Hafen', 'Stern', 'Adler', 'Ulmen', 'Kristall', 'Polar', 'Birken',
+)
+_TRADE_WORDS = (
+    'Logistik', 'Technik', 'Bau', 'Consulting', 'Software', 'Handel', 'Medien', 'Energie',
+    'Design', 'Service', 'Systeme', 'Immobilien', 'Druck', 'Metall', 'Textil', 'Gastro',
+)
+_LEGAL_FORMS = ('GmbH', 'AG', 'KG', 'GmbH & Co. KG', 'Ltd', 'Inc')
+_FILLER = (
+    'Seit vielen Jahren stehen wir unseren Kunden als verlässlicher Partner zur Seite. '
+    'Unser Team verbindet Erfahrung mit modernen Methoden und liefert Lösungen, '
+    'die zu Ihrem Unternehmen passen. '
+)
+
+
+class FaultProfile:
+    """
+    Latency and fault mix of the stand-in server.
+    Host rates are drawn once per host, request rates once per request.
+    """
+    def __init__(self, latency='lognormal', latency_median=0.15, latency_sigma=0.8,
+                 slow_host_rate=0.05, slow_host_factor=8.0, dead_host_rate=0.02,
+                 script_rendered_rate=0.1, error_rate=0.02, throttle_rate=0.01,
+                 storm_every=0, storm_length=0, host_rate_limit=0, redirect_loop_rate=0.01,
+                 huge_body_rate=0.005, huge_body_bytes=64 * 1024 * 1024,
+                 hang_rate=0.005, hang_seconds=60.0, search_latency_median=0.8):
+        # 'fixed', 'uniform' (0 to twice the median), 'lognormal' or 'pareto' (heavy tail)
+        self.latency = latency
+        self.latency_median = latency_median  # Seconds
+        self.latency_sigma = latency_sigma  # Spread of lognormal latencies
+        self.slow_host_rate = slow_host_rate
+        self.slow_host_factor = slow_host_factor  # Latency multiplier of slow hosts
+        self.dead_host_rate = dead_host_rate  # Hosts that accept connections and never answer
+        self.script_rendered_rate = script_rendered_rate  # Homepages that only render with scripts
+        self.error_rate = error_rate  # 500, 502 and 503 answers
+        self.throttle_rate = throttle_rate  # Random 429 answers
+        # Every URL cycles through storm_every visits, the last storm_length of them answered
+        # with 429 from a phase drawn per URL; 0 disables
+        self.storm_every = storm_every
+        self.storm_length = storm_length
+        # Requests per second and host before 429, 0 disables; timing dependent, not deterministic
+        self.host_rate_limit = host_rate_limit
+        self.redirect_loop_rate = redirect_loop_rate
+        self.huge_body_rate = huge_body_rate
+        self.huge_body_bytes = huge_body_bytes
+        self.hang_rate = hang_rate  # Responses held back for hang_seconds
+        self.hang_seconds = hang_seconds
+        self.search_latency_median = search_latency_median  # Search pages are slower than sites
+
+    def sample_latency(self, rng, median):
+        """Response delay in seconds for the given median"""
+        if self.latency == 'fixed':
+            return median
+        if self.latency == 'uniform':
+            return rng.uniform(0, 2 * median)
+        if self.latency == 'pareto':
+            # Shape 1.5, scaled so half of the draws stay below the median
+            return median / 2 ** (1 / 1.5) * rng.paretovariate(1.5)
+        return median * math.exp(self.latency_sigma * rng.gauss(0, 1))
+
+
+PROFILES = {
+    # Fast and well behaved, the baseline of a sweep
+    'clean': FaultProfile(
+        latency='fixed', latency_median=0.05, slow_host_rate=0, dead_host_rate=0,
+        error_rate=0, throttle_rate=0, redirect_loop_rate=0, huge_body_rate=0, hang_rate=0,
+        search_latency_median=0.2
+    ),
+    'realistic': FaultProfile(),
+    # Slow tails, 429 storms and stuck pages
+    'hostile': FaultProfile(
+        latency='pareto', latency_median=0.4, slow_host_rate=0.15, dead_host_rate=0.08,
+        error_rate=0.05, throttle_rate=0.03, storm_every=500, storm_length=100,
+        host_rate_limit=5, redirect_loop_rate=0.03, huge_body_rate=0.02, hang_rate=0.03,
+        search_latency_median=2.0
+    ),
+}
+
+
+def _slug(text):
+    return re.sub(r'[^a-z0-9]', '', text.lower())
+
+
+class StandInServer:
+    """
+    Threaded stand-in server with deterministic faults.
+    Company names from companies() have a site at website(name); the
+    counters in stats say which faults were served.
+    """
+    def __init__(self, profile=None, seed=1, host='127.0.0.1', port=0):
+        self.profile = profile or PROFILES['realistic']
+        self.seed = seed
+        self._httpd = ThreadingHTTPServer((host, port), _StandInHandler)
+        self._httpd.daemon_threads = True
+        self._httpd.stand_in = self
+        self._thread = None
+        self._lock = threading.Lock()
+        self._companies = {}
+        self.reset()
+
+    @property
+    def url(self):
+        """Proxy URL for HTTP_PROXY"""
+        host, port = self._httpd.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def start(self):
+        """Serve on a background thread"""
+        self._thread = threading.Thread(target=self.serve_forever, name='stand-in-server', daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        self._httpd.serve_forever()
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def reset(self):
+        """Forget request counts, so the next run sees the same faults as the first"""
+        with self._lock:
+            self._visits = defaultdict(int)
+            self._host_requests = defaultdict(list)
+            self.stats = defaultdict(int)
+
+    def companies(self, count):
+        """count deterministic company names, each with a simulated website"""
+        rng = random.Random(f'{self.seed}:companies')
+        names = []
+        for index in range(count):
+            name = (f'{rng.choice(_NAME_WORDS)} {rng.choice(_TRADE_WORDS)} {index:04d} '
+                    f'{rng.choice(_LEGAL_FORMS)}')
+            names.append(name)
+        with self._lock:
+            for name in names:
+                self._companies[self._company_slug(name)] = name
+        return names
+
+    @staticmethod
+    def _company_slug(name):
+        """Name without its legal form, as it appears in the domain"""
+        for form in sorted(_LEGAL_FORMS, key=len, reverse=True):
+            if name.endswith(' ' + form):
+                name = name[:-len(form) - 1]
+                break
+        return _slug(name)
+
+    def website(self, name):
+        return f'http://{self._company_slug(name)}.com/'
+
+    def rng(self, *parts):
+        """Random source seeded by the profile seed and the given parts"""
+        key = ':'.join(str(part) for part in (self.seed,) + parts)
+        return random.Random(hashlib.blake2b(key.encode('utf-8'), digest_size=8).digest())
+
+    def _host_traits(self, host):
+        profile = self.profile
+        rng = self.rng('host', host)
+        return {
+            'dead': rng.random() < profile.dead_host_rate,
+            'slow': rng.random() < profile.slow_host_rate,
+            'script_rendered': rng.random() < profile.script_rendered_rate,
+            'contact_path': rng.choice(('/kontakt', '/contact', '/impressum', '/kontakt/')),
+            'phone': f'+49 {rng.randint(30, 89)} {rng.randint(1000000, 9999999)}',
+        }
+
+    def plan(self, host, target):
+        """
+        Decide how to answer a request, counting it for later decisions.
+
+        Returns:
+            tuple: (fault, delay seconds), fault is None for a regular answer
+        """
+        profile = self.profile
+        now = time.monotonic()
+        with self._lock:
+            visit = self._visits[(host, target)]
+            self._visits[(host, target)] += 1
+            recent = self._host_requests[host]
+            recent.append(now)
+            while recent and recent[0] < now - 1.0:
+                recent.pop(0)
+            host_rate = len(recent)
+        rng = self.rng(host, target, visit)
+        traits = self._host_traits(host)
+        median = profile.search_latency_median if host == SEARCH_HOST else profile.latency_median
+        delay = profile.sample_latency(rng, median)
+        if traits['slow']:
+            delay *= profile.slow_host_factor
+
+        if host != SEARCH_HOST and traits['dead']:
+            return 'dead', profile.hang_seconds
+        if 'hop=' in target:
+            # Once in a redirect loop, never out of it
+            return 'redirect_loop', delay
+        if profile.storm_every:
+            # A retried URL stays in its storm for the rest of the storm, whatever other URLs do
+            phase = self.rng(host, target, 'storm').randrange(profile.storm_every)
+            if (phase + visit) % profile.storm_every >= profile.storm_every - profile.storm_length:
+                return 'storm', delay
+        if profile.host_rate_limit and host_rate > profile.host_rate_limit:
+            return 'rate_limited', delay
+        roll = rng.random()
+        for fault, rate in (('throttled', profile.throttle_rate), ('error', profile.error_rate),
+                            ('hang', profile.hang_rate), ('redirect_loop', profile.redirect_loop_rate),
+                            ('huge_body', profile.huge_body_rate)):
+            if roll < rate:
+                return fault, profile.hang_seconds if fault == 'hang' else delay
+            roll -= rate
+        return None, delay
+
+    def count(self, outcome):
+        with self._lock:
+            self.stats[outcome] += 1
+
+    def search_page(self, query):
+        """Result page for a query, the company's site among other results"""
+        words = [word for word in query.split() if word.lower() not in ('official', 'website', 'contact')]
+        slug = self._company_slug(' '.join(words))
+        results = ['<div class="g"><a href="http://www.linkedin.com/company/{0}">{0} | LinkedIn</a></div>'.format(slug)]
+        with self._lock:
+            name = self._companies.get(slug)
+        if name:
+            results.append(f'<div class="g"><a href="{self.website(name)}">{name} - Startseite</a></div>')
+        return f'<html><body><div id="search">{"".join(results)}</div></body></html>'
+
+    def site_page(self, host, path):
+        """Page of a simulated company site, None if the path does not exist"""
+        traits = self._host_traits(host)
+        domain = host[4:] if host.startswith('www.') else host
+        nav = (f'<header><nav><a href="/">Start</a> <a href="/leistungen">Leistungen</a> '
+               f'<a href="{traits["contact_path"]}">Kontakt</a></nav></header>')
+        footer = '<footer><p>&copy; 2024 Alle Rechte vorbehalten</p></footer>'
+        if path == '/':
+            if traits['script_rendered']:
+                body = '<div id="app"></div><script>document.getElementById("app").innerHTML = "<p>Willkommen</p>";</script>'
+            else:
+                body = f'<main><h1>Willkommen</h1><p>{_FILLER * 4}</p></main>'
+        elif path == '/leistungen':
+            body = f'<main><h1>Leistungen</h1><p>{_FILLER * 6}</p></main>'
+        elif path.rstrip('/') == traits['contact_path'].rstrip('/'):
+            body = (f'<main><h1>Kontakt</h1><p>{_FILLER}</p>'
+                    f'<p>E-Mail: <a href="mailto:info@{domain}">info@{domain}</a></p>'
+                    f'<p>Telefon: <a href="tel:{traits["phone"].replace(" ", "")}">{traits["phone"]}</a></p></main>')
+        elif path == '/sitemap.xml':
+            urls = ''.join(f'<url><loc>http://{host}{page}</loc></url>'
+                           for page in ('/', '/leistungen', traits['contact_path']))
+            return ('<?xml version="1.0" encoding="UTF-8"?>'
+                    f'<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{urls}</urlset>'), 'application/xml'
+        else:
+            return None, None
+        return f'<html><head><title>{domain}</title></head><body>{nav}{body}{footer}</body></html>', 'text/html'
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_CONNECT(self):
+        # Tunnels would need TLS for every simulated host
+        self.server.stand_in.count('connect_refused')
+        self._send(403, 'https is not simulated', close=True)
+
+    def do_GET(self):
+        stand_in = self.server.stand_in
+        parts = urlsplit(self.path)
+        host = (parts.hostname or self.headers.get('Host', '').split(':')[0]).lower()
+        target = parts.path or '/'
+        if parts.query:
+            target += '?' + parts.query
+
+        fault, delay = stand_in.plan(host, target)
+        # Counted before the delay, a request still hanging after reset() belongs to the earlier run
+        stand_in.count(fault or 'ok')
+        time.sleep(delay)
+        if fault == 'dead':
+            # Hold the connection and drop it, the client times out first
+            self.close_connection = True
+            return
+        if fault in ('storm', 'rate_limited', 'throttled'):
+            self._send(429, '<html><body>Too many requests</body></html>', headers={'Retry-After': '2'})
+            return
+        if fault == 'error':
+            status = stand_in.rng(host, target, 'status').choice((500, 502, 503))
+            self._send(status, '<html><body>Server error</body></html>')
+            return
+        if fault == 'redirect_loop':
+            hops = int(parse_qs(parts.query).get('hop', ['0'])[0]) % 2
+            self._send(302, '', headers={'Location': f'http://{host}{parts.path or "/"}?hop={hops + 1}'})
+            return
+        if fault == 'huge_body':
+            self._send_huge(stand_in.profile.huge_body_bytes)
+            return
+
+        if host == SEARCH_HOST:
+            query = ' '.join(parse_qs(parts.query).get('q', ['']))
+            self._send(200, stand_in.search_page(query))
+            return
+        body, content_type = stand_in.site_page(host, parts.path or '/')
+        if body is None:
+            stand_in.count('not_found')
+            self._send(404, '<html><body>Not found</body></html>')
+        else:
+            self._send(200, body, content_type=content_type)
+
+    def _send(self, status, body, content_type='text/html', headers=None, close=False):
+        encoded = body.encode('utf-8')
+        try:
+            self.send_response(status)
+            self.send_header('Content-Type', f'{content_type}; charset=utf-8')
+            self.send_header('Content-Length', str(len(encoded)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            if close:
+                self.send_header('Connection', 'close')
+                self.close_connection = True
+            self.end_headers()
+            self.wfile.write(encoded)
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True
+
+    def _send_huge(self, size):
+        """Stream size bytes of page markup, stopping when the client hangs up"""
+        chunk = ('<p>' + _FILLER * 40 + '</p>\n').encode('utf-8')
+        try:
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(size))
+            self.end_headers()
+            sent = 0
+            while sent < size:
+                piece = chunk[:size - sent]
+                self.wfile.write(piece)
+                sent += len(piece)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        self.close_connection = True
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8899)
+    parser.add_argument('--profile', choices=sorted(PROFILES), default='realistic')
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    server = StandInServer(PROFILES[args.profile], args.seed, args.host, args.port)
+    print(f"Stand-in server on {server.url} ({args.profile}, seed {args.seed})")
+    print(f"Set HTTP_PROXY to {server.url} and SEARCH_ENGINES to [{list(SEARCH_ENGINE)}]")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+        print(dict(server.stats))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
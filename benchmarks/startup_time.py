@@ -0,0 +1,100 @@
+"""
+Cold start time of the scraper.
+
+Every run starts a fresh interpreter that imports the entry points (main.py
+and everything it pulls in), loads the configuration and builds a
+CompanyScraper, which is what a batch run or the lookup service pays before
+the first request. A warm-up run first fills the caches a fresh checkout
+builds once (the sampled user agents), so only steady-state starts are
+measured. Reported are the median times and the heavy modules that were
+imported although nothing needed them yet. Fails if the median cold start
+exceeds --limit seconds or a heavy module is imported eagerly.
+
+Usage:
+    python -m benchmarks.startup_time [--runs 5] [--limit 1.0] [--profile]
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+# Only needed once a search, render, spreadsheet or site key needs them
+HEAVY_MODULES = ('selenium', 'pandas', 'openpyxl', 'tldextract', 'fake_useragent')
+
+_STARTUP = f"""
+import json, sys, time
+started = time.perf_counter()
+import main
+from config.scraping_config import ScrapingConfig
+config = ScrapingConfig.load()
+imported = time.perf_counter()
+from core.scraper import CompanyScraper
+scraper = CompanyScraper()
+ready = time.perf_counter()
+if scraper.domain_guesser:
+    scraper.domain_guesser.close()
+print(json.dumps({{
+    'import': imported - started,
+    'scraper': ready - imported,
+    'heavy': [name for name in {HEAVY_MODULES!r} if name in sys.modules],
+}}))
+"""
+
+
+def run_once():
+    output = subprocess.run(
+        [sys.executable, '-c', _STARTUP], capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def print_import_profile(top=15):
+    """Slowest imports by cumulative time, from python -X importtime"""
+    stderr = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import main'],
+        capture_output=True, text=True, check=True
+    ).stderr
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        # import time: <self us> | <cumulative us> | <indented module name>
+        _, cumulative, name = line[len('import time:'):].split('|', 2)
+        rows.append((int(cumulative), name.strip()))
+    print(f"\n{'cumulative':>12}  module")
+    for cumulative, name in sorted(rows, reverse=True)[:top]:
+        print(f"{cumulative / 1000:>9.1f} ms  {name}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--limit', type=float, default=1.0, help='Maximum median cold start in seconds')
+    parser.add_argument('--profile', action='store_true', help='Also list the slowest imports')
+    args = parser.parse_args()
+
+    # Not measured: the first start on a cold cache imports fake_useragent to fill it
+    run_once()
+    runs = [run_once() for _ in range(args.runs)]
+    import_time = statistics.median(run['import'] for run in runs)
+    scraper_time = statistics.median(run['scraper'] for run in runs)
+    total = import_time + scraper_time
+    heavy = sorted({name for run in runs for name in run['heavy']})
+
+    print(f"{args.runs} cold starts (median)")
+    print(f"  imports and config   {import_time:>7.3f} s")
+    print(f"  CompanyScraper()     {scraper_time:>7.3f} s")
+    print(f"  total                {total:>7.3f} s  (limit {args.limit:.1f} s)")
+    print(f"  heavy modules loaded {', '.join(heavy) or 'none'}")
+    if args.profile:
+        print_import_profile()
+
+    failed = total > args.limit or heavy
+    if failed:
+        print("FAIL")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,17 +1,147 @@
+import json
+import logging
+import os
+import threading
+import time
 from datetime import timedelta
-from fake_useragent import UserAgent
 
 class ScrapingConfig:
-    """Enhanced configuration settings for the scraper"""
-    def __init__(self):
+    """
+    Enhanced configuration settings for the scraper.
+    Use ScrapingConfig.load() for the process-wide instance; it is built
+    once, from the defaults below and an optional JSON settings file.
+    """
+    _instance = None
+    _instance_path = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, overrides=None):
 
         self.CACHE_DIR = 'cache'
         self.CACHE_DURATION = timedelta(days=7)
+        # Per-host circuit breaker, tripped hosts are skipped for the run and cached in CACHE_DIR
+        self.CIRCUIT_BREAKER_ENABLED = True
+        self.HOST_FAILURE_THRESHOLD = 2  # Consecutive timeouts before a host trips
+        self.DEAD_HOST_TTL = timedelta(days=1)  # Tripped hosts are skipped on later runs for this long
         self.MAX_RETRIES = 2
         self.BASE_DELAY = 0.05
         self.MAX_WORKERS = 12
+        # Adaptive (AIMD) concurrency within the caller's max_workers threads
+        self.ADAPTIVE_CONCURRENCY = True
+        self.SEARCH_CONCURRENCY = {'initial': 4, 'min': 1, 'max': 16}  # Concurrent browser searches
+        self.CRAWL_CONCURRENCY = {'initial': 12, 'min': 2, 'max': 64}  # Concurrent site crawls
+        self.SEARCH_TARGET_LATENCY = 8.0  # Seconds per search before backing off
+        self.CRAWL_TARGET_LATENCY = 3.0  # Seconds per page request before backing off
+        self.SEARCH_BLOCK_MARKERS = [
+            'unusual traffic', 'captcha', 'are you a robot', 'too many requests'
+        ]
+        # Domain guessing before the browser search: acme gmbh -> acme.de, acme.com, ...
+        self.DOMAIN_GUESSING = True
+        self.DOMAIN_GUESS_MAX_CANDIDATES = 8
+        self.DOMAIN_GUESS_WORKERS = 8  # DNS lookup threads per scraping worker
+        self.DOMAIN_GUESS_DNS_TIMEOUT = 2.0
+        self.DOMAIN_GUESS_TIMEOUT = 5  # Seconds per homepage check
+        self.DOMAIN_GUESS_MAX_SECONDS = 15  # Deadline of the whole guess, the search runs after it
+        self.DOMAIN_GUESS_BUDGET_SHARE = 0.3  # Share of the company's remaining time guessing may use
+        self.DOMAIN_GUESS_MAX_CHARS = 256 * 1024  # Homepage characters checked for the company name
+        self.DEFAULT_GUESS_TLDS = ['com']
+        # Legal form -> likely TLDs, tried before DEFAULT_GUESS_TLDS
+        self.LEGAL_SUFFIX_TLDS = {
+            'gmbh': ['de', 'at', 'ch'], 'ag': ['de', 'ch', 'at'], 'kg': ['de'], 'ug': ['de'],
+            'e.k.': ['de'], 'gbr': ['de'], 'se': ['de', 'eu'],
+            'ltd': ['co.uk'], 'limited': ['co.uk'], 'plc': ['co.uk'], 'llp': ['co.uk'],
+            'inc': ['com'], 'llc': ['com'], 'corp': ['com'], 'corporation': ['com'], 'co': ['com'],
+            'bv': ['nl', 'be'], 'nv': ['nl', 'be'], 'sarl': ['fr'], 'sas': ['fr'], 'sa': ['fr', 'es', 'ch'],
+            'srl': ['it', 'ro'], 'spa': ['it'], 'sl': ['es'], 'ab': ['se'], 'as': ['no', 'dk', 'com.tr'],
+            'aps': ['dk'], 'oy': ['fi'], 'kft': ['hu'], 'sro': ['cz', 'sk'], 'sp z oo': ['pl'],
+            'pty ltd': ['com.au'], 'pvt ltd': ['in'], 'kk': ['jp'], 'ltd sti': ['com.tr'],
+        }
+        # Input names equal up to case, punctuation, accents and legal form are scraped once per run
+        self.INPUT_DEDUP = True
+        # Distributed mode
+        self.SHARD_SIZE = 50  # Input rows per leased shard
+        self.SHARD_LEASE_SECONDS = 300  # Lease lifetime without heartbeat
+        self.SHARD_MAX_ATTEMPTS = 3  # Leases per shard before it is marked failed
+        self.COORDINATOR_PORT = 8765
+        # Long-running lookup service (HTTP or JSON lines on stdin)
+        self.SERVICE_HOST = '127.0.0.1'
+        self.SERVICE_PORT = 8766
+        self.SERVICE_MAX_CONCURRENT = 12  # Companies scraped at once, further lookups wait
+        self.SERVICE_CACHE_SIZE = 50000  # Results kept in memory, oldest evicted first
+        self.SERVICE_CACHE_FILE = 'service_results.jsonl'  # In CACHE_DIR, answers expire after CACHE_DURATION
+        # Append-only archive of fetched pages for offline re-extraction
+        self.ARCHIVE_ENABLED = False
+        self.ARCHIVE_DIR = 'archive'  # Compressed record files and their SQLite index
+        # Columnar output, each batch also written as Parquet files partitioned by status (needs pyarrow)
+        self.PARQUET_OUTPUT_DIR = None  # Directory of the dataset, None writes Excel only
+        # Post-processing of result tables
+        self.SHARED_EMAIL_THRESHOLD = 3  # Companies sharing an email before it is flagged (agency or hoster address)
+        # Logging, written by a background thread
+        self.LOG_FILE = 'scraper.log'
+        self.LOG_JSON = True  # JSON lines with company and stage fields in LOG_FILE, text on stdout
+        self.LOG_RATE_LIMIT_BURST = 5  # Identical warnings/errors let through per interval, 0 disables
+        self.LOG_RATE_LIMIT_INTERVAL = 60  # Seconds
         self.TIMEOUT = 5
-        self.USER_AGENTS = self._load_user_agents()
+        # Regex scans run in bounded windows (characters) with a per-window timeout
+        self.REGEX_WINDOW = 100000
+        self.REGEX_WINDOW_OVERLAP = 512  # Minimum, bounded patterns overlap by their longest possible match
+        self.REGEX_TIMEOUT = 0.5  # Seconds, enforced when the 'regex' module is installed
+        # Inline script gate for JavaScript extraction, fruitless scans are cached across sites
+        self.SCRIPT_LIBRARY_MARKERS = [  # Looked for at the start of a script, never scanned
+            '/*! jquery', 'jquery v', 'google tag manager', 'googletagmanager.com', 'gtag(',
+            'google-analytics.com', 'fbq(', 'hotjar', 'onetrust', 'cookiebot', '_paq.push',
+            'matomo', 'wpemojisettings', 'recaptcha', 'clarity.ms', '_linkedin_partner_id',
+            'twq(', 'ttq.load', '_hsq', 'hs-scripts.com'
+        ]
+        # A script without any of these or an email address is not scanned; markers starting
+        # with a letter only match at the start of a word ('phone' in 'phoneNumber', not 'iphone')
+        self.SCRIPT_CONTACT_MARKERS = [
+            'mailto:', 'tel:', 'callto:', 'email', 'e-mail', 'phone', 'telefon', 'contact', 'kontakt',
+            'whatsapp', '%40', '&#64;', '\\u0040', '\\x40', '[at]', '(at)', 'atob('
+        ]
+        self.SCRIPT_STRONG_CONTACT_MARKERS = ['mailto:', 'tel:', '"email"', '"telephone"', "'email'"]
+        self.SCRIPT_MAX_SCAN_CHARS = 200000  # Larger scripts need a strong marker to be scanned
+        self.SCRIPT_FINGERPRINT_MIN_CHARS = 2000  # Smaller scripts are only cached by exact content
+        self.SCRIPT_CACHE_SIZE = 50000  # Script digests remembered as irrelevant
+        # HTTP connection pool sizing (per worker session)
+        self.POOL_CONNECTIONS = 32  # Number of per-host pools kept alive
+        self.POOL_MAXSIZE = 32  # Connections kept per host pool
+        self.POOL_BLOCK = False  # Open extra connections instead of waiting when a pool is full
+        self.MAX_REDIRECTS = 5
+        self.PAGE_LOAD_TIMEOUT = 15
+        # Proxy for all session and browser traffic (http and https), e.g. the load test's stand-in server
+        self.HTTP_PROXY = None
+        # Per-company budgets, a company returns partial results once one runs out
+        self.COMPANY_TIME_BUDGET = 90  # Seconds of wall time
+        self.COMPANY_REQUEST_BUDGET = 40  # HTTP requests and browser page loads
+        self.COMPANY_BYTE_BUDGET = 20 * 1024 * 1024  # Downloaded body bytes
+        self.COMPANY_RENDER_BUDGET = 2  # Browser renders of script-rendered pages
+        # Rendering tier for pages that need JavaScript
+        self.RENDER_ENABLED = True
+        self.MAX_CONCURRENT_RENDERS = 4  # Across all workers, also the browser pool size
+        self.RENDER_TIMEOUT = 10
+        self.RENDER_MIN_TEXT_LENGTH = 200  # Pages with less visible text are treated as script-rendered
+        # Ids of client-side app mount points, a render is ready once the mount point has text
+        self.RENDER_MOUNT_POINTS = ['root', 'app', '__next', '__nuxt', 'svelte', 'ember-app']
+        # Lean browsing: blocked resources and early page-load hand-off for Selenium
+        self.LEAN_BROWSING = True
+        self.PAGE_LOAD_STRATEGY = 'eager'  # 'normal', 'eager' or 'none'
+        self.BLOCKED_URL_PATTERNS = [
+            # Stylesheets, fonts, media and images
+            '*.css', '*.woff', '*.woff2', '*.ttf', '*.otf', '*.eot',
+            '*.mp4', '*.webm', '*.mp3', '*.ogg', '*.avi', '*.mov',
+            '*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.svg', '*.ico',
+            # Ads and third-party trackers
+            '*googletagmanager.com*', '*google-analytics.com*', '*doubleclick.net*',
+            '*googlesyndication.com*', '*adservice.google.*', '*facebook.net*',
+            '*connect.facebook.com*', '*hotjar.com*', '*clarity.ms*', '*bat.bing.com*',
+            '*scorecardresearch.com*', '*taboola.com*', '*outbrain.com*', '*criteo.*'
+        ]
+        # Typical transfer sizes used to estimate the bytes blocked requests would have cost
+        self.ESTIMATED_RESOURCE_BYTES = {
+            'Stylesheet': 20000, 'Font': 35000, 'Media': 250000, 'Image': 30000,
+            'Script': 30000, 'XHR': 5000, 'Fetch': 5000, 'Other': 10000
+        }
         self.SEARCH_ENGINES = [
             ('https://www.google.com/search?q={}', 'div.g'), # Google
             ('https://www.bing.com/search?q={}', 'li.b_algo'),  # Bing
@@ -142,6 +272,18 @@ class ScrapingConfig:
             '/api/feedback', '/contact/api', '/v1/contact'
         ]
     }
+        # Plain path terms of CONTACT_PATHS for substring matching, the pattern groups are regexes
+        pattern_groups = {'url_patterns', 'subdomain_patterns', 'dynamic_paths', 'special_cases', 'api_endpoints'}
+        self.CONTACT_TERMS = tuple(dict.fromkeys(
+            term for group, terms in self.CONTACT_PATHS.items() if group not in pattern_groups for term in terms
+        ))
+        # Contact page crawl: the most promising page is fetched next, the crawl stops once email and phone are found
+        self.MAX_CONTACT_PAGES = 3  # Contact pages extracted besides the homepage
+        self.COMMON_CONTACT_PATHS = [
+            '/contact', '/contact-us', '/contactus', '/connect',
+            '/reach-us', '/reach', '/get-in-touch', '/about/contact',
+            '/support/contact', '/help/contact', '/locations'
+        ]
         # Business directories for fallback searches
         self.BUSINESS_DIRECTORIES = [
             'linkedin.com/company',
@@ -149,9 +291,101 @@ class ScrapingConfig:
             'yellowpages.com',
             'yelp.com/biz'
         ]
+        self.USER_AGENTS = None  # Sampled once and cached in CACHE_DIR unless set by the settings file
+        if overrides:
+            self.update(overrides)
+        if not self.USER_AGENTS:
+            self.USER_AGENTS = self._load_user_agents()
+
+    @classmethod
+    def load(cls, path=None):
+        """
+        Process-wide configuration, built on first use.
+        Settings from the JSON file at path (or $SCRAPER_CONFIG) override the defaults.
+        Raises ValueError if path names another file than the one already loaded.
+        """
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    settings_path = path or os.environ.get('SCRAPER_CONFIG')
+                    overrides = None
+                    if settings_path and os.path.exists(settings_path):
+                        with open(settings_path, encoding='utf-8') as settings_file:
+                            overrides = json.load(settings_file)
+                    cls._instance = cls(overrides)
+                    cls._instance_path = settings_path
+                    return cls._instance
+        if path and (cls._instance_path is None or
+                     os.path.abspath(path) != os.path.abspath(cls._instance_path)):
+            raise ValueError(
+                f"Configuration already loaded from {cls._instance_path or 'the defaults'}, "
+                f"cannot load {path}"
+            )
+        return cls._instance
+
+    @staticmethod
+    def _decode(default, value):
+        """Restore the type of a default from its JSON form (timedeltas are seconds)"""
+        if isinstance(default, timedelta):
+            return timedelta(seconds=value)
+        if isinstance(default, tuple):
+            return tuple(value)
+        if isinstance(default, list) and default and isinstance(default[0], tuple):
+            return [tuple(item) for item in value]
+        return value
+
+    @staticmethod
+    def _encode(value):
+        if isinstance(value, timedelta):
+            return value.total_seconds()
+        raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+    def update(self, settings):
+        """Override settings by name, unknown names are ignored with a warning"""
+        for name, value in settings.items():
+            if not name.isupper() or not hasattr(self, name):
+                logging.warning("Unknown scraping setting %s ignored", name)
+                continue
+            setattr(self, name, self._decode(getattr(self, name), value))
+
+    def to_dict(self):
+        """All settings by name, JSON serializable"""
+        settings = {name: value for name, value in vars(self).items() if name.isupper()}
+        return json.loads(json.dumps(settings, default=self._encode))
+
+    def save(self, path):
+        """Write all settings to a JSON file that load() accepts"""
+        with open(path, 'w', encoding='utf-8') as settings_file:
+            json.dump(self.to_dict(), settings_file, indent=2, ensure_ascii=False)
+
+    def _load_user_agents(self):
+        """
+        User agents from the cache file in CACHE_DIR, sampled again only when
+        the cache is missing or older than CACHE_DURATION
+        """
+        cache_path = os.path.join(self.CACHE_DIR, 'user_agents.json')
+        try:
+            if time.time() - os.path.getmtime(cache_path) < self.CACHE_DURATION.total_seconds():
+                with open(cache_path, encoding='utf-8') as cache_file:
+                    agents = json.load(cache_file)
+                if agents:
+                    return agents
+        except (OSError, ValueError):
+            pass
+        agents = self._sample_user_agents()
+        try:
+            os.makedirs(self.CACHE_DIR, exist_ok=True)
+            with open(cache_path, 'w', encoding='utf-8') as cache_file:
+                json.dump(agents, cache_file)
+        except OSError as e:
+            logging.warning("Could not cache user agents in %s: %s", cache_path, e)
+        return agents
+
     @staticmethod
-    def _load_user_agents():
+    def _sample_user_agents():
         """Load rotating list of user agents with extended browser coverage"""
+        # Imported here, fake_useragent is slow to import and only needed when the cache is cold
+        from fake_useragent import UserAgent
         ua = UserAgent()
         # Get a mix of different browser user agents
         agents = []
@@ -0,0 +1,76 @@
+import time
+
+
+class BudgetExceeded(Exception):
+    """Raised when a company has used up its time, request or byte budget"""
+
+
+class CompanyBudget:
+    """Wall time, request, byte and browser render budget for processing a single company"""
+    def __init__(self, max_seconds, max_requests, max_bytes, max_renders=0):
+        self.max_seconds = max_seconds
+        self.max_requests = max_requests
+        self.max_bytes = max_bytes
+        self.max_renders = max_renders
+        self.started = time.monotonic()
+        self.requests = 0
+        self.bytes = 0
+        self.renders = 0
+        self.exhausted_reason = None
+
+    @property
+    def elapsed(self):
+        return time.monotonic() - self.started
+
+    @property
+    def remaining_seconds(self):
+        return max(0.0, self.max_seconds - self.elapsed)
+
+    @property
+    def remaining_bytes(self):
+        return max(0, self.max_bytes - self.bytes)
+
+    @property
+    def exhausted(self):
+        return self.exhausted_reason is not None
+
+    def check(self):
+        """Raise BudgetExceeded if any part of the budget is used up"""
+        if self.exhausted_reason is None:
+            if self.elapsed >= self.max_seconds:
+                self.exhausted_reason = 'time'
+            elif self.requests >= self.max_requests:
+                self.exhausted_reason = 'requests'
+            elif self.bytes >= self.max_bytes:
+                self.exhausted_reason = 'bytes'
+        if self.exhausted_reason is not None:
+            raise BudgetExceeded(f"Company budget exceeded ({self.exhausted_reason})")
+
+    def timeout(self, default):
+        """Clamp a per-operation timeout to the remaining wall time"""
+        self.check()
+        return max(0.1, min(default, self.remaining_seconds))
+
+    def charge_request(self):
+        """Account for one outgoing request, raising if none are left"""
+        self.check()
+        self.requests += 1
+
+    def charge_render(self):
+        """
+        Account for one browser render.
+        Running out of renders only disables rendering, the company goes on statically.
+
+        Returns:
+            bool: False if the render budget is used up
+        """
+        self.check()
+        if self.renders >= self.max_renders:
+            return False
+        self.renders += 1
+        self.requests += 1
+        return True
+
+    def charge_bytes(self, size):
+        """Account for downloaded bytes"""
+        self.bytes += size
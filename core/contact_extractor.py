@@ -1,7 +1,56 @@
+import re
+from core.email_deobfuscator import EmailDeobfuscator
+from utils.regex_engine import SafeRegex
+
+
 class ContactExtractor:
     """Enhanced contact information extraction with improved patterns"""
-    def __init__(self):
+    def __init__(self, config=None):
         self.setup_patterns()
+        self.compile_patterns(config)
+
+    def compile_patterns(self, config=None):
+        """Compile all patterns with the bounded-time regex engine"""
+        limits = {}
+        if config is not None:
+            limits = {
+                'window': config.REGEX_WINDOW,
+                'overlap': config.REGEX_WINDOW_OVERLAP,
+                'timeout': config.REGEX_TIMEOUT
+            }
+        self.email_regexes = [SafeRegex(p, re.I, **limits) for p in self.email_patterns]
+        self.phone_regexes = [SafeRegex(p, **limits) for p in self.phone_patterns]
+        self.schema_regexes = {
+            kind: [SafeRegex(p, **limits) for p in self.schema_patterns[kind]]
+            for kind in ('email', 'phone', 'website')
+        }
+        self.json_assignment_regex = SafeRegex(self.json_assignment_pattern, **limits)
+        self.deobfuscator = EmailDeobfuscator(**limits)
+
+    def deobfuscate(self, text):
+        """Decode obfuscated email addresses in text before it is scanned"""
+        return self.deobfuscator.normalize(text)
+
+    def find_emails(self, text):
+        """Yield candidate emails matched in text, which should be deobfuscated first"""
+        for regex in self.email_regexes:
+            for match in regex.finditer(text):
+                # Patterns without a capture group match the candidate as a whole
+                candidate = match.group(1) if regex.groups else match.group(0)
+                if candidate:
+                    yield candidate
+
+    def find_phones(self, text):
+        """Yield candidate phone numbers matched in text, in pattern order"""
+        for regex in self.phone_regexes:
+            for match in regex.finditer(text):
+                yield match.group(0)
+
+    def find_schema_values(self, kind, markup):
+        """Yield values captured by the structured data patterns of a kind"""
+        for regex in self.schema_regexes[kind]:
+            for match in regex.finditer(markup):
+                yield match.group(1)
     def setup_patterns(self):
         """Setup enhanced regex patterns for contact information"""
         self.email_patterns = [
@@ -12,74 +61,14 @@ class ContactExtractor:
             [a-zA-Z0-9._%+-]{0,63}       # Rest of username (max 64 chars)
             @                            # @ symbol
             [a-zA-Z0-9]                 # Domain must start with alphanumeric
-            [a-zA-Z0-9.-]*              # Rest of domain
+            [a-zA-Z0-9.-]{0,252}        # Rest of domain (bounded)
             \.                          # Dot
             [a-zA-Z]{2,}                # TLD
             (?:\.[a-zA-Z]{2,})?         # Optional secondary TLD (e.g., .co.uk)
             )''',
-            
-            # Obfuscated email with improved flexibility
-            r'''(?x)
-            ([a-zA-Z0-9._%+-]+          # Username
-            \s*[\[\({⟨<]?\s*           # Optional opening bracket with flexible spacing
-            (?:at|@)\s*                 # @ symbol or 'at' with flexible spacing
-            [\]\)}⟩>]?\s*              # Optional closing bracket with flexible spacing
-            [a-zA-Z0-9][a-zA-Z0-9.-]*   # Domain
-            \s*[\[\({⟨<]?\s*           # Optional opening bracket
-            (?:dot|\.)\s*              # Dot or 'dot' with flexible spacing
-            [\]\)}⟩>]?\s*              # Optional closing bracket
-            [a-zA-Z]{2,}                # TLD
-            (?:\s*[\[\({⟨<]?\s*        # Optional secondary TLD section
-            (?:dot|\.)\s*
-            [\]\)}⟩>]?\s*
-            [a-zA-Z]{2,})?              # Secondary TLD
-            )''',
-
-            # Add to email_patterns
-            r'''(?x)
-            (?:mailto:)?
-            ([a-zA-Z0-9][a-zA-Z0-9._%+-]*[a-zA-Z0-9]@(?:[a-zA-Z0-9-]+\.)+[a-zA-Z]{2,})
-            ''',
-                        
-            # HTML encoded email with hex and decimal entities
-            r'''(?x)
-            ((?:&#[x0-9a-fA-F]+;|      # Hex entities
-            &#\d+;|                     # Decimal entities
-            &[a-zA-Z]+;|               # Named entities
-            [a-zA-Z0-9._%+-])+         # Regular characters
-            @
-            (?:&#[x0-9a-fA-F]+;|
-            &#\d+;|
-            &[a-zA-Z]+;|
-            [a-zA-Z0-9.-])+
-            \.[a-zA-Z]{2,})''',
-
-        # URI encoded email pattern
-        r'''(?x)
-        (?:%[0-9A-Fa-f]{2})+          # URI encoded characters
-        %40                            # @ symbol (URI encoded)
-        (?:%[0-9A-Fa-f]{2})+          # Domain part (URI encoded)
-        ''',
-        
-        # JavaScript encoded email pattern
-        r'''(?x)
-        (?:unescape\(|decodeURIComponent\()  # JavaScript decode functions
-        ['"]                                 # Quote
-        (?:%[0-9A-Fa-f]{2}|\\x[0-9A-Fa-f]{2})+ # Encoded email
-        ['"]                                 # Closing quote
-        \)                                   # Closing parenthesis
-        ''',
-        
-        # Base64 encoded email pattern
-        r'''(?x)
-        (?:^|[^a-zA-Z0-9+/])          # Not part of another base64 string
-        ([a-zA-Z0-9+/]{4})*           # Base64 chunks of 4
-        ([a-zA-Z0-9+/]{4}|            # Either complete chunk
-        [a-zA-Z0-9+/]{3}=|            # or 3 chars + 1 pad
-        [a-zA-Z0-9+/]{2}==)           # or 2 chars + 2 pad
-        (?:[^a-zA-Z0-9+/]|$)          # End of base64 string
-        '''
 
+            # Encoded and obfuscated addresses are decoded by EmailDeobfuscator
+            # beforehand, so the plain pattern above finds them as well
         ]
 
         # Phone patterns with improved international support
@@ -88,7 +77,7 @@ class ContactExtractor:
             r'''(?x)
             (?:\+|00)                   # International prefix (+ or 00)
             [1-9]\d{0,3}               # Country code (1-4 digits)
-            (?:[\s.-]*\d){8,12}        # Rest of the number with flexible separators
+            (?:[\s.-]{0,3}\d){8,12}    # Rest of the number with flexible separators
             [\s.-]?                     # Optional separator
             \(?                         # Optional opening parenthesis
             \d{1,4}                    # Area/city code
@@ -183,17 +172,23 @@ class ContactExtractor:
 
         ]
 
+        # JavaScript assignment of an object literal, e.g. window.config = {...};
+        # The body is bounded so a '{' without a closing '};' cannot scan the whole bundle
+        self.json_assignment_pattern = (
+            r'(?:window\.|var\s{1,10})?[a-zA-Z_$][a-zA-Z0-9_$]{0,100}\s{0,10}=\s{0,10}({[^;]{0,5000}});'
+        )
+
         # Schema.org and structured data patterns
         self.schema_patterns = {
             'email': [
                 r'"email"\s*:\s*"([^"]+?@[^"]+?\.[^"]+)"',
-                r'"contactPoint"\s*:\s*{[^}]*"email"\s*:\s*"([^"]+?@[^"]+?\.[^"]+)"',
+                r'"contactPoint"\s*:\s*{[^}]{0,2000}"email"\s*:\s*"([^"]+?@[^"]+?\.[^"]+)"',
                 r'<meta\s+(?:property|name)="(?:og:)?email"\s+content="([^"]+?@[^"]+?\.[^"]+)"',
                 r'data-email="([^"]+?@[^"]+?\.[^"]+)"'
             ],
             'phone': [
                 r'"telephone"\s*:\s*"([\+\d\s\(\)-\.]{8,20})"',
-                r'"contactPoint"\s*:\s*{[^}]*"telephone"\s*:\s*"([\+\d\s\(\)-\.]{8,20})"',
+                r'"contactPoint"\s*:\s*{[^}]{0,2000}"telephone"\s*:\s*"([\+\d\s\(\)-\.]{8,20})"',
                 r'<meta\s+(?:property|name)="(?:og:)?phone_number"\s+content="([\+\d\s\(\)-\.]{8,20})"',
                 r'data-phone="([\+\d\s\(\)-\.]{8,20})"'
             ],
@@ -0,0 +1,57 @@
+import heapq
+import itertools
+from urllib.parse import urldefrag
+
+# Where a candidate came from, earlier sources are stronger evidence of a contact page
+LINKED = 0    # Linked from the homepage navigation, footer or structured data
+SITEMAP = 1   # Listed in a sitemap
+PROBED = 2    # Guessed common path, only extracted if the page looks like a contact page
+
+
+class ContactFrontier:
+    """
+    Priority queue of candidate contact page URLs.
+    Candidates are ranked by the evidence behind them first and by their URL
+    score within a source, so every contact link on the homepage is tried
+    before any guessed path. Every URL is queued at most once.
+    """
+    def __init__(self):
+        self._heap = []
+        self._seen = set()
+        self._order = itertools.count()
+
+    @staticmethod
+    def _key(url):
+        return urldefrag(url)[0].rstrip('/').lower()
+
+    def __len__(self):
+        return len(self._heap)
+
+    def skip(self, url):
+        """Never queue the URL, e.g. the homepage that is already extracted"""
+        self._seen.add(self._key(url))
+
+    def push(self, url, score, source):
+        """Queue a candidate unless it was queued before, returns True if it was queued"""
+        key = self._key(url)
+        if key in self._seen:
+            return False
+        self._seen.add(key)
+        heapq.heappush(self._heap, (source, -score, next(self._order), url))
+        return True
+
+    def peek_source(self):
+        """Source of the best candidate, or None if the frontier is empty"""
+        return self._heap[0][0] if self._heap else None
+
+    def pop(self):
+        """
+        Remove the best candidate.
+
+        Returns:
+            tuple: (url, source), or None if the frontier is empty
+        """
+        if not self._heap:
+            return None
+        source, _, _, url = heapq.heappop(self._heap)
+        return url, source
@@ -0,0 +1,206 @@
+import logging
+import re
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+from difflib import SequenceMatcher
+
+from utils.company_names import CompanyNameNormalizer
+
+_TITLE = re.compile(r'<title[^>]{0,200}>(.{0,500}?)</title>', re.I | re.S)
+_SITE_NAME = re.compile(
+    r'<meta[^>]{0,200}property=["\']og:site_name["\'][^>]{0,200}content=["\']([^"\']{1,200})', re.I
+)
+_PARKED_MARKERS = (
+    'domain is for sale', 'buy this domain', 'domain for sale', 'parked free',
+    'this domain may be for sale', 'domain parking', 'is parked'
+)
+_STOPWORDS = {'the', 'and', 'und', 'et', 'of', 'der', 'die', 'das'}
+
+
+class DomainGuesser:
+    """
+    Fast path for finding a company website without a browser search.
+    Candidate domains are built from the normalized company name and the
+    TLDs its legal form suggests (Acme GmbH -> acme.de, acme.at, ...),
+    resolved concurrently, and fetched in order of likelihood by the
+    caller's request function until one is confirmed: the site passes the
+    domain check and its homepage title names the company. A guess has its
+    own deadline, so slow candidates leave time for the browser search.
+    """
+    def __init__(self, config):
+        self.config = config
+        self._executor = None
+        self._threads = 0
+        self.names = CompanyNameNormalizer(config.LEGAL_SUFFIX_TLDS)
+        self._lock = threading.Lock()
+        self.guesses = 0
+        self.confirmed = 0
+        self.candidates_checked = 0
+        self.lookups_timed_out = 0
+        self.size_for(1)
+
+    def size_for(self, workers):
+        """Keep enough lookup threads for every scraping worker to resolve its candidates at once"""
+        threads = self.config.DOMAIN_GUESS_WORKERS * max(1, workers)
+        with self._lock:
+            if threads <= self._threads:
+                return
+            previous = self._executor
+            self._executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix='domain-guess')
+            self._threads = threads
+        if previous:
+            # Lookups already queued there still finish, new guesses use the larger pool
+            previous.shutdown(wait=False)
+
+    def candidates(self, company_name):
+        """Candidate domains in order of likelihood"""
+        tokens, tlds = self.names.split_legal_form(company_name)
+        tokens = [token for token in tokens if token not in _STOPWORDS] or tokens
+        if not tokens:
+            return []
+        tlds += [tld for tld in self.config.DEFAULT_GUESS_TLDS if tld not in tlds]
+
+        labels = [''.join(tokens)]
+        if len(tokens) > 1:
+            labels.append('-'.join(tokens))
+            if len(tokens[0]) >= 4:
+                labels.append(tokens[0])
+        labels = [label for label in labels if 2 <= len(label) <= 63]
+
+        domains = []
+        for label in labels:
+            for tld in tlds:
+                domain = f"{label}.{tld}"
+                if domain not in domains:
+                    domains.append(domain)
+        return domains[:self.config.DOMAIN_GUESS_MAX_CANDIDATES]
+
+    @staticmethod
+    def _resolves(domain):
+        try:
+            return bool(socket.getaddrinfo(domain, 443, proto=socket.IPPROTO_TCP))
+        except (socket.gaierror, UnicodeError, OSError):
+            return False
+
+    def _fetch_homepage(self, domain, fetch, deadline):
+        """
+        Fetch a domain's homepage over HTTPS, falling back to HTTP, within the guess deadline.
+
+        Returns:
+            tuple: (final URL, start of the HTML), or None if no HTML page answered
+        """
+        for scheme in ('https', 'http'):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            response = fetch(f"{scheme}://{domain}", min(self.config.DOMAIN_GUESS_TIMEOUT, remaining))
+            if response is None:
+                continue
+            if 'html' not in response.headers.get('Content-Type', 'text/html'):
+                return None
+            return response.url, response.text[:self.config.DOMAIN_GUESS_MAX_CHARS]
+        return None
+
+    def _names_company(self, html, tokens):
+        """Check that the homepage title or site name names the company and is not a parked page"""
+        head = html[:20000].lower()
+        if any(marker in head for marker in _PARKED_MARKERS):
+            return False
+        names = [match.group(1) for match in (_TITLE.search(html), _SITE_NAME.search(html)) if match]
+        joined = ''.join(tokens)
+        significant = [token for token in tokens if len(token) > 2] or tokens
+        for name in names:
+            name_tokens = self.names.tokens(name)
+            name_joined = ''.join(name_tokens)
+            if joined in name_joined or all(token in name_tokens for token in significant):
+                return True
+            if SequenceMatcher(None, joined, name_joined[:len(joined) + 5]).ratio() > 0.8:
+                return True
+        return False
+
+    def guess(self, company_name, verify, fetch, budget=None):
+        """
+        Find a company website among the candidate domains.
+
+        Args:
+            company_name (str): Company name as given in the input
+            verify (callable): verify(url, company_name) -> bool, the scraper's domain check
+            fetch (callable): fetch(url, timeout) -> response or None, the scraper's request
+                function, which charges the budget and goes through the circuit breaker and limiters
+            budget (CompanyBudget): Guessing gets DOMAIN_GUESS_BUDGET_SHARE of its remaining time, if given
+
+        Returns:
+            str: URL of the confirmed homepage, or None if no candidate was confirmed
+        """
+        domains = self.candidates(company_name)
+        if not domains:
+            return None
+        tokens = [token for token in self.names.split_legal_form(company_name)[0] if token not in _STOPWORDS]
+
+        guess_seconds = self.config.DOMAIN_GUESS_MAX_SECONDS
+        if budget:
+            # The rest of the company's time is left for the search if no guess is confirmed
+            budget.check()
+            guess_seconds = min(guess_seconds, budget.remaining_seconds * self.config.DOMAIN_GUESS_BUDGET_SHARE)
+        dns_timeout = min(self.config.DOMAIN_GUESS_DNS_TIMEOUT, guess_seconds)
+        started = time.monotonic()
+        guess_deadline = started + guess_seconds
+        dns_deadline = started + dns_timeout
+        executor = self._executor
+        lookups = [(domain, executor.submit(self._resolves, domain)) for domain in domains]
+
+        confirmed = None
+        resolved = 0
+        timed_out = 0
+        out_of_time = False
+        try:
+            # Most likely candidates first, the rest are never fetched once one is confirmed
+            for domain, lookup in lookups:
+                if time.monotonic() >= guess_deadline:
+                    out_of_time = True
+                    break
+                try:
+                    if not lookup.result(timeout=max(0.0, dns_deadline - time.monotonic())):
+                        continue
+                except TimeoutError:
+                    timed_out += 1
+                    continue
+                resolved += 1
+                homepage = self._fetch_homepage(domain, fetch, guess_deadline)
+                if homepage is None:
+                    continue
+                url, html = homepage
+                if verify(url, company_name) and self._names_company(html, tokens):
+                    confirmed = url
+                    break
+        finally:
+            # Lookups still queued are dropped, running ones cannot be interrupted
+            for _, lookup in lookups:
+                lookup.cancel()
+
+        with self._lock:
+            self.guesses += 1
+            self.candidates_checked += len(domains)
+            self.lookups_timed_out += timed_out
+            if confirmed:
+                self.confirmed += 1
+        if out_of_time:
+            logging.debug("Domain guess for %s: stopped after %.1f s, falling back to the search",
+                          company_name, guess_seconds)
+        if timed_out:
+            logging.debug("Domain guess for %s: %s DNS lookups timed out after %.1f s",
+                          company_name, timed_out, dns_timeout)
+        logging.debug("Domain guess for %s: %s of %s candidates resolved, confirmed %s",
+                      company_name, resolved, len(domains), confirmed)
+        return confirmed
+
+    def close(self):
+        """Stop the lookup threads, pending checks are abandoned"""
+        with self._lock:
+            executor = self._executor
+            self._executor = None
+            self._threads = 0
+        if executor:
+            executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,146 @@
+import base64
+import binascii
+import html
+import re
+from urllib.parse import unquote
+from utils.regex_engine import SafeRegex
+
+# Top-level domains a spelled out address has to end in, so prose such as
+# "meet us at Berlin dot Mitte" is left alone
+_SPELLED_TLDS = frozenset('''
+    com net org info biz edu gov int mil name pro io co app dev shop online site tech store
+    eu de at ch li lu nl be fr it es pt uk ie dk no se fi is pl cz sk hu ro bg gr hr si rs ba
+    ee lv lt ua by ru tr il ae sa qa in cn hk tw jp kr sg my th id vn ph au nz ca us mx br ar
+    cl pe za ng ke eg ma
+'''.split())
+
+
+class EmailDeobfuscator:
+    """
+    Decoding pre-pass for obfuscated email addresses.
+    Turns HTML entities, percent-encoding, JavaScript escapes, "at"/"dot"
+    spelling, base64 and Cloudflare email protection back into plain text,
+    so a single simple email pattern can find every address afterwards.
+    """
+    def __init__(self, **limits):
+        self.setup_patterns()
+        self.percent_regex = SafeRegex(self.percent_pattern, **limits)
+        self.js_escape_regex = SafeRegex(self.js_escape_pattern, **limits)
+        self.bracket_at_regex = SafeRegex(self.bracket_at_pattern, re.I, **limits)
+        self.bracket_dot_regex = SafeRegex(self.bracket_dot_pattern, re.I, **limits)
+        self.spelled_regex = SafeRegex(self.spelled_pattern, re.I, **limits)
+        self.base64_regex = SafeRegex(self.base64_pattern, **limits)
+        # Only applied to the short address of a spelled out match
+        self.spelled_dot = re.compile(r'\s+dot\s+', re.I)
+
+    def setup_patterns(self):
+        """Setup the patterns of the encodings undone by normalize()"""
+        # Runs of percent-encoded bytes, e.g. info%40example.com
+        self.percent_pattern = r'(?:%[0-9A-Fa-f]{2}){1,320}'
+
+        # JavaScript string escapes, e.g. \x40 or \u0040
+        self.js_escape_pattern = r'\\x([0-9A-Fa-f]{2})|\\u([0-9A-Fa-f]{4})'
+
+        # Bracketed separators, e.g. info [at] example (dot) com
+        self.bracket_at_pattern = r'\s{0,3}[\[\({<]\s{0,3}(?:at|@)\s{0,3}[\]\)}>]\s{0,3}'
+        self.bracket_dot_pattern = r'\s{0,3}[\[\({<]\s{0,3}(?:dot|\.)\s{0,3}[\]\)}>]\s{0,3}'
+
+        # Spelled out separators without brackets, only when a whole address follows:
+        # info at example dot com
+        self.spelled_pattern = r'''(?x)
+            \b([a-zA-Z0-9._%+-]{1,64}    # Username
+            (?:\s{1,3}dot\s{1,3}[a-zA-Z0-9._%+-]{1,64}){0,3})  # 'dot' separated parts
+            \s{1,3}at\s{1,3}             # 'at'
+            ([a-zA-Z0-9-]{1,63}          # Domain label
+            (?:\s{1,3}dot\s{1,3}[a-zA-Z0-9-]{1,63}){1,4})\b  # 'dot' separated labels
+            '''
+
+        # Standalone base64 runs (bounded), decoded only when they hide an address
+        self.base64_pattern = r'''(?x)
+            (?<![a-zA-Z0-9+/])
+            (?:[a-zA-Z0-9+/]{4}){2,80}
+            (?:[a-zA-Z0-9+/]{3}=|[a-zA-Z0-9+/]{2}==)?
+            (?![a-zA-Z0-9+/=])
+            '''
+
+    @staticmethod
+    def decode_cfemail(encoded):
+        """
+        Decode a Cloudflare protected address (data-cfemail or the fragment of
+        /cdn-cgi/l/email-protection#...): hex bytes XORed with the first byte
+        """
+        try:
+            data = bytes.fromhex(encoded.strip())
+        except ValueError:
+            return None
+        if len(data) < 2:
+            return None
+        key = data[0]
+        try:
+            return bytes(byte ^ key for byte in data[1:]).decode('utf-8')
+        except UnicodeDecodeError:
+            return None
+
+    def cfemail_values(self, soup, keep=None):
+        """Decoded Cloudflare protected addresses of a parsed document, of the elements keep() accepts if given"""
+        values = []
+        for element in soup.find_all(attrs={'data-cfemail': True}):
+            if keep is None or keep(element):
+                values.append(self.decode_cfemail(element['data-cfemail']))
+        for anchor in soup.find_all('a', href=re.compile(r'/cdn-cgi/l/email-protection#')):
+            if keep is None or keep(anchor):
+                values.append(self.decode_cfemail(anchor['href'].split('#', 1)[1]))
+        return [value for value in values if value]
+
+    def _decode_base64(self, token):
+        """Decoded text of a base64 token if it contains an address, otherwise None"""
+        try:
+            decoded = base64.b64decode(token, validate=True).decode('utf-8')
+        except (binascii.Error, ValueError):
+            return None
+        if '@' in decoded and decoded.isprintable():
+            return decoded
+        return None
+
+    def _spelled_address(self, match):
+        """Address of a spelled out match, or the match unchanged unless it ends in a known TLD"""
+        domain = self.spelled_dot.sub('.', match.group(2))
+        if domain.rsplit('.', 1)[-1].lower() not in _SPELLED_TLDS:
+            return match.group(0)
+        return self.spelled_dot.sub('.', match.group(1)) + '@' + domain
+
+    def normalize(self, text):
+        """
+        Decode every supported email obfuscation in text.
+        Each step only runs when its marker is present, so plain text costs
+        little more than a few substring checks.
+        """
+        if not text:
+            return text
+
+        # Entities, twice for double-encoded markup such as &amp;#64;
+        if '&' in text:
+            text = html.unescape(html.unescape(text))
+
+        if '%' in text:
+            text = self.percent_regex.sub(lambda m: unquote(m.group(0)), text)
+
+        if '\\' in text:
+            text = self.js_escape_regex.sub(lambda m: chr(int(m.group(1) or m.group(2), 16)), text)
+
+        lowered = text.lower()
+        if 'at' in lowered or '@' in text:
+            text = self.bracket_at_regex.sub(lambda m: '@', text)
+            if 'dot' in lowered or '.' in text:
+                text = self.bracket_dot_regex.sub(lambda m: '.', text)
+            if 'dot' in lowered:
+                text = self.spelled_regex.sub(self._spelled_address, text)
+
+        # Base64 hits are appended so the original text is left untouched
+        decoded = [
+            value for value in (self._decode_base64(m.group(0)) for m in self.base64_regex.finditer(text))
+            if value
+        ]
+        if decoded:
+            text = '\n'.join([text] + decoded)
+        return text
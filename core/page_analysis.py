@@ -0,0 +1,173 @@
+import html
+import json
+import re
+from bs4 import BeautifulSoup, SoupStrainer
+
+# Containers kept by partial parsing: contact related classes plus the tags extraction reads
+_PARTIAL_CLASS = re.compile(
+    r'contact|connect|reach|touch|location|enquiry|message|social|follow|map|footer|address', re.I
+)
+_PARTIAL_TAGS = {'a', 'script', 'address', 'meta', 'form', 'iframe', 'frame', 'footer', 'noscript'}
+_SCRIPT_OR_STYLE = re.compile(r'<(script|style)\b[^>]*>.*?</\1\s*>', re.I | re.S)
+_TAG = re.compile(r'<[^>]*>')
+
+
+def _keep_partial_tag(name, attrs):
+    """SoupStrainer filter: keep top-level tags that scoring or extraction look at"""
+    if name in _PARTIAL_TAGS:
+        return True
+    if not isinstance(attrs, dict):
+        return False
+    if 'itemtype' in attrs or 'itemprop' in attrs:
+        return True
+    classes = attrs.get('class') or ''
+    if not isinstance(classes, str):
+        classes = ' '.join(classes)
+    return bool(_PARTIAL_CLASS.search(classes)) or bool(_PARTIAL_CLASS.search(attrs.get('id') or ''))
+
+
+class _PartialStrainer(SoupStrainer):
+    """
+    Partial parsing filter for beautifulsoup4 4.13 and later, which call a
+    name function with the tag name only, so attributes are checked here
+    """
+    def allow_tag_creation(self, nsprefix, name, attrs):
+        return _keep_partial_tag(name, attrs)
+
+    def allow_string_creation(self, string):
+        return False
+
+
+def _partial_strainer():
+    if hasattr(SoupStrainer, 'allow_tag_creation'):
+        return _PartialStrainer()
+    return SoupStrainer(_keep_partial_tag)
+
+
+class PageAnalysis:
+    """
+    Lazily computed, cached views of one parsed page.
+    Scoring and extraction routines read the full text, scripts, anchors,
+    JSON-LD blocks and regex hits from here, so each is computed once per page.
+    """
+    # Parses only the contact related parts of a page, see parse_partial()
+    partial_strainer = _partial_strainer()
+
+    def __init__(self, soup, contact_extractor, markup=None, text=None):
+        self.soup = soup
+        self.contact_extractor = contact_extractor
+        self._markup = markup
+        self._text = text
+        self._scripts = None
+        self._anchors = None
+        self._json_ld = None
+        self._normalized_text = None
+        self._email_hits = None
+        self._phone_hits = None
+        self._schema_hits = {}
+
+    @classmethod
+    def parse(cls, markup, contact_extractor):
+        """Fully parse a page"""
+        return cls(BeautifulSoup(markup, 'html.parser'), contact_extractor, markup)
+
+    @classmethod
+    def parse_partial(cls, markup, contact_extractor):
+        """
+        Parse only links, scripts, forms, frames, microdata and contact related
+        containers, for probe and frame pages that are scored or searched but
+        never traversed as a whole. The page text is taken from the markup
+        with tags stripped, so text and regex hits still cover the whole page.
+        """
+        soup = BeautifulSoup(markup, 'html.parser', parse_only=cls.partial_strainer)
+        text = html.unescape(_TAG.sub(' ', _SCRIPT_OR_STYLE.sub(' ', markup)))
+        return cls(soup, contact_extractor, markup, text)
+
+    def close(self):
+        """Tear down the parse tree and drop cached views so the page can be freed at once"""
+        if self.soup is not None:
+            self.soup.decompose()
+        self.soup = None
+        self._markup = self._text = self._normalized_text = None
+        self._scripts = self._anchors = self._json_ld = None
+        self._email_hits = self._phone_hits = None
+        self._schema_hits = {}
+
+    @property
+    def markup(self):
+        """Raw HTML of the page"""
+        if self._markup is None:
+            self._markup = str(self.soup)
+        return self._markup
+
+    @property
+    def text(self):
+        """Visible text of the whole document, strings of adjacent elements kept apart"""
+        if self._text is None:
+            self._text = self.soup.get_text(' ')
+        return self._text
+
+    @property
+    def scripts(self):
+        """Stripped bodies of inline script tags"""
+        if self._scripts is None:
+            self._scripts = [
+                script.string.strip() for script in self.soup.find_all('script')
+                if script.string
+            ]
+        return self._scripts
+
+    @property
+    def anchors(self):
+        """(href, lowercase href, lowercase text) of every link"""
+        if self._anchors is None:
+            self._anchors = [
+                (anchor['href'], anchor['href'].lower(), anchor.get_text().lower())
+                for anchor in self.soup.find_all('a', href=True)
+            ]
+        return self._anchors
+
+    @property
+    def json_ld(self):
+        """Parsed JSON-LD blocks, invalid ones are skipped"""
+        if self._json_ld is None:
+            self._json_ld = []
+            for script in self.soup.find_all('script', type='application/ld+json'):
+                try:
+                    self._json_ld.append(json.loads(script.string))
+                except (TypeError, ValueError):
+                    continue
+        return self._json_ld
+
+    @property
+    def normalized_text(self):
+        """
+        Page text plus mailto links and Cloudflare protected addresses,
+        with obfuscated emails decoded once for the whole document
+        """
+        if self._normalized_text is None:
+            parts = [self.text]
+            parts.extend(href for href, href_lower, _ in self.anchors if href_lower.startswith('mailto:'))
+            parts.extend(self.contact_extractor.deobfuscator.cfemail_values(self.soup))
+            self._normalized_text = self.contact_extractor.deobfuscate('\n'.join(parts))
+        return self._normalized_text
+
+    @property
+    def email_hits(self):
+        """Candidate emails matched in the deobfuscated page text"""
+        if self._email_hits is None:
+            self._email_hits = list(self.contact_extractor.find_emails(self.normalized_text))
+        return self._email_hits
+
+    @property
+    def phone_hits(self):
+        """Candidate phone numbers matched in the page text, in pattern order"""
+        if self._phone_hits is None:
+            self._phone_hits = list(self.contact_extractor.find_phones(self.text))
+        return self._phone_hits
+
+    def schema_hits(self, kind):
+        """Values captured by the structured data patterns of a kind ('email', 'phone') in the markup"""
+        if kind not in self._schema_hits:
+            self._schema_hits[kind] = list(self.contact_extractor.find_schema_values(kind, self.markup))
+        return self._schema_hits[kind]
@@ -1,53 +1,133 @@
 import json
 import logging
 import re
+import threading
+from collections import deque
 from bs4 import BeautifulSoup
 import requests
-import tldextract
 from random import uniform, choice
 from urllib.parse import urljoin, urlparse
 import time
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException
+from contextlib import contextmanager
 from config.scraping_config import ScrapingConfig
+from core.budget import BudgetExceeded, CompanyBudget
 from core.contact_extractor import ContactExtractor
+from core.contact_frontier import ContactFrontier, LINKED, PROBED, SITEMAP
+from core.domain_guesser import DomainGuesser
+from core.page_analysis import PageAnalysis
+from core.script_filter import ScriptFilter
+from core.site_templates import TEMPLATE_REGIONS, SiteTemplates
 from managers.selenium_manager import SeleniumManager
+from managers.session_manager import SessionManager
+from managers.concurrency_manager import ConcurrencyManager
+from managers.render_manager import RenderManager
+from managers.archive_manager import ArchiveManager
+from managers.circuit_breaker import HostCircuitBreaker
 from utils.validators import ContactValidators
 from utils.url_utils import UrlUtils
+from utils.single_flight import SingleFlight
+from utils.log_pipeline import set_log_context
 
 
 class CompanyScraper:
     """Enhanced scraper with improved contact information extraction"""
-    def __init__(self):
-        self.config = ScrapingConfig()
-        self.selenium_manager = SeleniumManager()
-        self.contact_extractor = ContactExtractor()
+    def __init__(self, session_manager=None, site_flight=None, concurrency=None,
+                 render_manager=None, selenium_manager=None, archive_manager=None,
+                 domain_guesser=None, host_breaker=None, script_filter=None):
+        self.config = ScrapingConfig.load()
+        self.selenium_manager = selenium_manager or SeleniumManager(self.config)
+        self.contact_extractor = ContactExtractor(self.config)
         self.contact_validator = ContactValidators()
         self.url_validator = UrlUtils()
-        self.session = self._create_session()
+        # Thread-local sessions, safe to share one scraper between worker threads
+        self.session_manager = session_manager or SessionManager(self.config)
+        # Coalesces extraction of the same site across companies and threads
+        self.site_flight = site_flight or SingleFlight()
+        # Adaptive limits for the search and site-crawl stages
+        if concurrency is None and self.config.ADAPTIVE_CONCURRENCY:
+            concurrency = ConcurrencyManager(self.config)
+        self.concurrency = concurrency
+        # Pooled browsers for pages that only show content after running scripts
+        if render_manager is None and self.config.RENDER_ENABLED:
+            render_manager = RenderManager(self.config, self.selenium_manager)
+        self.render_manager = render_manager
+        # Optional archive of every fetched page for offline re-extraction
+        if archive_manager is None and self.config.ARCHIVE_ENABLED:
+            archive_manager = ArchiveManager(self.config)
+        self.archive_manager = archive_manager
+        # Candidate-domain checks tried before the browser search
+        if domain_guesser is None and self.config.DOMAIN_GUESSING:
+            domain_guesser = DomainGuesser(self.config)
+        self.domain_guesser = domain_guesser
+        # Dead or unreachable hosts are short-circuited instead of retried
+        if host_breaker is None and self.config.CIRCUIT_BREAKER_ENABLED:
+            host_breaker = HostCircuitBreaker(self.config)
+        self.host_breaker = host_breaker
+        # Skips library and contact-free inline scripts, remembers fruitless scans across sites
+        self.script_filter = script_filter or ScriptFilter(self.config)
+        # Contact terms at the start of a word, 'aide' must not match '/braided-hose'
+        self._contact_terms = re.compile(
+            r'(?<![a-z0-9])(?:' + '|'.join(map(re.escape, self.config.CONTACT_TERMS)) + ')'
+        )
+        # Per-thread state of the company currently being processed
+        self._local = threading.local()
         self.cache = {}
-    def _create_session(self):
-        """Create a persistent session with retry mechanism"""
-        session = requests.Session()
-        session.headers.update({
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.5,de;q=0.3,es;q=0.2',
-            'Accept-Encoding': 'gzip, deflate',
-            'DNT': '1',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1'
-        })
-        return session
 
+    def _stage_limiter(self, stage=None):
+        """Adaptive limiter of the given stage, or of the calling thread's current stage"""
+        if not self.concurrency:
+            return None
+        return getattr(self.concurrency, stage or getattr(self._local, 'stage', ''), None)
+
+    def _set_stage(self, stage):
+        """Record the calling thread's current stage for limiters and log records"""
+        self._local.stage = stage
+        set_log_context(stage=stage)
+
+    @contextmanager
+    def _stage_slot(self, stage):
+        """
+        Context manager holding a concurrency slot of the given stage.
+        A company waits for its slot no longer than its remaining time budget.
+        """
+        self._set_stage(stage)
+        limiter = self._stage_limiter(stage)
+        if limiter is None:
+            yield
+            return
+        budget = self._current_budget()
+        if not limiter.acquire(budget.remaining_seconds if budget else None):
+            budget.check()
+            raise BudgetExceeded(f"Company budget exceeded (time) waiting for a {stage} slot")
+        try:
+            yield
+        finally:
+            limiter.release()
 
     def _get_company_domain(self, company_name):
         """Enhanced company domain search with multiple search engines and fallbacks"""
+        # Guessed domains confirmed by their homepage skip the browser search
+        if self.domain_guesser:
+            self._set_stage('guess')
+            try:
+                domain = self.domain_guesser.guess(
+                    company_name, self._is_valid_company_site, self._fetch_guessed_homepage,
+                    self._current_budget()
+                )
+                if domain:
+                    self._local.website_source = 'guess'
+                    return domain
+            except BudgetExceeded:
+                raise
+            except Exception as e:
+                logging.error("Domain guessing error for %s: %s", company_name, e)
+
+        self._set_stage('search')
         for search_engine, selector in self.config.SEARCH_ENGINES:
             try:
                 domain = self._search_engine_lookup(company_name, search_engine, selector)
                 if domain:
+                    self._local.website_source = 'search'
                     return domain  
 
                 # Try with additional search terms
@@ -57,24 +137,50 @@ class CompanyScraper:
                     selector
                 )
                 if domain:
+                    self._local.website_source = 'search'
                     return domain            
+            except BudgetExceeded:
+                raise
             except Exception as e:
-                logging.error(f"Search engine error ({search_engine}): {str(e)}")
+                logging.error("Search engine error (%s): %s", search_engine, e)
                 continue
        
         # Fallback to business directories
+        self._local.website_source = 'directory'
         return self._search_business_directories(company_name)
 
     def _search_engine_lookup(self, query, search_engine, selector):
-        """Perform search engine lookup with enhanced error handling"""
+        """Perform search engine lookup within the adaptive search concurrency limit"""
+        with self._stage_slot('search'):
+            return self._browser_search(query, search_engine, selector)
+
+    def _browser_search(self, query, search_engine, selector):
+        """Perform browser search with enhanced error handling"""
+        # Selenium is only imported by runs that actually search
+        from selenium.common.exceptions import TimeoutException
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support import expected_conditions as EC
+        from selenium.webdriver.support.ui import WebDriverWait
         driver = None
+        limiter = self._stage_limiter('search')
+        budget = self._current_budget()
+        wait_timeout = 10
+        if budget:
+            budget.charge_request()
+            wait_timeout = budget.timeout(wait_timeout)
         try:
             driver = self.selenium_manager.get_driver()
+            if budget:
+                driver.set_page_load_timeout(budget.timeout(self.config.PAGE_LOAD_TIMEOUT))
             search_url = search_engine.format(query.replace(' ', '+'))         
+            started = time.monotonic()
             driver.get(search_url)
-            WebDriverWait(driver, 10).until(
+            WebDriverWait(driver, wait_timeout).until(
                 EC.presence_of_element_located((By.CSS_SELECTOR, selector))
             )
+            if limiter:
+                limiter.record_success(time.monotonic() - started)
+            self.selenium_manager.record_page_stats(driver, search_url)
             results = driver.find_elements(By.CSS_SELECTOR, selector)
             for result in results[:5]:  # Check top 5 results
                 try:
@@ -85,10 +191,17 @@ class CompanyScraper:
                     continue                    
             return None            
         except TimeoutException:
-            logging.warning(f"Timeout during search for: {query}")
+            logging.warning("Timeout during search for: %s", query)
+            if limiter:
+                if driver and self._is_search_blocked(driver):
+                    limiter.record_throttled()
+                else:
+                    limiter.record_timeout()
             return None
+        except BudgetExceeded:
+            raise
         except Exception as e:
-            logging.error(f"Search error for {query}: {str(e)}")
+            logging.error("Search error for %s: %s", query, e)
             return None         
         finally:
             if driver:
@@ -97,6 +210,14 @@ class CompanyScraper:
                 except:
                     pass
 
+    def _is_search_blocked(self, driver):
+        """Check whether the search engine answered with a captcha or rate-limit page"""
+        try:
+            page = driver.page_source.lower()
+        except Exception:
+            return False
+        return any(marker in page for marker in self.config.SEARCH_BLOCK_MARKERS)
+
     def _search_business_directories(self, company_name):
         """Search business directories for company information"""
         for directory in self.config.BUSINESS_DIRECTORIES:
@@ -111,8 +232,10 @@ class CompanyScraper:
                         href = result.get('href', '')
                         if directory in href and company_name.lower() in href.lower():
                             return self._extract_website_from_directory(href)
+            except BudgetExceeded:
+                raise
             except Exception as e:
-                logging.error(f"Directory search error ({directory}): {str(e)}")
+                logging.error("Directory search error (%s): %s", directory, e)
                 continue
         return None
 
@@ -135,14 +258,17 @@ class CompanyScraper:
                     if self.url_validator.is_valid_url(href):
                         return href
             return None
+        except BudgetExceeded:
+            raise
         except Exception as e:
-            logging.error(f"Directory extraction error: {str(e)}")
+            logging.error("Directory extraction error: %s", e)
             return None
 
 
 
     def _is_valid_company_site(self, url, company_name):
         """Enhanced validation of company website"""
+        import tldextract
         try:
             # Extract domain information
             ext = tldextract.extract(url)
@@ -168,7 +294,7 @@ class CompanyScraper:
             ]
             return any(domain_matches)
         except Exception as e:
-            logging.error(f"Domain validation error: {str(e)}")
+            logging.error("Domain validation error: %s", e)
             return False
 
 
@@ -178,95 +304,196 @@ class CompanyScraper:
         return SequenceMatcher(None, str1, str2).ratio()
 
 
-    def _make_request(self, url, retry_count=0):
+    def _current_company(self):
+        """Name of the company the calling thread is processing"""
+        return getattr(self._local, 'company', None)
+
+    def _current_budget(self):
+        """Budget of the company processed by the calling thread, if any"""
+        return getattr(self._local, 'budget', None)
+
+    def _read_body(self, response, budget):
+        """
+        Read a streamed response body without exceeding the company's byte or time
+        budget. The request timeout only bounds the gap between reads, a server
+        trickling bytes is cut off once the company's time is up.
+        """
+        if not budget:
+            return response.content
+        limit = budget.remaining_bytes
+        chunks = []
+        size = 0
+        out_of_time = False
+        try:
+            for chunk in response.iter_content(chunk_size=65536):
+                chunks.append(chunk)
+                size += len(chunk)
+                if size > limit:
+                    break
+                if not budget.remaining_seconds:
+                    out_of_time = True
+                    break
+        finally:
+            response.close()
+        budget.charge_bytes(size)
+        if out_of_time:
+            budget.check()
+        # Keep the partial body so callers still see what was downloaded
+        response._content = b''.join(chunks)
+        response._content_consumed = True
+        return response._content
+
+    def _fetch_guessed_homepage(self, url, timeout):
+        """
+        Fetch a guessed homepage with the timeout left to domain guessing.
+        Only one attempt is made: a candidate that does not answer is dropped, not retried.
+        """
+        return self._make_request(url, retry_count=self.config.MAX_RETRIES - 1, timeout=timeout)
+
+    def _make_request(self, url, retry_count=0, timeout=None):
         """Enhanced request handling with smart retries"""
         if retry_count >= self.config.MAX_RETRIES:
             return None
+        breaker = self.host_breaker
+        if breaker and not breaker.allow(url):
+            return None
+        budget = self._current_budget()
+        request_timeout = timeout or self.config.TIMEOUT
+        if budget:
+            budget.charge_request()
+            request_timeout = budget.timeout(request_timeout)
+        limiter = self._stage_limiter()
+        # Add jitter to delay
+        delay = self.config.BASE_DELAY + uniform(0.01, 0.1)
         try:
-            # Update headers with random user agent
-            self.session.headers.update({
-                'User-Agent': choice(self.config.USER_AGENTS)
-            })
-            # Add jitter to delay
-            delay = self.config.BASE_DELAY + uniform(0.01, 0.1)
-            time.sleep(delay)
-            response = self.session.get(
+            if self.session_manager.delay_requests:
+                time.sleep(delay)
+            started = time.monotonic()
+            # Random user agent per request, session headers stay untouched
+            response = self.session_manager.get(
                 url,
-                timeout=self.config.TIMEOUT,
-                allow_redirects=True
+                headers={'User-Agent': choice(self.config.USER_AGENTS)},
+                timeout=request_timeout,
+                allow_redirects=True,
+                stream=budget is not None
             )
+            if breaker:
+                breaker.record_success(url)
             if response.status_code == 200:
+                self._read_body(response, budget)
+                if self.archive_manager:
+                    self.archive_manager.record_response(self._current_company(), url, response)
+                if limiter:
+                    limiter.record_success(time.monotonic() - started)
                 return response
+            response.close()
             # Handle specific status codes
             if response.status_code == 429:  # Too many requests
+                if limiter:
+                    limiter.record_throttled()
                 time.sleep(delay * (retry_count + 1))
-                return self._make_request(url, retry_count + 1)
+                return self._make_request(url, retry_count + 1, timeout)
 
             if response.status_code in [301, 302, 303, 307, 308]:  # Redirects
                 redirect_url = response.headers.get('Location')
                 if redirect_url:
-                    return self._make_request(redirect_url, retry_count)
+                    # Count redirects as attempts so redirect loops terminate
+                    return self._make_request(urljoin(url, redirect_url), retry_count + 1, timeout)
             return None
-        except requests.exceptions.Timeout:
+        except requests.exceptions.Timeout as e:
+            if limiter:
+                limiter.record_timeout()
+            if breaker and breaker.record_failure(url, breaker.classify(e)):
+                return None
             time.sleep(delay)
-            return self._make_request(url, retry_count + 1)
-        except requests.exceptions.ConnectionError:
+            return self._make_request(url, retry_count + 1, timeout)
+        except requests.exceptions.ConnectionError as e:
+            if breaker and breaker.record_failure(url, breaker.classify(e)):
+                return None
             time.sleep(delay * 2)
-            return self._make_request(url, retry_count + 1)
+            return self._make_request(url, retry_count + 1, timeout)
         except requests.exceptions.RequestException as e:
-            logging.error(f"Request error for {url}: {str(e)}")
+            logging.error("Request error for %s: %s", url, e)
             return None
 
-    def _find_contact_pages(self, soup, base_url):
-        """Enhanced contact page discovery with improved page relevance scoring"""
-        contact_pages = set()
-        
-        # First check if current page has contact section
-        main_page_score = self._evaluate_page_contact_relevance(soup)
-        if main_page_score > 0.6:  # High confidence threshold
-            contact_pages.add(base_url)
-        
-        # Search in primary navigation areas with priority scoring
-        nav_areas = {
-            'header': soup.find_all(['header', 'nav']),
-            'footer': soup.find_all('footer'),
-            'main-nav': soup.find_all(class_=re.compile(r'(main|primary|global)-nav', re.I))
-        }
-        
-        for area_type, elements in nav_areas.items():
-            for element in elements:
-                self._extract_contact_links(element, base_url, contact_pages)
-        
-        # Check structured data for contact pages
-        self._extract_structured_contact_pages(soup, base_url, contact_pages)
-        
-        # Search in sitemaps with improved parsing
-        sitemap_links = soup.find_all('a', href=re.compile(r'sitemap', re.I))
-        for link in sitemap_links:
+    def _analyze(self, markup, partial=False):
+        """
+        Parse a page into a PageAnalysis shared by all scoring and extraction routines.
+        Probe and frame pages are parsed partially to keep memory per worker low.
+        """
+        if partial:
+            return PageAnalysis.parse_partial(markup, self.contact_extractor)
+        return PageAnalysis.parse(markup, self.contact_extractor)
+
+    def _iter_contact_pages(self, page, base_url):
+        """
+        Lazily yield (url, page analysis) of likely contact pages, most promising first.
+        Links on the homepage are ranked without any request; sitemaps are only
+        fetched once no linked candidate is left, and common paths are probed one
+        at a time, so a caller that stops early never pays for the rest.
+        """
+        soup = page.soup
+        frontier = ContactFrontier()
+        frontier.skip(base_url)
+
+        # Search in primary navigation areas and structured data
+        linked = set()
+        nav_areas = (
+            soup.find_all(['header', 'nav'])
+            + soup.find_all('footer')
+            + soup.find_all(class_=re.compile(r'(main|primary|global)-nav', re.I))
+        )
+        for element in nav_areas:
+            self._extract_contact_links(element, base_url, linked)
+        self._extract_structured_contact_pages(page, base_url, linked)
+        for url in sorted(linked):
+            frontier.push(url, self._score_contact_page(url), LINKED)
+
+        for path in self.config.COMMON_CONTACT_PATHS:
+            url = urljoin(base_url, path)
+            frontier.push(url, self._score_contact_page(url), PROBED)
+
+        sitemap_urls = deque(dict.fromkeys(
+            urljoin(base_url, href) for href, href_lower, _ in page.anchors if 'sitemap' in href_lower
+        ))
+
+        extracted = 0
+        while extracted < self.config.MAX_CONTACT_PAGES:
+            # Read the site's own sitemaps before guessing paths
+            while sitemap_urls and frontier.peek_source() in (None, PROBED):
+                for url in self._sitemap_contact_pages(sitemap_urls.popleft(), base_url):
+                    frontier.push(url, self._score_contact_page(url), SITEMAP)
+
+            candidate = frontier.pop()
+            if candidate is None:
+                return
+            page_url, source = candidate
             try:
-                sitemap_url = urljoin(base_url, link['href'])
-                sitemap_response = self._make_request(sitemap_url)
-                if sitemap_response:
-                    sitemap_soup = BeautifulSoup(sitemap_response.text, 'html.parser')
-                    self._process_sitemap_content(sitemap_soup, base_url, contact_pages)
+                response = self._make_request(page_url)
+                if not response:
+                    continue
+                if source == PROBED:
+                    # Verify a guessed path is a contact page, only the parts scoring looks at are parsed
+                    probe = self._analyze(response.text, partial=True)
+                    relevant = self._evaluate_page_contact_relevance(probe) > 0.4
+                    probe.close()
+                    if not relevant:
+                        continue
+                contact_page = self._analyze(response.text)
+            except BudgetExceeded:
+                raise
             except Exception as e:
-                logging.error(f"Sitemap processing error: {str(e)}")
-        
-        # Additional search in common contact page locations
-        self._search_common_contact_locations(base_url, contact_pages)
-        
-        # Sort pages by relevance score
-        scored_pages = [(page, self._score_contact_page(page)) for page in contact_pages]
-        sorted_pages = sorted(scored_pages, key=lambda x: x[1], reverse=True)
-        
-        # Return top 3 most relevant contact pages
-        return [page for page, score in sorted_pages[:3]]
+                logging.debug("Error fetching contact page candidate %s: %s", page_url, e)
+                continue
+            extracted += 1
+            yield page_url, contact_page
 
-    def _evaluate_page_contact_relevance(self, soup):
+    def _evaluate_page_contact_relevance(self, page):
         """
         Evaluate how likely a page contains contact information
         Returns a score between 0 and 1
         """
+        soup = page.soup
         score = 0
         max_score = 7  # Total possible points
         
@@ -282,7 +509,7 @@ class CompanyScraper:
             score += 1
         
         # Check for business hours or location information
-        if soup.find_all(string=re.compile(r'(business|opening|office)\s*hours|location|address', re.I)):
+        if re.search(r'(business|opening|office)\s*hours|location|address', page.text, re.I):
             score += 1
         
         # Check for social media links section
@@ -291,10 +518,9 @@ class CompanyScraper:
             score += 0.5
         
         # Check for contact information patterns
-        text_content = soup.get_text()
-        if any(re.search(pattern, text_content) for pattern in self.contact_extractor.email_patterns):
+        if page.email_hits:
             score += 1.5
-        if any(re.search(pattern, text_content) for pattern in self.contact_extractor.phone_patterns):
+        if page.phone_hits:
             score += 1.5
         
         # Check for embedded maps
@@ -303,12 +529,11 @@ class CompanyScraper:
         
         return score / max_score
 
-    def _extract_structured_contact_pages(self, soup, base_url, contact_pages):
+    def _extract_structured_contact_pages(self, page, base_url, contact_pages):
         """Extract contact pages from structured data and metadata"""
         # Check JSON-LD data
-        for script in soup.find_all('script', type='application/ld+json'):
+        for data in page.json_ld:
             try:
-                data = json.loads(script.string)
                 contact_url = self._extract_contact_from_jsonld(data)
                 if contact_url:
                     contact_pages.add(urljoin(base_url, contact_url))
@@ -316,7 +541,7 @@ class CompanyScraper:
                 continue
         
         # Check meta tags
-        meta_tags = soup.find_all('meta', attrs={'name': re.compile(r'contact|email', re.I)})
+        meta_tags = page.soup.find_all('meta', attrs={'name': re.compile(r'contact|email', re.I)})
         for tag in meta_tags:
             content = tag.get('content', '')
             if content.startswith(('http://', 'https://', '/')):
@@ -328,7 +553,7 @@ class CompanyScraper:
         urls = sitemap_soup.find_all(['url', 'loc'])  # Handle both XML sitemap and HTML sitemap
         for url in urls:
             url_text = url.get_text().lower()
-            if any(term in url_text for term in self.config.CONTACT_PATHS):
+            if self._contact_terms.search(url_text):
                 if self.url_validator.is_valid_url(url_text):
                     contact_pages.add(url_text)
         
@@ -337,31 +562,25 @@ class CompanyScraper:
         for link in links:
             href = link['href'].lower()
             text = link.get_text().lower()
-            if any(term in href or term in text for term in self.config.CONTACT_PATHS):
+            if self._contact_terms.search(href) or self._contact_terms.search(text):
                 full_url = urljoin(base_url, link['href'])
                 if self.url_validator.is_valid_url(full_url):
                     contact_pages.add(full_url)
 
-    def _search_common_contact_locations(self, base_url, contact_pages):
-        """Search for contact pages in common URL patterns"""
-        common_paths = [
-            '/contact', '/contact-us', '/contactus', '/connect', 
-            '/reach-us', '/reach', '/get-in-touch', '/about/contact',
-            '/support/contact', '/help/contact', '/locations'
-        ]
-        
-        for path in common_paths:
-            potential_url = urljoin(base_url, path)
-            try:
-                response = self._make_request(potential_url)
-                if response and response.status_code == 200:
-                    soup = BeautifulSoup(response.text, 'html.parser')
-                    # Verify it's actually a contact page
-                    if self._evaluate_page_contact_relevance(soup) > 0.4:
-                        contact_pages.add(potential_url)
-            except Exception as e:
-                logging.debug(f"Error checking common path {path}: {str(e)}")
-                continue
+    def _sitemap_contact_pages(self, sitemap_url, base_url):
+        """Contact page URLs listed in a sitemap"""
+        contact_pages = set()
+        try:
+            sitemap_response = self._make_request(sitemap_url)
+            if sitemap_response:
+                sitemap_soup = BeautifulSoup(sitemap_response.text, 'html.parser')
+                self._process_sitemap_content(sitemap_soup, base_url, contact_pages)
+                sitemap_soup.decompose()
+        except BudgetExceeded:
+            raise
+        except Exception as e:
+            logging.error("Sitemap processing error: %s", e)
+        return sorted(contact_pages)
 
     def _score_contact_page(self, url):
         """
@@ -380,6 +599,8 @@ class CompanyScraper:
             score += 0.4
         elif '/support' in url_lower or '/help' in url_lower:
             score += 0.5
+        elif self._contact_terms.search(urlparse(url_lower).path):
+            score += 0.6  # Contact paths in other languages (kontakt, contacto, ...)
         
         # Penalize deep paths
         path_depth = url.count('/') - 2  # Subtract 2 for http://
@@ -397,7 +618,7 @@ class CompanyScraper:
             text = anchor.get_text().lower()
 
             # Check both href and text for contact-related terms
-            if any(path in href or path in text for path in self.config.CONTACT_PATHS):
+            if self._contact_terms.search(href) or self._contact_terms.search(text):
                 full_url = urljoin(base_url, anchor['href'])
                 if self.url_validator.is_valid_url(full_url):
                     contact_pages.add(full_url)
@@ -407,116 +628,206 @@ class CompanyScraper:
         if isinstance(json_data, dict):
             if 'contactPoint' in json_data:
                 return json_data.get('contactPoint', {}).get('url')
-            if 'url' in json_data and any(term in json_data.get('url', '').lower() 
-                                        for term in self.config.CONTACT_PATHS):
+            if 'url' in json_data and self._contact_terms.search(json_data.get('url', '').lower()):
                 return json_data['url']
         return None
 
 
+    def _extract_site_contact_info(self, url):
+        """
+        Extract contact information once per site.
+        Companies resolving to the same registrable domain wait on a single
+        extraction and share its result, unless the crawling company ran out
+        of budget: partial results are not shared, waiting companies crawl the
+        site again themselves. Only crawls that found an email or phone are
+        kept for later companies, the others get a fresh crawl. No company
+        waits longer than its own budget.
+        """
+        site_key = self.url_validator.get_site_key(url)
+        budget = self._current_budget()
+        try:
+            contact_info, shared = self.site_flight.do(
+                site_key, self._crawl_site, url,
+                wait_timeout=budget.timeout(budget.max_seconds) if budget else None,
+                shareable=self._crawl_complete,
+                keep=self._crawl_found_contact
+            )
+        except TimeoutError:
+            # Another company's crawl outlasted this company's time budget
+            if budget:
+                budget.check()
+            raise
+        if shared:
+            logging.info("Reusing contact information of %s for %s", site_key, url)
+        contact_info = dict(contact_info)
+        contact_info['website'] = url
+        return contact_info
+
+    def _crawl_complete(self, contact_info):
+        """Whether the calling thread's crawl ran to the end, called by the crawling thread"""
+        budget = self._current_budget()
+        return not (budget and budget.exhausted)
+
+    @staticmethod
+    def _crawl_found_contact(contact_info):
+        """Whether a crawl result is worth keeping for later companies of the site"""
+        return bool(contact_info and (contact_info.get('email') or contact_info.get('phone')))
+
+    def _crawl_site(self, url):
+        """Extract contact information within the adaptive crawl concurrency limit"""
+        with self._stage_slot('crawl'):
+            return self._extract_contact_info(url)
+
     def _extract_contact_info(self, url):
-        """Enhanced contact information extraction with additional method"""
+        """
+        Enhanced contact information extraction with additional method.
+        Contact pages are discovered lazily and extracted as they arrive, so
+        discovery stops as soon as both email and phone are found.
+        """
         contact_info = {'website': url, 'email': None, 'phone': None}
-        visited_urls = set()
+        main_page = None
+        contact_pages = None
+        pages_extracted = 0
+        # Header, nav and footer analyzed on one page are skipped on the next
+        templates = self._local.templates = SiteTemplates()
         try:
             # Get main page
             response = self._make_request(url)
             if not response:
                 return contact_info
-            soup = BeautifulSoup(response.text, 'html.parser')
+            # The main page is analyzed once for discovery and extraction
+            main_page = self._analyze(response.text)
             
             # Extract from schema.org metadata
-            self._extract_schema_contact_info(soup, contact_info)
+            self._extract_schema_contact_info(main_page, contact_info)
+            self._extract_from_contact_page(url, main_page, contact_info)
 
-            # Find contact pages
-            contact_pages = self._find_contact_pages(soup, url)
-
-            # Process each page
-            for page_url in [url] + contact_pages:
-                if page_url in visited_urls:
-                    continue
-
-                visited_urls.add(page_url)
-                try:
-                    if page_url != url:
-                        response = self._make_request(page_url)
-                        if not response:
-                            continue
-                        soup = BeautifulSoup(response.text, 'html.parser')
-
-                    # Extract contact information using multiple methods
-                    self._extract_visible_contact_info(soup, contact_info)
-                    self._extract_metadata_contact_info(soup, contact_info)
-                    self._extract_microdata_contact_info(soup, contact_info)
-                    self._extract_javascript_contact_info(soup, contact_info)  # New method
-
-                    # Additional extraction from frames and iframes
-                    frames = soup.find_all(['frame', 'iframe'])
-                    for frame in frames:
-                        frame_url = frame.get('src', '')
-                        if frame_url and frame_url.startswith(('http://', 'https://')):
-                            try:
-                                frame_response = self._make_request(frame_url)
-                                if frame_response:
-                                    frame_soup = BeautifulSoup(frame_response.text, 'html.parser')
-                                    self._extract_visible_contact_info(frame_soup, contact_info)
-                                    self._extract_metadata_contact_info(frame_soup, contact_info)
-                                    self._extract_microdata_contact_info(frame_soup, contact_info)
-                                    self._extract_javascript_contact_info(frame_soup, contact_info)
-                            except Exception as e:
-                                logging.error(f"Error extracting from frame {frame_url}: {str(e)}")
-                                continue
+            if not (contact_info['email'] and contact_info['phone']):
+                contact_pages = self._iter_contact_pages(main_page, url)
+                for page_url, page in contact_pages:
+                    try:
+                        self._extract_from_contact_page(page_url, page, contact_info)
+                    finally:
+                        # Free the tree now instead of when the next page replaces it
+                        page.close()
+                    pages_extracted += 1
 
                     # If we found both email and phone, we can stop
                     if contact_info['email'] and contact_info['phone']:
                         break
-                        
-                except Exception as e:
-                    logging.error(f"Error extracting from {page_url}: {str(e)}")
-                    continue
                     
+        except BudgetExceeded:
+            logging.info("Budget exhausted while extracting from %s, returning partial results", url)
         except Exception as e:
-            logging.error(f"Error processing {url}: {str(e)}")
+            logging.error("Error processing %s: %s", url, e)
+        finally:
+            self._local.templates = None
+            if contact_pages is not None:
+                contact_pages.close()
+            if main_page is not None:
+                main_page.close()
+        logging.debug("Extracted %s contact pages besides the homepage of %s, %s of %s template regions skipped",
+                      pages_extracted, url, templates.skipped, templates.regions)
             
         return contact_info
 
-    def _extract_javascript_contact_info(self, soup, contact_info):
+    def _extract_from_contact_page(self, page_url, page, contact_info):
+        """Extract from one page and its frames, rendering it if it is client-rendered"""
+        try:
+            # Extract contact information using multiple methods
+            found_before = (contact_info['email'], contact_info['phone'])
+            self._extract_from_page(page, contact_info)
+
+            # Static extraction found nothing on a client-rendered page, render it
+            if (found_before == (contact_info['email'], contact_info['phone'])
+                    and self._looks_script_rendered(page)):
+                self._extract_rendered_contact_info(page_url, contact_info)
+
+            # Additional extraction from frames and iframes
+            frames = page.soup.find_all(['frame', 'iframe'])
+            for frame in frames:
+                frame_url = frame.get('src', '')
+                if frame_url and frame_url.startswith(('http://', 'https://')):
+                    try:
+                        frame_response = self._make_request(frame_url)
+                        if frame_response:
+                            frame_page = self._analyze(frame_response.text, partial=True)
+                            self._extract_from_page(frame_page, contact_info)
+                            frame_page.close()
+                    except BudgetExceeded:
+                        raise
+                    except Exception as e:
+                        logging.error("Error extracting from frame %s: %s", frame_url, e)
+                        continue
+
+        except BudgetExceeded:
+            raise
+        except Exception as e:
+            logging.error("Error extracting from %s: %s", page_url, e)
+
+    def _extract_from_page(self, page, contact_info):
+        """Run every extraction method over an analyzed page"""
+        self._extract_visible_contact_info(page, contact_info)
+        self._extract_metadata_contact_info(page, contact_info)
+        self._extract_microdata_contact_info(page, contact_info)
+        self._extract_javascript_contact_info(page, contact_info)
+
+    def _looks_script_rendered(self, page):
+        """
+        Check whether a page builds its content with JavaScript:
+        little visible text, an empty app mount point or a 'enable JavaScript' notice
+        """
+        if not self.render_manager:
+            return False
+        soup = page.soup
+        text_length = len(' '.join(page.text.split()))
+        if text_length < self.config.RENDER_MIN_TEXT_LENGTH:
+            return True
+        for mount_id in self.config.RENDER_MOUNT_POINTS:
+            mount = soup.find(id=mount_id)
+            if mount is not None and not mount.get_text(strip=True):
+                return True
+        noscript = ' '.join(tag.get_text(' ') for tag in soup.find_all('noscript')).lower()
+        return 'enable javascript' in noscript or 'javascript is required' in noscript
+
+    def _extract_rendered_contact_info(self, url, contact_info):
+        """Render a page in a pooled browser and extract from the resulting DOM"""
+        budget = self._current_budget()
+        timeout = self.config.RENDER_TIMEOUT
+        if budget:
+            if not budget.charge_render():
+                return
+            timeout = budget.timeout(timeout)
+        html = self.render_manager.render(url, timeout)
+        if not html:
+            return
+        if self.archive_manager:
+            self.archive_manager.record_rendered(self._current_company(), url, html)
+        logging.debug("Extracting from rendered page %s", url)
+        rendered_page = self._analyze(html)
+        self._extract_from_page(rendered_page, contact_info)
+        rendered_page.close()
+
+    def _extract_javascript_contact_info(self, page, contact_info):
         """
         Extract contact information embedded in JavaScript/JSON data and dynamic content
         """
-        # Find all script tags
-        script_tags = soup.find_all('script')
-        
-        for script in script_tags:
-            if not script.string:
+        for script_content in page.scripts:
+            if contact_info['email'] and contact_info['phone']:
+                break
+            digests = self.script_filter.check(script_content)
+            if digests is None:
                 continue
-                
-            script_content = script.string.strip()
-            
-            # Look for contact info in JavaScript object literals
-            if not contact_info['email']:
-                # Search for email patterns in JavaScript variables
-                for pattern in self.contact_extractor.email_patterns:
-                    matches = re.finditer(pattern, script_content, re.I)
-                    for match in matches:
-                        email = match.group(1)
-                        if self.contact_validator._validate_email(email):
-                            contact_info['email'] = email
-                            break
-                            
-            if not contact_info['phone']:
-                # Search for phone patterns in JavaScript variables
-                for pattern in self.contact_extractor.phone_patterns:
-                    matches = re.finditer(pattern, script_content)
-                    for match in matches:
-                        phone = match.group(0)
-                        if self.contact_validator._validate_phone(phone):
-                            contact_info['phone'] = self.contact_validator._format_phone(phone)
-                            break
+            # Only a scan for both fields tells whether the script is irrelevant
+            full_scan = not contact_info['email'] and not contact_info['phone']
+
+            # Look for contact info in JavaScript object literals and variables
+            self._extract_from_text(script_content, contact_info, deobfuscate=True)
                             
             # Extract from JSON config objects
             try:
                 # Find JSON-like structures in JavaScript
-                json_matches = re.finditer(r'(?:window\.|var\s+)?[a-zA-Z_$][a-zA-Z0-9_$]*\s*=\s*({[^;]+});', script_content)
+                json_matches = self.contact_extractor.json_assignment_regex.finditer(script_content)
                 
                 for json_match in json_matches:
                     try:
@@ -531,9 +842,12 @@ class CompanyScraper:
                         continue
                         
             except Exception as e:
-                logging.debug(f"Error parsing JavaScript content: {str(e)}")
+                logging.debug("Error parsing JavaScript content: %s", e)
                 continue
 
+            if full_scan and not contact_info['email'] and not contact_info['phone']:
+                self.script_filter.mark_irrelevant(digests)
+
     def _search_json_recursively(self, json_data, contact_info):
         """
         Recursively search through JSON structure for contact information
@@ -559,11 +873,10 @@ class CompanyScraper:
                 if isinstance(item, (dict, list)):
                     self._search_json_recursively(item, contact_info)
 
-    def _extract_schema_contact_info(self, soup, contact_info):
+    def _extract_schema_contact_info(self, page, contact_info):
         """Extract contact information from schema.org markup"""
-        for script in soup.find_all('script', type='application/ld+json'):
+        for data in page.json_ld:
             try:
-                data = json.loads(script.string)
                 if isinstance(data, dict):
                     # Extract from ContactPoint
                     contact_point = data.get('contactPoint', {})
@@ -580,10 +893,25 @@ class CompanyScraper:
             except:
                 continue
 
-    def _extract_visible_contact_info(self, soup, contact_info):
+    def _extract_visible_contact_info(self, page, contact_info):
         """
         Extract contact information from visible content with enhanced nested structure handling
         """
+        soup = page.soup
+        templates = getattr(self._local, 'templates', None)
+        # Regions already analyzed on an earlier page of the site, or earlier on this page
+        skipped = []
+        traversed = set()
+
+        def fresh(element):
+            if any(id(parent) in traversed for parent in element.parents):
+                return False
+            traversed.add(id(element))
+            if templates is None or templates.first_visit(element):
+                return True
+            skipped.append(element)
+            return False
+
         # Common builder class patterns
         builder_patterns = {
             'uabb': {
@@ -607,6 +935,8 @@ class CompanyScraper:
             containers = soup.find_all(class_=classes['container'])
             
             for container in containers:
+                if not fresh(container):
+                    continue
                 # Extract from container
                 self._extract_from_builder_element(container, contact_info)
                 
@@ -619,25 +949,42 @@ class CompanyScraper:
             r'contact|footer|header|info|details', re.I))
         
         for section in contact_sections:
+            if not fresh(section):
+                continue
             # Deep traversal of nested elements
             self._deep_traverse_element(section, contact_info)
             
             if contact_info['email'] and contact_info['phone']:
                 return
 
-        phone_links = soup.find_all('a', href=True)
-        for link in phone_links:
-            href = link.get('href', '').lower()
+        for _, href, _ in page.anchors:
             if href.startswith('tel:'):
                 phone = href.replace('tel:', '').strip()
                 if self.contact_validator._validate_phone(phone):
                     contact_info['phone'] = self.contact_validator._format_phone(phone)
                     break
 
-        # Fallback to general content if still not found
+        # Fallback to general content if still not found, using the page's cached regex hits
         if not (contact_info['email'] and contact_info['phone']):
-            text_content = soup.get_text()
-            self._extract_from_text(text_content, contact_info)
+            for region in soup.find_all(TEMPLATE_REGIONS):
+                fresh(region)
+            if not skipped:
+                self._extract_from_candidates(page.email_hits, page.phone_hits, contact_info)
+                return
+            # Only the content that differs from the pages seen before is scanned, with the
+            # mailto links and Cloudflare protected addresses that normalized_text would add
+            excluded = {id(element) for element in skipped}
+
+            def novel(element):
+                return not any(id(node) in excluded for node in (element, *element.parents))
+
+            parts = [' '.join(SiteTemplates.novel_strings(soup, excluded))]
+            parts.extend(
+                anchor['href'] for anchor in soup.find_all('a', href=re.compile(r'^\s*mailto:', re.I))
+                if novel(anchor)
+            )
+            parts.extend(self.contact_extractor.deobfuscator.cfemail_values(soup, keep=novel))
+            self._extract_from_text('\n'.join(parts), contact_info, deobfuscate=True)
 
     def _extract_from_builder_element(self, element, contact_info):
         """
@@ -646,7 +993,8 @@ class CompanyScraper:
         # Check for mailto links first
         email_links = element.find_all('a', href=re.compile(r'mailto:', re.I))
         for link in email_links:
-            email = link.get('href', '').replace('mailto:', '').strip()
+            href = self.contact_extractor.deobfuscate(link.get('href', ''))
+            email = href.replace('mailto:', '').split('?')[0].strip()
             if self.contact_validator._validate_email(email):
                 contact_info['email'] = email
                 break
@@ -659,30 +1007,9 @@ class CompanyScraper:
                 contact_info['phone'] = self.contact_validator._format_phone(phone)
                 break
 
-        # Extract from text content within paragraphs and spans
-        text_elements = element.find_all(['p', 'span', 'div'])
-        for text_elem in text_elements:
-            text_content = text_elem.get_text()
-            
-            # Extract email if not found yet
-            if not contact_info['email']:
-                for pattern in self.contact_extractor.email_patterns:
-                    matches = re.finditer(pattern, text_content, re.I)
-                    for match in matches:
-                        email = match.group(1)
-                        if self.contact_validator._validate_email(email):
-                            contact_info['email'] = email
-                            break
-            
-            # Extract phone if not found yet
-            if not contact_info['phone']:
-                for pattern in self.contact_extractor.phone_patterns:
-                    matches = re.finditer(pattern, text_content)
-                    for match in matches:
-                        phone = match.group(0)
-                        if self.contact_validator._validate_phone(phone):
-                            contact_info['phone'] = self.contact_validator._format_phone(phone)
-                            break
+        # Extract from the element's text once instead of once per nested p/span/div
+        if not (contact_info['email'] and contact_info['phone']):
+            self._extract_from_text(element.get_text(' '), contact_info)
 
     def _deep_traverse_element(self, element, contact_info):
         """
@@ -713,56 +1040,53 @@ class CompanyScraper:
             if not isinstance(child, str) or child.strip():
                 self._deep_traverse_element(child, contact_info)
 
-    def _extract_from_text(self, text, contact_info):
+    def _extract_from_text(self, text, contact_info, deobfuscate=False):
         """
-        Extract contact information from a text string
+        Extract contact information from a text string. Fragments of a page are
+        scanned as they are, obfuscated emails are decoded once per page in
+        PageAnalysis.normalized_text and picked up by the general fallback;
+        deobfuscate is for whole texts that are not part of it, such as scripts.
         """
         if not isinstance(text, str):
             return
+        email_text = self.contact_extractor.deobfuscate(text) if deobfuscate else text
+        self._extract_from_candidates(
+            self.contact_extractor.find_emails(email_text) if not contact_info['email'] else (),
+            self.contact_extractor.find_phones(text) if not contact_info['phone'] else (),
+            contact_info
+        )
 
+    def _extract_from_candidates(self, emails, phones, contact_info):
+        """
+        Fill missing fields with the first valid candidate email and phone number
+        """
         # Extract email if not found yet
         if not contact_info['email']:
-            for pattern in self.contact_extractor.email_patterns:
-                matches = re.finditer(pattern, text, re.I)
-                for match in matches:
-                    email = match.group(1)
-                    if self.contact_validator._validate_email(email):
-                        contact_info['email'] = email
-                        break
+            for email in emails:
+                if self.contact_validator._validate_email(email):
+                    contact_info['email'] = email
+                    break
 
         # Extract phone if not found yet
         if not contact_info['phone']:
-            for pattern in self.contact_extractor.phone_patterns:
-                matches = re.finditer(pattern, text)
-                for match in matches:
-                    phone = match.group(0)
-                    if self.contact_validator._validate_phone(phone):
-                        contact_info['phone'] = self.contact_validator._format_phone(phone)
-                        break
+            for phone in phones:
+                if self.contact_validator._validate_phone(phone):
+                    contact_info['phone'] = self.contact_validator._format_phone(phone)
+                    break
 
-    def _extract_metadata_contact_info(self, soup, contact_info):
+    def _extract_metadata_contact_info(self, page, contact_info):
         """Extract contact information from metadata with enhanced pattern usage"""
-        # Use schema patterns for metadata extraction
-        for pattern_type, patterns in self.contact_extractor.schema_patterns.items():
-            if pattern_type in ['email', 'phone'] and not contact_info[pattern_type]:
-                for pattern in patterns:
-                    matches = soup.find_all(string=re.compile(pattern))
-                    for match in matches:
-                        try:
-                            extracted = re.search(pattern, match).group(1)
-                            if pattern_type == 'email' and self.contact_validator._validate_email(extracted):
-                                contact_info['email'] = extracted
-                                break
-                            elif pattern_type == 'phone' and self.contact_validator._validate_phone(extracted):
-                                contact_info['phone'] = self.contact_validator._format_phone(extracted)
-                                break
-                        except:
-                            continue
-
-    def _extract_microdata_contact_info(self, soup, contact_info):
+        # Schema patterns are matched once against the page markup
+        self._extract_from_candidates(
+            page.schema_hits('email') if not contact_info['email'] else (),
+            page.schema_hits('phone') if not contact_info['phone'] else (),
+            contact_info
+        )
+
+    def _extract_microdata_contact_info(self, page, contact_info):
         """Extract contact information from microdata"""
         # Check itemtype="http://schema.org/Organization"
-        org_elements = soup.find_all(itemtype=re.compile(r'schema.org/Organization'))
+        org_elements = page.soup.find_all(itemtype=re.compile(r'schema.org/Organization'))
         for element in org_elements:
             if not contact_info['email']:
                 email_elem = element.find(itemprop='email')
@@ -779,40 +1103,87 @@ class CompanyScraper:
                         contact_info['phone'] = self.contact_validator._format_phone(phone)
 
 
-    def process_company(self, company_name):
-        """Process a single company with enhanced error handling and logging"""
+    def process_company(self, company_name, known=None):
+        """
+        Process a single company with enhanced error handling and logging.
+        Fields already present in known (website, email, phone) are kept and
+        the stages that would only find them again are skipped.
+        """
         try:
             # Ensure company_name is properly encoded as UTF-8 if it's not already
             if isinstance(company_name, bytes):
                 company_name = company_name.decode('utf-8')           
-            logging.info(f"Processing company: {company_name}")
+            logging.info("Processing company: %s", company_name)
         
             result = {
                 'company_name': company_name,
                 'website': None,
                 'email': None,
                 'phone': None,
-                'status': 'success'
+                'status': 'success',
+                # How the website was found and where the time went, not written to spreadsheets
+                'website_source': None,
+                'website_seconds': None,
+                'elapsed_seconds': None,
+                'requests': None
             }
+            if known:
+                for field in ('website', 'email', 'phone'):
+                    if known.get(field):
+                        result[field] = known[field]
         
+            budget = CompanyBudget(
+                self.config.COMPANY_TIME_BUDGET,
+                self.config.COMPANY_REQUEST_BUDGET,
+                self.config.COMPANY_BYTE_BUDGET,
+                self.config.COMPANY_RENDER_BUDGET
+            )
+            self._local.budget = budget
+            self._local.company = company_name
+            self._local.website_source = 'known' if result['website'] else None
+            set_log_context(company=company_name, stage=None)
             try:
-                # Find company website
-                website = self._get_company_domain(company_name)
+                # Find company website, unless it is already known
+                website = result['website'] or self._get_company_domain(company_name)
                 if website:
                     result['website'] = website
+                    result['website_source'] = self._local.website_source
+                    result['website_seconds'] = round(budget.elapsed, 3)
                     
-                    # Extract contact information
-                    contact_info = self._extract_contact_info(website)
-                    result.update(contact_info)
+                    # Extract contact information for the fields still missing
+                    if not (result['email'] and result['phone']):
+                        contact_info = self._extract_site_contact_info(website)
+                        for field in ('email', 'phone'):
+                            if not result[field]:
+                                result[field] = contact_info[field]
                 else:
                     result['status'] = 'no_website_found'
+            except BudgetExceeded:
+                pass
             except Exception as e:
-                logging.error(f"Error processing company {company_name}: {str(e)}")
+                logging.error("Error processing company %s: %s", company_name, e)
                 result['status'] = 'error'        
+            finally:
+                self._local.budget = None
+                self._local.company = None
+                self._local.website_source = None
+                set_log_context(company=None, stage=None)
+            result['elapsed_seconds'] = round(budget.elapsed, 3)
+            result['requests'] = budget.requests
+
+            if budget.exhausted:
+                # Keep whatever was found before the budget ran out
+                logging.warning(
+                    "Budget exceeded for %s (%s) after %.1fs, %s requests, %s bytes",
+                    company_name, budget.exhausted_reason, budget.elapsed, budget.requests, budget.bytes
+                )
+                result['status'] = 'budget_exceeded'
+            if self.archive_manager:
+                self.archive_manager.record_company(company_name, result['website'], result['status'])
             return result
             
         except UnicodeEncodeError as e:
-            logging.error(f"Unicode encoding error while processing company: {str(e)}")
+            logging.error("Unicode encoding error while processing company: %s", e)
             return {
                 'company_name': str(company_name.encode('utf-8')),  # Fallback encoding
                 'website': None,
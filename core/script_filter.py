@@ -0,0 +1,94 @@
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+
+# Digits are masked in fingerprints, so builds differing only in versions, ids or timestamps match
+_MASK_DIGITS = str.maketrans('123456789', '000000000')
+# A plain email address, a bare '@' is in nearly every bundle (decorators, @media, scoped packages)
+_EMAIL_SHAPE = r'[a-z0-9._%+-]@[a-z0-9-]+\.[a-z]{2,}'
+
+
+def _marker_pattern(markers):
+    """One regex for all markers, those starting with a letter anchored at the start of a word"""
+    parts = [
+        (r'(?<![a-z0-9_])' if marker[:1].isalpha() else '') + re.escape(marker)
+        for marker in markers
+    ]
+    return re.compile('|'.join(parts + [_EMAIL_SHAPE]))
+
+
+class ScriptFilter:
+    """
+    Decides which inline scripts are worth a full contact scan.
+    Scripts are skipped when they are a known third-party library, carry no
+    hint of contact data (or, above SCRIPT_MAX_SCAN_CHARS, no strong hint),
+    or were fully scanned before without result. The last check uses a
+    shared cache of content hashes, plus digit-masked fingerprints for
+    larger scripts, so a bundle is scanned once per run across all sites.
+    """
+    def __init__(self, config):
+        self.library_markers = tuple(marker.lower() for marker in config.SCRIPT_LIBRARY_MARKERS)
+        self.contact_markers = _marker_pattern([marker.lower() for marker in config.SCRIPT_CONTACT_MARKERS])
+        self.strong_markers = tuple(marker.lower() for marker in config.SCRIPT_STRONG_CONTACT_MARKERS)
+        self.max_scan_chars = config.SCRIPT_MAX_SCAN_CHARS
+        self.fingerprint_min_chars = config.SCRIPT_FINGERPRINT_MIN_CHARS
+        self.cache_size = config.SCRIPT_CACHE_SIZE
+        self._irrelevant = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {'scanned': 0, 'cached': 0, 'library': 0, 'no_markers': 0, 'oversized': 0}
+
+    def _digests(self, script):
+        """Content hash and, for larger scripts, the digit-masked fingerprint"""
+        encoded = script.encode('utf-8', 'surrogatepass')
+        digests = [b'h' + hashlib.blake2b(encoded, digest_size=16).digest()]
+        if len(script) >= self.fingerprint_min_chars:
+            masked = script.translate(_MASK_DIGITS).encode('utf-8', 'surrogatepass')
+            digests.append(b'f' + hashlib.blake2b(masked, digest_size=16).digest())
+        return digests
+
+    def _skip(self, reason):
+        with self._lock:
+            self.stats[reason] += 1
+        return None
+
+    def check(self, script):
+        """
+        Gate a script before extraction.
+
+        Returns:
+            list: Digests to pass to mark_irrelevant() after a fruitless scan,
+            or None if the script should be skipped
+        """
+        lowered = script.lower()
+        if any(marker in lowered[:512] for marker in self.library_markers):
+            return self._skip('library')
+        if len(script) > self.max_scan_chars:
+            if not any(marker in lowered for marker in self.strong_markers):
+                return self._skip('oversized')
+        elif not self.contact_markers.search(lowered):
+            return self._skip('no_markers')
+
+        digests = self._digests(script)
+        with self._lock:
+            for digest in digests:
+                if digest in self._irrelevant:
+                    self._irrelevant.move_to_end(digest)
+                    self.stats['cached'] += 1
+                    return None
+            self.stats['scanned'] += 1
+        return digests
+
+    def mark_irrelevant(self, digests):
+        """Remember a script whose full scan found no contact data"""
+        with self._lock:
+            for digest in digests:
+                self._irrelevant[digest] = True
+                self._irrelevant.move_to_end(digest)
+            while len(self._irrelevant) > self.cache_size:
+                self._irrelevant.popitem(last=False)
+
+    @property
+    def skipped(self):
+        with self._lock:
+            return sum(count for reason, count in self.stats.items() if reason != 'scanned')
@@ -0,0 +1,53 @@
+import hashlib
+
+from bs4 import CData, NavigableString
+
+# Attributes extraction reads besides the text, part of every fingerprint
+_FINGERPRINT_ATTRS = ('href', 'data-email', 'data-phone', 'data-cfemail', 'content')
+# Page regions shared by the pages of a site
+TEMPLATE_REGIONS = ['header', 'nav', 'footer', 'aside']
+
+
+class SiteTemplates:
+    """
+    Fingerprints of the page regions already analyzed during a site crawl.
+    Header, navigation and footer markup repeats on every page of a site.
+    A region whose text and contact attributes match one analyzed on an
+    earlier page cannot hold anything new: the crawl only fills missing
+    fields, so whatever the region had was found the first time.
+    """
+    def __init__(self):
+        self._seen = set()
+        self.regions = 0
+        self.skipped = 0
+
+    @staticmethod
+    def fingerprint(element):
+        """Hash of the element's text and the attributes extraction looks at"""
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(element.get_text(' ').encode('utf-8', 'surrogatepass'))
+        for tag in [element] + element.find_all(True):
+            for attr in _FINGERPRINT_ATTRS:
+                value = tag.get(attr)
+                if isinstance(value, str):
+                    digest.update(b'\0' + value.encode('utf-8', 'surrogatepass'))
+        return digest.digest()
+
+    def first_visit(self, element):
+        """Record the element's region, False if it was analyzed on an earlier page"""
+        fingerprint = self.fingerprint(element)
+        self.regions += 1
+        if fingerprint in self._seen:
+            self.skipped += 1
+            return False
+        self._seen.add(fingerprint)
+        return True
+
+    @staticmethod
+    def novel_strings(element, excluded_ids):
+        """Visible strings of element outside the excluded subtrees, in document order"""
+        for child in element.children:
+            if type(child) in (NavigableString, CData):
+                yield child
+            elif hasattr(child, 'children') and id(child) not in excluded_ids:
+                yield from SiteTemplates.novel_strings(child, excluded_ids)
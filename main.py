@@ -1,5 +1,11 @@
+from batch_processors.archive_replayer import ArchiveReplayer
 from batch_processors.batch_processor import BatchProcessor
+from batch_processors.parquet_results import ParquetResultStore
 from batch_processors.reprocessor import ReProcessor
+from batch_processors.result_postprocessor import ResultPostProcessor
+from batch_processors.scrape_service import ScrapeService
+from batch_processors.shard_coordinator import ShardCoordinator
+from batch_processors.shard_worker import ShardWorker
 from config.scraping_config import ScrapingConfig
 import logging
 
@@ -16,12 +22,16 @@ def setup_logging():
 
 if __name__ == "__main__":
     setup_logging()
-    config = ScrapingConfig()
+    config = ScrapingConfig.load()
     
     # Configuration parameters
     INPUT_FILE = 'data.xlsx'
     OUTPUT_FILE = 'data.xlsx'
     REPROCESSED_OUTPUT_FILE = 'data.xlsx'  # Optional: use same as OUTPUT_FILE to overwrite-
+    COORDINATOR_DB = 'coordinator.db'
+    COORDINATOR_URL = f'http://localhost:{config.COORDINATOR_PORT}'
+    REPLAY_OUTPUT_FILE = 'replayed.xlsx'
+    POSTPROCESSED_OUTPUT_FILE = 'data_clean.xlsx'
     BATCH_SIZE = 5
     
     try:
@@ -54,6 +64,62 @@ if __name__ == "__main__":
         )
         reprocessor.reprocess_companies(BATCH_SIZE, start_index=0)
         
+        #################################################
+        # STAGE 3: Distributed Processing
+        # Run the coordinator on one machine and a worker
+        # on each scraping machine (uncomment one of them)
+        #################################################
+        
+        # Coordinator: splits INPUT_FILE into leased shards and serves them
+        # coordinator = ShardCoordinator(
+        #     COORDINATOR_DB,
+        #     lease_seconds=config.SHARD_LEASE_SECONDS,
+        #     max_attempts=config.SHARD_MAX_ATTEMPTS
+        # )
+        # coordinator.load_input(INPUT_FILE, shard_size=config.SHARD_SIZE)
+        # coordinator.serve(port=config.COORDINATOR_PORT)
+        # coordinator.export(OUTPUT_FILE)
+        
+        # Worker: pulls shards until none are left
+        # worker = ShardWorker(COORDINATOR_URL)
+        # worker.run(max_workers=config.MAX_WORKERS)
+        
+        #################################################
+        # STAGE 4: Offline Re-Extraction
+        # Needs a run with config.ARCHIVE_ENABLED = True,
+        # replays its archived pages without network access
+        #################################################
+        
+        # replayer = ArchiveReplayer(
+        #     config.ARCHIVE_DIR,
+        #     output_file=REPLAY_OUTPUT_FILE,
+        #     max_workers=config.MAX_WORKERS
+        # )
+        # replayer.replay()
+        
+        #################################################
+        # STAGE 5: Lookup Service
+        # Keeps the scraper warm and answers single lookups,
+        # over HTTP or as JSON lines on stdin/stdout
+        #################################################
+        
+        # service = ScrapeService()
+        # service.serve()          # GET http://SERVICE_HOST:SERVICE_PORT/company?name=Acme+GmbH
+        # service.serve_stdin()    # {"id": 1, "company_name": "Acme GmbH"} per line
+        
+        #################################################
+        # STAGE 6: Post-Processing
+        # Normalizes and deduplicates the final table and
+        # flags emails shared by many companies
+        #################################################
+        
+        # postprocessor = ResultPostProcessor()
+        # postprocessor.process_file(OUTPUT_FILE, POSTPROCESSED_OUTPUT_FILE)
+        # With config.PARQUET_OUTPUT_DIR set, the columnar copy can be read instead:
+        # postprocessor.process_file(config.PARQUET_OUTPUT_DIR, POSTPROCESSED_OUTPUT_FILE)
+        # or filtered without loading the rest:
+        # ParquetResultStore(config.PARQUET_OUTPUT_DIR).incomplete(ReProcessor.RETRY_STATUSES)
+        
         #################################################
         # You can run either:
         # 1. Just Stage 1 (initial processing)
@@ -69,5 +135,5 @@ if __name__ == "__main__":
         logging.info("All processing completed successfully")
         
     except Exception as e:
-        logging.error(f"Error during processing: {str(e)}")
+        logging.error("Error during processing: %s", e)
         raise
\ No newline at end of file
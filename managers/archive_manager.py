@@ -0,0 +1,214 @@
+import gzip
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from http.client import responses as http_reasons
+
+# Headers describing the transfer, not the archived (already decoded) body
+_TRANSFER_HEADERS = {'content-encoding', 'transfer-encoding', 'content-length'}
+
+
+class ArchiveManager:
+    """
+    Append-only archive of fetched pages in a WARC-style format.
+    Every record is a separate gzip member appended to the run's archive file,
+    so a record can be read back from its offset alone and a crash never
+    corrupts earlier records. A SQLite index maps URLs and companies to records.
+    """
+    def __init__(self, config):
+        self.archive_dir = config.ARCHIVE_DIR
+        self.index_path = os.path.join(self.archive_dir, 'index.db')
+        self._lock = threading.Lock()
+        self._file = None
+        self._file_name = None
+        self._db = None
+        self.records = 0
+        self.bytes_written = 0
+
+    def _open(self):
+        """Open this run's archive file and the shared index on first write"""
+        os.makedirs(self.archive_dir, exist_ok=True)
+        stamp = datetime.now().strftime('%Y%m%d-%H%M%S')
+        self._file_name = f"pages-{stamp}-{os.getpid()}.warc.gz"
+        self._file = open(os.path.join(self.archive_dir, self._file_name), 'ab')
+        self._db = ArchiveIndex.connect(self.index_path)
+        logging.info("Archiving fetched pages to %s", self._file.name)
+
+    def record_response(self, company, url, response):
+        """Archive an HTTP response whose body has been read"""
+        headers = [
+            (name, value) for name, value in response.headers.items()
+            if name.lower() not in _TRANSFER_HEADERS
+        ]
+        reason = response.reason or http_reasons.get(response.status_code, '')
+        self._append(
+            company, url, response.url or url, 'response', response.status_code,
+            response.encoding, f"HTTP/1.1 {response.status_code} {reason}", headers,
+            response.content or b''
+        )
+
+    def record_rendered(self, company, url, html):
+        """Archive the DOM of a page rendered in a browser"""
+        self._append(
+            company, url, url, 'rendered', 200, 'utf-8', 'HTTP/1.1 200 OK',
+            [('Content-Type', 'text/html; charset=utf-8')], html.encode('utf-8')
+        )
+
+    def record_company(self, company, website, status):
+        """Remember the website found for a company, replay starts from it"""
+        with self._lock:
+            if self._db is None:
+                self._open()
+            self._db.execute(
+                'INSERT OR REPLACE INTO companies (company, website, status, archived_at) VALUES (?, ?, ?, ?)',
+                (company, website, status, time.time())
+            )
+            self._db.commit()
+
+    def _append(self, company, url, final_url, kind, status, encoding, status_line, headers, body):
+        http_block = '\r\n'.join([status_line] + [f"{name}: {value}" for name, value in headers])
+        http_block = http_block.encode('utf-8', 'replace') + b'\r\n\r\n' + body
+        warc_headers = [
+            'WARC/1.0',
+            f"WARC-Type: {'response' if kind == 'response' else 'resource'}",
+            f"WARC-Record-ID: <urn:uuid:{uuid.uuid4()}>",
+            f"WARC-Date: {datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')}",
+            f"WARC-Target-URI: {final_url}",
+            'Content-Type: application/http; msgtype=response',
+            f"Content-Length: {len(http_block)}",
+        ]
+        record = '\r\n'.join(warc_headers).encode('utf-8') + b'\r\n\r\n' + http_block + b'\r\n\r\n'
+        member = gzip.compress(record)
+
+        with self._lock:
+            if self._file is None:
+                self._open()
+            offset = self._file.tell()
+            self._file.write(member)
+            self._file.flush()
+            self._db.execute(
+                '''INSERT INTO records (url, final_url, company, kind, status, encoding,
+                                        file, offset, length, fetched_at)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)''',
+                (url, final_url, company, kind, status, encoding,
+                 self._file_name, offset, len(member), time.time())
+            )
+            self._db.commit()
+            self.records += 1
+            self.bytes_written += len(member)
+
+    def close(self):
+        """Close the archive file and the index connection"""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._db.close()
+            self._file = None
+            self._db = None
+
+
+class ArchiveIndex:
+    """Read access to an archive directory written by ArchiveManager"""
+    def __init__(self, archive_dir):
+        self.archive_dir = archive_dir
+        self.index_path = os.path.join(archive_dir, 'index.db')
+        if not os.path.exists(self.index_path):
+            raise FileNotFoundError(f"No archive index found in {archive_dir}")
+
+    @staticmethod
+    def connect(index_path):
+        """Open an index database, creating its tables if needed"""
+        db = sqlite3.connect(index_path, timeout=30, check_same_thread=False)
+        db.execute('PRAGMA journal_mode=WAL')
+        db.execute('''
+            CREATE TABLE IF NOT EXISTS records (
+                id INTEGER PRIMARY KEY,
+                url TEXT NOT NULL,
+                final_url TEXT,
+                company TEXT,
+                kind TEXT NOT NULL,
+                status INTEGER,
+                encoding TEXT,
+                file TEXT NOT NULL,
+                offset INTEGER NOT NULL,
+                length INTEGER NOT NULL,
+                fetched_at REAL
+            )''')
+        db.execute('CREATE INDEX IF NOT EXISTS records_url ON records (url, kind)')
+        db.execute('CREATE INDEX IF NOT EXISTS records_final_url ON records (final_url, kind)')
+        db.execute('CREATE INDEX IF NOT EXISTS records_company ON records (company)')
+        db.execute('''
+            CREATE TABLE IF NOT EXISTS companies (
+                company TEXT PRIMARY KEY,
+                website TEXT,
+                status TEXT,
+                archived_at REAL
+            )''')
+        db.commit()
+        return db
+
+    @contextmanager
+    def _connection(self):
+        """Read-only connection, closed when the block exits"""
+        db = sqlite3.connect(self.index_path, timeout=30)
+        try:
+            yield db
+        finally:
+            db.close()
+
+    def companies(self):
+        """(company, website, status) of every archived company"""
+        with self._connection() as db:
+            return db.execute(
+                'SELECT company, website, status FROM companies ORDER BY archived_at'
+            ).fetchall()
+
+    def company_urls(self, company):
+        """URLs fetched while processing a company, in fetch order"""
+        with self._connection() as db:
+            return [row[0] for row in db.execute(
+                'SELECT url FROM records WHERE company = ? ORDER BY id', (company,)
+            )]
+
+    def lookup(self, url, kind='response'):
+        """
+        Latest archived record of a URL as a dict with url, status, encoding,
+        headers and body, or None if the URL was never archived
+        """
+        with self._connection() as db:
+            row = db.execute(
+                '''SELECT final_url, status, encoding, file, offset, length FROM records
+                   WHERE (url = ? OR final_url = ?) AND kind = ? ORDER BY id DESC LIMIT 1''',
+                (url, url, kind)
+            ).fetchone()
+        if row is None:
+            return None
+        final_url, status, encoding, file_name, offset, length = row
+        headers, body = self._read_record(file_name, offset, length)
+        return {
+            'url': final_url,
+            'status': status,
+            'encoding': encoding,
+            'headers': headers,
+            'body': body
+        }
+
+    def _read_record(self, file_name, offset, length):
+        """Decompress one record and split it into HTTP headers and body"""
+        with open(os.path.join(self.archive_dir, file_name), 'rb') as archive:
+            archive.seek(offset)
+            record = gzip.decompress(archive.read(length))
+        _, http_block = record.split(b'\r\n\r\n', 1)
+        head, body = http_block.split(b'\r\n\r\n', 1)
+        if body.endswith(b'\r\n\r\n'):
+            body = body[:-4]
+        headers = {}
+        for line in head.decode('utf-8', 'replace').split('\r\n')[1:]:
+            name, _, value = line.partition(': ')
+            headers[name] = value
+        return headers, body
@@ -0,0 +1,157 @@
+import json
+import logging
+import os
+import threading
+import time
+from urllib.parse import urlparse
+
+# Connection error messages meaning the name does not exist (NXDOMAIN) or the port does not accept connections
+_DNS_MARKERS = (
+    'name or service not known', 'nodename nor servname', 'no address associated',
+    'name does not resolve', 'no such host'
+)
+_REFUSED_MARKERS = ('connection refused', 'actively refused', 'connectionrefusederror')
+# Resolution failures that may pass (EAI_AGAIN, resolver timeouts), and generic ones without a cause
+_RESOLVE_MARKERS = (
+    'temporary failure in name resolution', 'try again', 'failed to resolve',
+    'getaddrinfo failed', 'nameresolutionerror'
+)
+_DEFAULT_PORTS = {'https': 443, 'http': 80}
+
+
+class HostCircuitBreaker:
+    """
+    Per-host circuit breaker with a shared negative cache.
+    A host name that does not exist trips at once for every scheme. Other
+    failures are counted per endpoint (host and port), so an HTTPS port that
+    refuses connections does not block the HTTP fallback: a refusal trips
+    the endpoint at once, timeouts and transient DNS failures after
+    HOST_FAILURE_THRESHOLD consecutive ones. Tripped hosts are short-circuited
+    for the rest of the run and, except for transient DNS failures, written
+    to a negative cache in CACHE_DIR by flush(), once per batch, which later
+    runs honour for DEAD_HOST_TTL.
+    """
+    def __init__(self, config):
+        self.threshold = config.HOST_FAILURE_THRESHOLD
+        self.ttl = config.DEAD_HOST_TTL.total_seconds()
+        self.cache_path = os.path.join(config.CACHE_DIR, 'dead_hosts.json')
+        self._lock = threading.Lock()
+        # Serializes cache writes, requests only ever wait on _lock
+        self._save_lock = threading.Lock()
+        self._failures = {}
+        self._dead = self._load()
+        self._unsaved = False
+        self.tripped = 0
+        self.short_circuited = 0
+
+    @staticmethod
+    def host(url):
+        return (urlparse(url).hostname or '').lower()
+
+    @staticmethod
+    def endpoint(url):
+        """host:port of a URL, with the scheme's default port if none is given"""
+        parsed = urlparse(url)
+        host = (parsed.hostname or '').lower()
+        if not host:
+            return ''
+        try:
+            port = parsed.port
+        except ValueError:
+            port = None
+        return f"{host}:{port or _DEFAULT_PORTS.get(parsed.scheme, 80)}"
+
+    def _load(self):
+        """Dead hosts of earlier runs that are still within the TTL"""
+        try:
+            with open(self.cache_path, encoding='utf-8') as cache_file:
+                entries = json.load(cache_file)
+        except (OSError, ValueError):
+            return {}
+        now = time.time()
+        # Bare host names are only DNS failures, older caches also stored other reasons under them
+        return {
+            key: entry for key, entry in entries.items()
+            if now - entry.get('failed_at', 0) < self.ttl
+            and (':' in key or entry.get('reason') == 'dns')
+        }
+
+    def _save(self, dead):
+        """Merge this run's dead hosts into the cache file (atomic replace)"""
+        entries = self._load()
+        entries.update(dead)
+        os.makedirs(os.path.dirname(self.cache_path) or '.', exist_ok=True)
+        temp_path = f"{self.cache_path}.{os.getpid()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as cache_file:
+            json.dump(entries, cache_file)
+        os.replace(temp_path, self.cache_path)
+
+    def flush(self):
+        """Write the hosts tripped since the last flush to the cache file, outside the request lock"""
+        with self._save_lock:
+            with self._lock:
+                if not self._unsaved:
+                    return
+                # Transient DNS failures only hold for this run
+                dead = {key: entry for key, entry in self._dead.items() if entry['reason'] != 'resolve'}
+                self._unsaved = False
+            try:
+                self._save(dead)
+            except OSError as e:
+                logging.warning("Could not write dead host cache %s: %s", self.cache_path, e)
+
+    def allow(self, url):
+        """False if the URL's host name or endpoint has tripped, in this run or a cached earlier one"""
+        if self.host(url) not in self._dead and self.endpoint(url) not in self._dead:
+            return True
+        with self._lock:
+            self.short_circuited += 1
+        return False
+
+    @staticmethod
+    def classify(error):
+        """
+        Failure kind of a request exception: 'dns' for names that do not exist,
+        'resolve' for other resolution failures, 'refused' or 'timeout'/'connection'
+        """
+        message = f"{type(error).__name__} {error}".lower()
+        if any(marker in message for marker in _DNS_MARKERS):
+            return 'dns'
+        if any(marker in message for marker in _RESOLVE_MARKERS):
+            return 'resolve'
+        if any(marker in message for marker in _REFUSED_MARKERS):
+            return 'refused'
+        if 'timeout' in message or 'timed out' in message:
+            return 'timeout'
+        return 'connection'
+
+    def record_success(self, url):
+        """Any HTTP response proves the endpoint alive, its failure count is reset"""
+        endpoint = self.endpoint(url)
+        if endpoint in self._failures:
+            with self._lock:
+                self._failures.pop(endpoint, None)
+
+    def record_failure(self, url, kind):
+        """
+        Count a failed request to the URL's endpoint, or its host name for 'dns'.
+
+        Returns:
+            bool: True if the host is (now) tripped
+        """
+        key = self.host(url) if kind == 'dns' else self.endpoint(url)
+        if not key:
+            return False
+        with self._lock:
+            if key in self._dead:
+                return True
+            failures = self._failures.get(key, 0) + 1
+            self._failures[key] = failures
+            if kind not in ('dns', 'refused') and failures < self.threshold:
+                return False
+            self._dead[key] = {'reason': kind, 'failed_at': time.time()}
+            self._failures.pop(key, None)
+            self.tripped += 1
+            self._unsaved = True
+        logging.info("Circuit open for %s after %s failure(s) (%s)", key, failures, kind)
+        return True
@@ -0,0 +1,130 @@
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+
+class AdaptiveLimiter:
+    """
+    AIMD concurrency limiter for one pipeline stage.
+    The limit grows by one after a window of healthy operations and is cut
+    multiplicatively on throttling (429), timeouts or high latency.
+    """
+    def __init__(self, name, initial, minimum, maximum, target_latency,
+                 increase_every=10, decrease_factor=0.5, cooldown=5.0):
+        self.name = name
+        self.limit = initial
+        self.minimum = minimum
+        self.maximum = maximum
+        self.target_latency = target_latency
+        self.increase_every = increase_every
+        self.decrease_factor = decrease_factor
+        self.cooldown = cooldown
+        self.in_flight = 0
+        self.history = [(time.time(), initial, 'initial')]
+        self._successes = 0
+        self._last_decrease = 0.0
+        self._condition = threading.Condition()
+
+    def acquire(self, timeout=None):
+        """
+        Take one unit of concurrency, waiting at most timeout seconds.
+
+        Returns:
+            bool: False if no unit became free before the timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            while self.in_flight >= self.limit:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+            self.in_flight += 1
+        return True
+
+    def release(self):
+        with self._condition:
+            self.in_flight -= 1
+            self._condition.notify()
+
+    @contextmanager
+    def slot(self, timeout=None):
+        """Hold one unit of concurrency for the duration of the block, TimeoutError if none is free in time"""
+        if not self.acquire(timeout):
+            raise TimeoutError(f"No {self.name} slot free within {timeout:.1f} s")
+        try:
+            yield
+        finally:
+            self.release()
+
+    def record_success(self, latency):
+        """Report a completed operation and its latency in seconds"""
+        if latency > self.target_latency:
+            self._decrease('slow')
+            return
+        with self._condition:
+            self._successes += 1
+            if self._successes < self.increase_every or self.limit >= self.maximum:
+                return
+            self._successes = 0
+            self._set_limit(self.limit + 1, 'healthy')
+            self._condition.notify_all()
+
+    def record_throttled(self):
+        """Report a 429 or a search engine block page"""
+        self._decrease('throttled')
+
+    def record_timeout(self):
+        """Report a request or page load timeout"""
+        self._decrease('timeout')
+
+    def _decrease(self, reason):
+        with self._condition:
+            self._successes = 0
+            now = time.monotonic()
+            # One cut per cooldown, the in-flight operations report the same congestion
+            if now - self._last_decrease < self.cooldown:
+                return
+            self._last_decrease = now
+            self._set_limit(int(self.limit * self.decrease_factor), reason)
+
+    def _set_limit(self, limit, reason):
+        limit = max(self.minimum, min(self.maximum, limit))
+        if limit == self.limit:
+            return
+        logging.info("Concurrency limit for %s: %s -> %s (%s)", self.name, self.limit, limit, reason)
+        self.limit = limit
+        self.history.append((time.time(), limit, reason))
+
+
+class ConcurrencyManager:
+    """Holds the adaptive limiters of the search and site-crawl stages"""
+    def __init__(self, config):
+        self.search = AdaptiveLimiter(
+            'search',
+            initial=config.SEARCH_CONCURRENCY['initial'],
+            minimum=config.SEARCH_CONCURRENCY['min'],
+            maximum=config.SEARCH_CONCURRENCY['max'],
+            target_latency=config.SEARCH_TARGET_LATENCY
+        )
+        self.crawl = AdaptiveLimiter(
+            'crawl',
+            initial=config.CRAWL_CONCURRENCY['initial'],
+            minimum=config.CRAWL_CONCURRENCY['min'],
+            maximum=config.CRAWL_CONCURRENCY['max'],
+            target_latency=config.CRAWL_TARGET_LATENCY
+        )
+
+    @property
+    def max_workers(self):
+        """Thread count needed to let both stages reach their upper limits"""
+        return self.search.maximum + self.crawl.maximum
+
+    def log_limits(self):
+        """Log the current limit and number of changes of each stage"""
+        for limiter in (self.search, self.crawl):
+            logging.info(
+                "Concurrency %s: limit %s, %s in flight, %s adjustments",
+                limiter.name, limiter.limit, limiter.in_flight, len(limiter.history) - 1
+            )
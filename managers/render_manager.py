@@ -0,0 +1,110 @@
+import logging
+import queue
+import threading
+import time
+
+# Rendered once the first existing mount point has text, or the body has enough
+# text when the page has no mount point; the static shell alone never counts
+_READY_SCRIPT = """
+var ids = arguments[0], minLength = arguments[1];
+for (var i = 0; i < ids.length; i++) {
+    var mount = document.getElementById(ids[i]);
+    if (mount) { return mount.innerText.trim().length > 0; }
+}
+return !!document.body && document.body.innerText.trim().length >= minLength;
+"""
+
+
+class RenderManager:
+    """
+    Renders script-heavy pages with a pool of reusable headless browsers.
+    A global semaphore caps the number of concurrent renders across all
+    workers, browsers are started lazily and kept warm between renders.
+    """
+    def __init__(self, config, selenium_manager):
+        self.config = config
+        self.selenium_manager = selenium_manager
+        self._render_slots = threading.BoundedSemaphore(config.MAX_CONCURRENT_RENDERS)
+        self._idle_drivers = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._drivers = []
+        self.renders = 0
+        self.failures = 0
+
+    def _acquire_driver(self):
+        """Take an idle browser from the pool or start a new one"""
+        try:
+            return self._idle_drivers.get_nowait()
+        except queue.Empty:
+            driver = self.selenium_manager.get_driver()
+            with self._lock:
+                self._drivers.append(driver)
+            return driver
+
+    def _release_driver(self, driver, healthy=True):
+        """Return a browser to the pool, or quit it if it is in a bad state"""
+        if healthy:
+            self._idle_drivers.put(driver)
+            return
+        with self._lock:
+            if driver in self._drivers:
+                self._drivers.remove(driver)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def render(self, url, timeout):
+        """
+        Load a page in a pooled browser and return the rendered HTML.
+
+        Args:
+            url (str): Page to render
+            timeout (float): Seconds for the whole render: slot, page load and rendering
+
+        Returns:
+            str: Rendered page source, or None if no slot was free or rendering failed
+        """
+        from selenium.webdriver.support.ui import WebDriverWait
+        deadline = time.monotonic() + timeout
+        if not self._render_slots.acquire(timeout=timeout):
+            logging.debug("No render slot available for %s", url)
+            return None
+        driver = None
+        healthy = True
+        try:
+            driver = self._acquire_driver()
+            driver.set_page_load_timeout(max(0.1, deadline - time.monotonic()))
+            driver.get(url)
+            # With an eager page load the shell is there before the app has rendered into it
+            WebDriverWait(driver, max(0.1, deadline - time.monotonic())).until(
+                lambda d: d.execute_script(
+                    _READY_SCRIPT, self.config.RENDER_MOUNT_POINTS, self.config.RENDER_MIN_TEXT_LENGTH
+                )
+            )
+            with self._lock:
+                self.renders += 1
+            self.selenium_manager.record_page_stats(driver, url)
+            return driver.page_source
+        except Exception as e:
+            logging.debug("Render error for %s: %s", url, e)
+            with self._lock:
+                self.failures += 1
+            # A timed out browser may still be busy with the old page
+            healthy = False
+            return None
+        finally:
+            if driver:
+                self._release_driver(driver, healthy)
+            self._render_slots.release()
+
+    def close(self):
+        """Quit all pooled browsers"""
+        with self._lock:
+            drivers, self._drivers = self._drivers, []
+        for driver in drivers:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+        self._idle_drivers = queue.LifoQueue()
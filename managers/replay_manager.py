@@ -0,0 +1,79 @@
+import threading
+import requests
+from requests.structures import CaseInsensitiveDict
+
+
+class ReplaySessionManager:
+    """
+    Drop-in replacement for SessionManager that answers requests from an
+    ArchiveIndex instead of the network. URLs that were never archived
+    get an empty 404 response, so extraction follows the same paths it
+    would take online without ever opening a connection.
+    """
+    # No politeness delay is needed without a remote server
+    delay_requests = False
+
+    def __init__(self, archive_index):
+        self.archive_index = archive_index
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._misses = 0
+
+    def get(self, url, headers=None, **kwargs):
+        """Return the archived response of url as a requests.Response"""
+        record = self.archive_index.lookup(url)
+        with self._lock:
+            self._requests += 1
+            if record is None:
+                self._misses += 1
+        response = requests.Response()
+        response.url = url
+        response._content_consumed = True
+        if record is None:
+            response.status_code = 404
+            response._content = b''
+            return response
+        response.status_code = record['status']
+        response.url = record['url']
+        response.headers = CaseInsensitiveDict(record['headers'])
+        response.encoding = record['encoding']
+        response._content = record['body']
+        return response
+
+    def get_stats(self):
+        """Counters in the shape of SessionManager.get_stats, plus archive misses"""
+        with self._lock:
+            return {
+                'sessions': 0,
+                'requests': self._requests,
+                'pool_exhausted': 0,
+                'connections_opened': 0,
+                'connections_reused': 0,
+                'archive_misses': self._misses
+            }
+
+    def prune(self):
+        return 0
+
+    def close(self):
+        pass
+
+
+class ReplayRenderManager:
+    """Drop-in replacement for RenderManager serving archived rendered pages"""
+    def __init__(self, archive_index):
+        self.archive_index = archive_index
+        self.renders = 0
+        self.failures = 0
+
+    def render(self, url, timeout):
+        """Archived rendered DOM of url, or None if it was never rendered"""
+        record = self.archive_index.lookup(url, kind='rendered')
+        if record is None:
+            self.failures += 1
+            return None
+        self.renders += 1
+        return record['body'].decode('utf-8', 'replace')
+
+    def close(self):
+        pass
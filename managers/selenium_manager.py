@@ -1,13 +1,27 @@
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
+import json
 import logging
+import threading
 
 class SeleniumManager:
     """Enhanced Selenium WebDriver manager with better error handling"""
-    def __init__(self):
-        self.options = self._configure_options()
+    def __init__(self, config):
+        self.config = config
+        self.page_load_timeout = config.PAGE_LOAD_TIMEOUT
+        self.lean = config.LEAN_BROWSING
+        self._stats_lock = threading.Lock()
+        self.lean_stats = {'pages': 0, 'bytes_loaded': 0, 'requests_blocked': 0, 'bytes_saved': 0}
+        # Built on first use, selenium is not imported by runs that never start a browser
+        self._options = None
+
+    @property
+    def options(self):
+        if self._options is None:
+            self._options = self._configure_options()
+        return self._options
+
     def _configure_options(self):
         """Configure Chrome WebDriver options for optimal performance and security"""
+        from selenium.webdriver.chrome.options import Options
         options = Options()
 
         # Headless and security settings
@@ -45,6 +59,8 @@ class SeleniumManager:
         options.add_argument('--disable-logging')  # Disable logging
         options.add_argument('--ignore-certificate-errors')  # Ignore SSL certificate errors
         options.add_argument('--allow-insecure-localhost')  # Allow insecure localhost
+        if self.config.HTTP_PROXY:
+            options.add_argument(f'--proxy-server={self.config.HTTP_PROXY}')  # Route page loads like sessions
         
         
         # Additional optimization preferences
@@ -72,16 +88,81 @@ class SeleniumManager:
         
         # Additional experimental options
         options.add_experimental_option('useAutomationExtension', False)
+
+        if self.lean:
+            # Hand control back at DOMContentLoaded (or immediately), callers wait on selectors
+            options.page_load_strategy = self.config.PAGE_LOAD_STRATEGY
+            options.add_argument('--blink-settings=imagesEnabled=false')  # Skip image decoding
+            # Network events are read back to report loaded and blocked bytes per page
+            options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
         
         return options
 
+    def _enable_resource_blocking(self, driver):
+        """Block stylesheets, fonts, media, images and tracker URLs through DevTools"""
+        try:
+            driver.execute_cdp_cmd('Network.enable', {})
+            driver.execute_cdp_cmd('Network.setBlockedURLs', {
+                'urls': self.config.BLOCKED_URL_PATTERNS
+            })
+        except Exception as e:
+            logging.warning("Resource blocking unavailable: %s", e)
+
+    def record_page_stats(self, driver, url):
+        """
+        Read the network events of the last page load and log what lean browsing saved.
+        Blocked requests never download anything, so their size is estimated per resource type.
+
+        Returns:
+            dict: bytes_loaded, requests_blocked and estimated bytes_saved of the page
+        """
+        if not self.lean:
+            return None
+        try:
+            entries = driver.get_log('performance')
+        except Exception:
+            return None
+
+        resource_types = {}
+        page = {'bytes_loaded': 0, 'requests_blocked': 0, 'bytes_saved': 0}
+        for entry in entries:
+            try:
+                message = json.loads(entry['message'])['message']
+            except (KeyError, ValueError):
+                continue
+            method = message.get('method')
+            params = message.get('params', {})
+            if method == 'Network.requestWillBeSent':
+                resource_types[params.get('requestId')] = params.get('type', 'Other')
+            elif method == 'Network.loadingFinished':
+                page['bytes_loaded'] += int(params.get('encodedDataLength', 0))
+            elif method == 'Network.loadingFailed' and params.get('blockedReason'):
+                resource_type = params.get('type') or resource_types.get(params.get('requestId'), 'Other')
+                page['requests_blocked'] += 1
+                page['bytes_saved'] += self.config.ESTIMATED_RESOURCE_BYTES.get(
+                    resource_type, self.config.ESTIMATED_RESOURCE_BYTES['Other']
+                )
+
+        with self._stats_lock:
+            self.lean_stats['pages'] += 1
+            for key, value in page.items():
+                self.lean_stats[key] += value
+        logging.debug(
+            "Lean browsing %s: %s bytes loaded, %s requests blocked, ~%s bytes saved",
+            url, page['bytes_loaded'], page['requests_blocked'], page['bytes_saved']
+        )
+        return page
+
     def get_driver(self):
+        from selenium import webdriver
         try:
             driver = webdriver.Chrome(options=self.options)
-            driver.set_page_load_timeout(15)
+            driver.set_page_load_timeout(self.page_load_timeout)
             # Set window size to ensure consistent rendering
             driver.set_window_size(1920, 1080)
+            if self.lean:
+                self._enable_resource_blocking(driver)
             return driver
         except Exception as e:
-            logging.error(f"Failed to initialize WebDriver: {str(e)}")
+            logging.error("Failed to initialize WebDriver: %s", e)
             raise
\ No newline at end of file
@@ -0,0 +1,130 @@
+import logging
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class _PoolFullCounter(logging.Handler):
+    """Count urllib3 'connection pool is full' warnings as pool exhaustion events"""
+    def __init__(self, callback):
+        super().__init__(level=logging.WARNING)
+        self.callback = callback
+
+    def emit(self, record):
+        if 'Connection pool is full' in record.getMessage():
+            self.callback()
+
+
+class SessionManager:
+    """
+    Thread-local pool of HTTP sessions.
+    Each worker thread gets its own requests.Session with a tuned connection pool,
+    so no session state (headers, cookies, adapters) is shared between threads.
+    """
+    # Requests go to live servers, the scraper adds a politeness delay before each
+    delay_requests = True
+
+    def __init__(self, config):
+        self.config = config
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._sessions = []
+        self._requests = 0
+        self._pool_exhausted = 0
+        self._pool_full_handler = _PoolFullCounter(self._record_pool_exhausted)
+        logging.getLogger('urllib3.connectionpool').addHandler(self._pool_full_handler)
+
+    def _create_session(self):
+        """Create a persistent session with a sized keep-alive connection pool"""
+        session = requests.Session()
+        session.max_redirects = self.config.MAX_REDIRECTS
+        adapter = HTTPAdapter(
+            pool_connections=self.config.POOL_CONNECTIONS,
+            pool_maxsize=self.config.POOL_MAXSIZE,
+            pool_block=self.config.POOL_BLOCK
+        )
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        if self.config.HTTP_PROXY:
+            session.proxies.update({'http': self.config.HTTP_PROXY, 'https': self.config.HTTP_PROXY})
+        session.headers.update({
+            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+            'Accept-Language': 'en-US,en;q=0.5,de;q=0.3,es;q=0.2',
+            'Accept-Encoding': 'gzip, deflate',
+            'DNT': '1',
+            'Connection': 'keep-alive',
+            'Upgrade-Insecure-Requests': '1'
+        })
+        return session
+
+    @property
+    def session(self):
+        """Session owned by the calling thread, created on first use"""
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = self._create_session()
+            self._local.session = session
+            with self._lock:
+                self._sessions.append((threading.current_thread(), session))
+        return session
+
+    def get(self, url, headers=None, **kwargs):
+        """
+        Perform a GET with the calling thread's session.
+        Per-request headers are merged by requests, the session headers are never mutated.
+        """
+        with self._lock:
+            self._requests += 1
+        return self.session.get(url, headers=headers, **kwargs)
+
+    def _record_pool_exhausted(self):
+        with self._lock:
+            self._pool_exhausted += 1
+
+    def get_stats(self):
+        """Return counters for sessions, opened/reused connections and pool exhaustion"""
+        connections_opened = 0
+        pooled_requests = 0
+        with self._lock:
+            sessions = [session for _, session in self._sessions]
+            stats = {
+                'sessions': len(sessions),
+                'requests': self._requests,
+                'pool_exhausted': self._pool_exhausted
+            }
+        for session in sessions:
+            for adapter in set(session.adapters.values()):
+                pools = adapter.poolmanager.pools
+                for key in list(pools.keys()):
+                    pool = pools.get(key)
+                    if pool is None:
+                        continue
+                    connections_opened += pool.num_connections
+                    pooled_requests += pool.num_requests
+        stats['connections_opened'] = connections_opened
+        stats['connections_reused'] = max(0, pooled_requests - connections_opened)
+        return stats
+
+    def prune(self):
+        """Close the sessions of threads that have exited, their pools would stay open until close()"""
+        with self._lock:
+            dead = [session for thread, session in self._sessions if not thread.is_alive()]
+            self._sessions = [(thread, session) for thread, session in self._sessions if thread.is_alive()]
+        for session in dead:
+            try:
+                session.close()
+            except Exception:
+                pass
+        return len(dead)
+
+    def close(self):
+        """Close every session created by this manager"""
+        with self._lock:
+            sessions, self._sessions = [session for _, session in self._sessions], []
+        for session in sessions:
+            try:
+                session.close()
+            except Exception:
+                pass
+        self._local = threading.local()
+        logging.getLogger('urllib3.connectionpool').removeHandler(self._pool_full_handler)
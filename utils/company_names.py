@@ -0,0 +1,63 @@
+import re
+import unicodedata
+
+_TRANSLITERATION = str.maketrans({
+    'ä': 'ae', 'ö': 'oe', 'ü': 'ue', 'ß': 'ss', 'æ': 'ae', 'ø': 'oe', 'å': 'aa', 'ı': 'i'
+})
+# Combining diacritical marks (accents); marks such as the kana voicing marks change the letter
+_ACCENTS = re.compile('[\u0300-\u036f]')
+
+
+class CompanyNameNormalizer:
+    """
+    Normalized forms of company names.
+    Names are reduced to casefolded tokens and their trailing legal forms
+    (LEGAL_SUFFIX_TLDS) are split off, so 'ACME Tools GmbH & Co. KG',
+    'Acme Tools' and 'acme tools ltd.' share the key 'acme tools'. Keys keep
+    letters of every script; the ASCII tokens are only for building domains.
+    """
+    def __init__(self, legal_suffix_tlds):
+        # Legal forms as token tuples, longest first so 'pty ltd' wins over 'ltd'
+        self._legal_suffixes = sorted(
+            ((tuple(self.tokens(suffix)), tlds) for suffix, tlds in legal_suffix_tlds.items()),
+            key=lambda item: len(item[0]), reverse=True
+        )
+
+    @staticmethod
+    def tokens(text):
+        """Lowercase ASCII tokens of a name, dots dropped so 'S.A.' becomes 'sa'"""
+        text = text.lower().translate(_TRANSLITERATION)
+        text = unicodedata.normalize('NFKD', text).encode('ascii', 'ignore').decode('ascii')
+        return re.sub(r'[^a-z0-9]+', ' ', text.replace('.', '')).split()
+
+    @staticmethod
+    def key_tokens(text):
+        """Casefolded tokens of a name in any script, only accents dropped"""
+        text = unicodedata.normalize('NFKC', text).casefold().translate(_TRANSLITERATION)
+        text = unicodedata.normalize('NFC', _ACCENTS.sub('', unicodedata.normalize('NFD', text)))
+        return re.sub(r'[\W_]+', ' ', text.replace('.', '')).split()
+
+    def split_legal_form(self, company_name):
+        """
+        Split a company name into its ASCII name tokens and the TLDs suggested by
+        its trailing legal forms ('Acme Tools GmbH & Co. KG' -> ['acme', 'tools'], ['de', ...])
+        """
+        return self._strip_legal_form(self.tokens(company_name))
+
+    def _strip_legal_form(self, tokens):
+        tlds = []
+        stripped = True
+        while stripped and len(tokens) > 1:
+            stripped = False
+            for suffix, suffix_tlds in self._legal_suffixes:
+                if len(tokens) > len(suffix) and tuple(tokens[-len(suffix):]) == suffix:
+                    tokens = tokens[:-len(suffix)]
+                    tlds.extend(tld for tld in suffix_tlds if tld not in tlds)
+                    stripped = True
+                    break
+        return tokens, tlds
+
+    def key(self, company_name):
+        """Key shared by names that only differ in case, punctuation, accents or legal form"""
+        tokens, _ = self._strip_legal_form(self.key_tokens(company_name))
+        return ' '.join(tokens) or ' '.join(company_name.split()).casefold()
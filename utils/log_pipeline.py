@@ -0,0 +1,163 @@
+import atexit
+import json
+import logging
+import queue
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+# Company and stage of the work done by the calling thread, attached to its records
+log_context = threading.local()
+
+
+def set_log_context(**fields):
+    """Set context fields (company, stage) for records logged by the calling thread"""
+    for name, value in fields.items():
+        setattr(log_context, name, value)
+
+
+class ContextFilter(logging.Filter):
+    """Copy the calling thread's log context onto each record"""
+    def filter(self, record):
+        record.company = getattr(log_context, 'company', None)
+        record.stage = getattr(log_context, 'stage', None)
+        return True
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Let at most 'burst' records of the same message template through per
+    'interval' seconds for warnings and errors. Lazy %-style messages share
+    their template across companies, so repeated failures collapse into one
+    key; the number of dropped records is attached to the next one let through.
+    """
+    def __init__(self, burst=5, interval=60.0, level=logging.WARNING):
+        super().__init__()
+        self.burst = burst
+        self.interval = interval
+        self.level = level
+        self._lock = threading.Lock()
+        self._windows = {}
+
+    def filter(self, record):
+        if record.levelno < self.level:
+            return True
+        key = (record.levelno, record.pathname, record.lineno, str(record.msg))
+        now = time.monotonic()
+        with self._lock:
+            window = self._windows.get(key)
+            if window is None or now - window[0] >= self.interval:
+                suppressed = window[2] if window else 0
+                self._windows[key] = [now, 1, 0]
+            elif window[1] < self.burst:
+                window[1] += 1
+                suppressed = 0
+            else:
+                window[2] += 1
+                return False
+        record.suppressed = suppressed
+        return True
+
+
+class TextFormatter(logging.Formatter):
+    """Plain text lines, noting how many similar records were rate limited"""
+    def format(self, record):
+        text = super().format(record)
+        if getattr(record, 'suppressed', 0):
+            text += f" ({record.suppressed} similar messages suppressed)"
+        return text
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line with the message and its structured fields"""
+    def format(self, record):
+        entry = {
+            'time': datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'thread': record.threadName,
+            'company': getattr(record, 'company', None),
+            'stage': getattr(record, 'stage', None),
+            'message': record.getMessage(),
+        }
+        if getattr(record, 'suppressed', 0):
+            entry['suppressed'] = record.suppressed
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class _DeferredQueueHandler(QueueHandler):
+    """
+    QueueHandler that leaves formatting to the listener thread.
+    Records stay in the process, so they are enqueued as they are instead of
+    being formatted and stripped of their arguments by the logging thread.
+    """
+    def prepare(self, record):
+        return record
+
+
+class LogPipeline:
+    """
+    Non-blocking logging for worker threads.
+    The root logger gets a single queue handler, so logging from a worker only
+    costs a filter pass and an enqueue; formatting and file/console writes
+    happen on the listener's background thread.
+    """
+    _active = None
+    _install_lock = threading.Lock()
+
+    def __init__(self, log_file='scraper.log', level=logging.INFO, json_file=True,
+                 rate_limit_burst=5, rate_limit_interval=60.0, stream=None):
+        self.queue = queue.SimpleQueue()
+        text_formatter = TextFormatter('%(asctime)s - %(levelname)s - %(message)s')
+
+        file_handler = logging.FileHandler(log_file, encoding='utf-8')
+        file_handler.setFormatter(JsonFormatter() if json_file else text_formatter)
+        # Console output goes to stdout unless the caller needs stdout for itself
+        stream_handler = logging.StreamHandler(stream or sys.stdout)
+        stream_handler.setFormatter(text_formatter)
+        self.listener = QueueListener(self.queue, file_handler, stream_handler, respect_handler_level=True)
+
+        self.handler = _DeferredQueueHandler(self.queue)
+        self.handler.addFilter(ContextFilter())
+        if rate_limit_burst:
+            self.handler.addFilter(RateLimitFilter(rate_limit_burst, rate_limit_interval))
+        self.level = level
+
+    @classmethod
+    def install(cls, **kwargs):
+        """
+        Route the root logger through a new pipeline, replacing (and draining)
+        a previously installed one. Returns the installed pipeline.
+        """
+        with cls._install_lock:
+            if cls._active is not None:
+                cls._active.stop()
+            pipeline = cls(**kwargs)
+            root_logger = logging.getLogger()
+            root_logger.setLevel(pipeline.level)
+            root_logger.handlers = [pipeline.handler]
+            pipeline.listener.start()
+            cls._active = pipeline
+            return pipeline
+
+    def stop(self):
+        """Write out queued records and close the handlers"""
+        if self.listener._thread is not None:
+            self.listener.stop()
+        for handler in self.listener.handlers:
+            handler.close()
+        root_logger = logging.getLogger()
+        if self.handler in root_logger.handlers:
+            root_logger.removeHandler(self.handler)
+        if LogPipeline._active is self:
+            LogPipeline._active = None
+
+
+@atexit.register
+def _stop_active_pipeline():
+    if LogPipeline._active is not None:
+        LogPipeline._active.stop()
@@ -0,0 +1,157 @@
+import logging
+import re
+
+try:
+    from re import _parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_parse
+
+# Optional linear-time engines, picked in this order when available
+try:
+    import re2
+except ImportError:
+    re2 = None
+
+try:
+    import regex
+except ImportError:
+    regex = None
+
+
+def strip_verbose(pattern):
+    """
+    Turn a (?x) verbose pattern into a compact one for engines without verbose mode:
+    drops unescaped whitespace and '#' comments outside character classes.
+    """
+    pattern = pattern.replace('(?x)', '', 1)
+    result = []
+    in_class = False
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == '\\' and i + 1 < len(pattern):
+            result.append(pattern[i:i + 2])
+            i += 2
+            continue
+        if in_class:
+            if char == ']':
+                in_class = False
+            result.append(char)
+        elif char == '[':
+            in_class = True
+            result.append(char)
+            # A ']' right after '[' or '[^' is a literal
+            if pattern[i + 1:i + 2] == '^':
+                result.append('^')
+                i += 1
+            if pattern[i + 1:i + 2] == ']':
+                result.append(']')
+                i += 1
+        elif char == '#':
+            newline = pattern.find('\n', i)
+            i = len(pattern) if newline == -1 else newline
+            continue
+        elif not char.isspace():
+            result.append(char)
+        i += 1
+    return ''.join(result)
+
+
+def max_match_length(pattern, flags=0):
+    """Longest possible match of pattern in characters, None if it is unbounded"""
+    try:
+        width = sre_parse.parse(pattern, flags).getwidth()[1]
+    except Exception:
+        return None
+    return width if width < sre_parse.MAXREPEAT - 1 else None
+
+
+class SafeRegex:
+    """
+    Pattern with a bounded worst-case scan time.
+    Uses RE2 (linear time) when installed and the pattern is supported,
+    otherwise the 'regex' module with a per-scan timeout, otherwise the
+    standard library. With any engine, input is scanned in bounded windows
+    so that a super-linear pattern only costs a bounded amount per window.
+    Windows overlap by at least the longest possible match of a bounded
+    pattern, so no match is cut at a window boundary.
+    """
+    def __init__(self, pattern, flags=0, window=100000, overlap=512, timeout=0.5):
+        self.pattern = pattern
+        self.window = window
+        longest = max_match_length(pattern, flags)
+        if longest is not None and longest > overlap:
+            overlap = longest
+        # The window has to keep advancing, an overlap close to it rescans almost everything
+        self.overlap = min(overlap, window // 2)
+        self.timeout = timeout
+        self.groups = re.compile(pattern, flags).groups
+        self.engine, self._compiled = self._compile(pattern, flags)
+
+    def _compile(self, pattern, flags):
+        if re2 is not None:
+            try:
+                inline = '(?i)' if flags & re.I else ''
+                return 're2', re2.compile(inline + strip_verbose(pattern))
+            except Exception:
+                # Lookarounds and backreferences are not supported by RE2
+                pass
+        if regex is not None:
+            try:
+                return 'regex', regex.compile(pattern, flags)
+            except Exception:
+                pass
+        return 're', re.compile(pattern, flags)
+
+    def _scan(self, text):
+        if self.engine == 'regex':
+            return self._compiled.finditer(text, timeout=self.timeout)
+        return self._compiled.finditer(text)
+
+    def _windowed(self, text):
+        """
+        Yield (window offset, match) pairs for text.
+        Long input is split into overlapping windows. Each window reports the
+        matches starting before the next window begins, so a match up to
+        'overlap' characters long is seen whole and reported exactly once.
+        """
+        step = max(1, self.window - self.overlap)
+        reported_until = 0
+        for offset in range(0, max(len(text), 1), step):
+            chunk = text[offset:offset + self.window]
+            last = offset + self.window >= len(text)
+            try:
+                for match in self._scan(chunk):
+                    if not last and match.start() >= step:
+                        break
+                    if offset + match.start() < reported_until:
+                        continue
+                    reported_until = offset + match.end()
+                    yield offset, match
+            except TimeoutError:
+                logging.warning("Regex scan timed out after %ss, skipping %s characters",
+                                self.timeout, len(chunk))
+            if last:
+                break
+
+    def finditer(self, text):
+        """Yield matches in text, positions are relative to their scan window"""
+        for _, match in self._windowed(text):
+            yield match
+
+    def search(self, text):
+        """Return the first match in text or None"""
+        return next(self.finditer(text), None)
+
+    def sub(self, repl, text):
+        """Replace every match in text with repl(match)"""
+        parts = []
+        position = 0
+        for offset, match in self._windowed(text):
+            parts.append(text[position:offset + match.start()])
+            parts.append(repl(match))
+            position = offset + match.end()
+        if not parts:
+            return text
+        parts.append(text[position:])
+        return ''.join(parts)
@@ -0,0 +1,91 @@
+import threading
+import time
+
+
+class _Flight:
+    """A single in-flight call that other callers can wait on"""
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.shareable = True
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent and repeated calls for the same key.
+    The first caller runs the function, concurrent callers wait for it and
+    later callers get the stored result without running it again, unless
+    remember is False: then only calls in flight at the same time are merged.
+    """
+    def __init__(self, remember=True):
+        self.remember = remember
+        self._lock = threading.Lock()
+        self._flights = {}
+        self.hits = 0
+        self.misses = 0
+
+    def do(self, key, fn, *args, wait_timeout=None, shareable=None, keep=None, **kwargs):
+        """
+        Run fn(*args, **kwargs) once per key and share its result.
+        If shareable(result), checked in the calling thread, is False the result
+        only goes to its caller: it is not stored and waiting callers run fn
+        themselves (or wait on whoever starts first). If keep(result) is False
+        the result goes to the callers already waiting but is not stored for
+        later ones, which run fn again.
+
+        Args:
+            wait_timeout: Seconds to wait for another caller's run before raising TimeoutError
+
+        Returns:
+            tuple: (result, shared) where shared is True if the result came from another call
+        """
+        deadline = None if wait_timeout is None else time.monotonic() + wait_timeout
+        while True:
+            with self._lock:
+                flight = self._flights.get(key)
+                leader = flight is None
+                if leader:
+                    flight = _Flight()
+                    self._flights[key] = flight
+                    self.misses += 1
+                else:
+                    self.hits += 1
+            if leader:
+                break
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            if not flight.done.wait(remaining):
+                raise TimeoutError(f"Gave up waiting for the in-flight call of {key}")
+            if flight.error is not None:
+                raise flight.error
+            if flight.shareable:
+                return flight.result, True
+            with self._lock:
+                # Counted as a hit above, but this caller has to run again
+                self.hits -= 1
+
+        try:
+            flight.result = fn(*args, **kwargs)
+            if shareable is not None and not shareable(flight.result):
+                flight.shareable = False
+                self.forget(key)
+            elif not self.remember or (keep is not None and not keep(flight.result)):
+                # Callers already waiting still get the result from the flight
+                self.forget(key)
+        except Exception as e:
+            flight.error = e
+            # Failed calls are not remembered, the next caller retries
+            self.forget(key)
+            raise
+        finally:
+            flight.done.set()
+        return flight.result, False
+
+    def forget(self, key):
+        """Drop the stored result for key so the next caller runs again"""
+        with self._lock:
+            self._flights.pop(key, None)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._flights)
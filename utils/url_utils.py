@@ -1,7 +1,8 @@
-from urllib.parse import urlparse
+from urllib.parse import urlparse, urlunparse
 from config.scraping_config import ScrapingConfig
 class UrlUtils:
-    scraping_config = ScrapingConfig()
+    # Built on first use, with the private suffixes of hosting platforms (wixsite.com, github.io, ...)
+    _site_extractor = None
     
     @staticmethod
     def is_valid_url(url: str, check_business_directories: bool = False) -> bool:
@@ -35,9 +36,55 @@ class UrlUtils:
             # Additional check for business directories if requested
             if check_business_directories:
                 return not any(bd in parsed.netloc 
-                             for bd in ScrapingConfig.BUSINESS_DIRECTORIES)
+                             for bd in ScrapingConfig.load().BUSINESS_DIRECTORIES)
                              
             return True
             
         except Exception:
-            return False
\ No newline at end of file
+            return False
+
+    @staticmethod
+    def normalize_url(url: str) -> str:
+        """
+        Normalize URL for comparison: lowercase scheme and host, drop 'www.',
+        default ports, fragments and trailing slashes.
+        
+        Args:
+            url (str): URL to normalize
+            
+        Returns:
+            str: Normalized URL
+        """
+        if '://' not in url:
+            url = f"http://{url}"
+        parsed = urlparse(url.strip())
+        scheme = parsed.scheme.lower()
+        host = (parsed.hostname or '').lower()
+        if host.startswith('www.'):
+            host = host[4:]
+        netloc = host
+        if parsed.port and parsed.port not in (80, 443):
+            netloc = f"{host}:{parsed.port}"
+        path = parsed.path.rstrip('/')
+        return urlunparse((scheme, netloc, path, '', parsed.query, ''))
+
+    @staticmethod
+    def get_site_key(url: str) -> str:
+        """
+        Key identifying the site behind a URL: its registrable domain
+        (e.g. 'shop.acme.co.uk/de' -> 'acme.co.uk'), or the normalized URL
+        when no registrable domain can be extracted. Private suffixes count,
+        so 'acme.wixsite.com' and 'other.wixsite.com' are different sites.
+        
+        Args:
+            url (str): URL of the site
+            
+        Returns:
+            str: Site key
+        """
+        if UrlUtils._site_extractor is None:
+            import tldextract
+            UrlUtils._site_extractor = tldextract.TLDExtract(include_psl_private_domains=True)
+        normalized = UrlUtils.normalize_url(url)
+        registered_domain = UrlUtils._site_extractor(normalized).registered_domain
+        return registered_domain.lower() if registered_domain else normalized
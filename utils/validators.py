@@ -1,10 +1,18 @@
 import re
 
 class ContactValidators:
+    # Shared with the vectorized post-processing of result tables
+    EMAIL_PATTERN = r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
+    INVALID_EMAIL_DOMAINS = frozenset({
+        'example.com', 'domain.com', 'email.com', 'test.com',
+        'yourwebsite.com', 'company.com', 'website.com'
+    })
+    PHONE_STRIP_PATTERN = r'[^\d+]'
+
     def _validate_phone(self, phone):
             """Validate phone number"""
             # Clean the phone number
-            cleaned = re.sub(r'[^\d+]', '', phone)
+            cleaned = re.sub(self.PHONE_STRIP_PATTERN, '', phone)
 
             # Check length
             if len(cleaned) < 5 or len(cleaned) > 20:
@@ -21,19 +29,14 @@ class ContactValidators:
                 email = email.lower().strip()
 
                 # Basic format check
-                if not re.match(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$', email):
+                if not re.match(f'^{self.EMAIL_PATTERN}$', email):
                     return False
 
                 # Check domain
                 domain = email.split('@')[1]
 
                 # Exclude common invalid domains
-                invalid_domains = {
-                    'example.com', 'domain.com', 'email.com', 'test.com',
-                    'yourwebsite.com', 'company.com', 'website.com'
-                }
-
-                if domain in invalid_domains:
+                if domain in self.INVALID_EMAIL_DOMAINS:
                     return False
 
                 # Additional checks
@@ -46,7 +49,7 @@ class ContactValidators:
     def _format_phone(self, phone):
             """Format phone number consistently"""
             # Remove all non-digit characters except +
-            cleaned = re.sub(r'[^\d+]', '', phone)
+            cleaned = re.sub(self.PHONE_STRIP_PATTERN, '', phone)
             
             # Format international numbers
             if cleaned.startswith('+'):